@@ -1,5 +1,19 @@
 """
 import for the entry point
+
+The interface is imported when the entry point is called so the command line
+runner don't load Qt.
 """
 
-from .main import mainApp
+from time import perf_counter
+
+
+def mainApp():
+    """entry point for the interface"""
+
+    # taken before importing Qt for the startup measurement
+    startTime = perf_counter()
+
+    from .main import mainApp as app  # pylint: disable=import-outside-toplevel
+
+    return app(startTime=startTime)
@@ -0,0 +1,462 @@
+"""
+benchmark measure the jobs queue engine with SimulateRun
+
+The jobs are run by the real JobQueue, RunJobs, jobsWorker, models and
+output views under the offscreen Qt platform. The commands are not executed
+dummyRunCommand takes their place. The configuration, history database and
+logs are kept in a temporary directory the user files are not touched.
+
+Run with:
+
+    python -m MKVBatchMultiplex.benchmark --command "mkvmerge command"
+
+The command is parsed once and used by every job. mkvmerge is needed to
+parse it and verify the source files. Without MKVToolNix or media files use
+the fake mkvmerge in tests/fakemkvmerge:
+
+    tests/fakemkvmerge/mkvmerge --fake-sources /tmp/bench 20 > command.txt
+    python -m MKVBatchMultiplex.benchmark --file command.txt
+"""
+# BMK0001
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import tracemalloc
+
+from pathlib import Path
+from time import perf_counter
+
+
+def benchmarkApp():
+    """entry point for the benchmark"""
+
+    args = parseArguments(sys.argv[1:])
+
+    command = args.command
+    if (command is None) and (args.file is not None):
+        lines = [
+            line.strip()
+            for line in args.file.read_text(encoding="utf-8").splitlines()
+        ]
+        command = next(
+            (line for line in lines if line and not line.startswith("#")), None)
+    if not command:
+        print("A mkvmerge command is needed use --command or --file.",
+              file=sys.stderr)
+        sys.exit(2)
+    if args.jobs < 1:
+        print("At least one job is needed.", file=sys.stderr)
+        sys.exit(2)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    with tempfile.TemporaryDirectory(prefix="mkvbm-benchmark-") as filesRoot:
+        results = runBenchmark(command, filesRoot, args)
+
+    printResults(results)
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    sys.exit(0 if results["run"]["jobsDone"] == args.jobs else 1)
+
+
+def runBenchmark(command, filesRoot, args):
+    """
+    runBenchmark queue, run and save args.jobs synthetic jobs
+
+    Args:
+        **command** (str): mkvmerge command used by every job
+
+        **filesRoot** (str): directory for configuration and database
+
+        **args** (argparse.Namespace): benchmark arguments
+
+    Returns:
+        dict: results of every phase
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from PySide6.QtCore import QEventLoop, QObject, QTimer, Signal
+    from PySide6.QtWidgets import QApplication
+
+    from vsutillib.mkv import MKVCommandParser
+    from vsutillib.pyside6 import DualProgressBar, QFormatLabel
+
+    from . import config
+    from .dataset import TableData, tableHeaders
+    from .jobs import (
+        JobEventLog, JobInfo, JobKey, JobQueue, JobStatus, SqlJobsTable,
+        saveToDb)
+    from .models import JobsTableModel, TableProxyModel
+    from .utils import OutputWindows, Progress, Text
+    from .widgets import OutputListView
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+
+    config.init(filesRoot=filesRoot)
+    config.data.set(config.ConfigKey.Logging, False)
+    config.data.set(config.ConfigKey.SimulateRun, True)
+    config.data.set(config.ConfigKey.SimulateRunIterations, args.iterations)
+    config.data.set(config.ConfigKey.JobsWorkers, args.workers)
+    config.data.set(config.ConfigKey.JobsAutoSave, False)
+    config.data.set(config.ConfigKey.JobEvents, not args.no_events)
+
+    class OutputView(OutputListView):
+        """jobs output view without tab"""
+
+        def setAsCurrentTab(self):
+            """the benchmark has no tabs"""
+
+    class BenchmarkWindow(QObject):
+        """the parts of the main window used by the jobs queue"""
+
+        trayIconMessageSignal = Signal(str, str, object)
+
+        def __init__(self):
+            super().__init__()
+
+            self.jobsOutput = OutputView()
+            self.errorOutput = OutputView()
+            self.commandOutput = OutputView()
+            self.output = OutputWindows(
+                self.commandOutput, self.jobsOutput, self.errorOutput)
+            self.progressBar = DualProgressBar(None)
+            self.jobsLabel = QFormatLabel(Text.txt0085, init=[0, 0, 0, 0, 0])
+            self.progress = Progress(None, self.progressBar, self.jobsLabel)
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "jobs": args.jobs,
+        "workers": args.workers,
+        "iterations": args.iterations,
+    }
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    memoryStart = _memory()
+
+    #
+    # Parse command
+    #
+    startTime = perf_counter()
+    oCommand = MKVCommandParser(
+        command, useEmbedded=config.data.get(config.ConfigKey.UseEmbedded))
+    results["parse"] = {
+        "seconds": perf_counter() - startTime,
+        "commands": len(oCommand) if oCommand else 0,
+    }
+    if not oCommand:
+        print("Command can not be parsed.", file=sys.stderr)
+        sys.exit(2)
+
+    window = BenchmarkWindow()
+    jobsQueue = JobQueue(window)
+    tableData = TableData(headerList=tableHeaders(), dataList=[])
+    model = JobsTableModel(tableData, jobsQueue)
+    proxyModel = TableProxyModel(model)
+    jobsQueue.output = window.output
+    jobsQueue.progress = window.progress
+    jobsQueue.proxyModel = proxyModel
+
+    #
+    # Queue jobs
+    #
+    samples = []
+    startTime = perf_counter()
+    for row in range(args.jobs):
+        data = [
+            ["", "", None],
+            [JobStatus.AddToQueue, "Status code", None],
+            [command, command, oCommand],
+        ]
+        sampleStart = perf_counter()
+        model.insertRows(row, 1, data=data)
+        samples.append(perf_counter() - sampleStart)
+    app.processEvents()
+    queueSeconds = perf_counter() - startTime
+    memoryQueued = _memory()
+    results["queue"] = {
+        "seconds": queueSeconds,
+        "queued": len(jobsQueue),
+        **_latencies(samples),
+        "memoryGrowth": memoryQueued - memoryStart,
+    }
+
+    #
+    # Run jobs
+    #
+    state = {"finished": False}
+    loop = QEventLoop()
+
+    def finished():
+        state["finished"] = True
+        loop.quit()
+
+    jobsQueue.runJobs.finishedSignal.connect(finished)
+    startTime = perf_counter()
+    jobsQueue.run()
+    if not state["finished"]:
+        QTimer.singleShot(int(args.timeout * 1000), loop.quit)
+        loop.exec()
+    app.processEvents()
+    runSeconds = perf_counter() - startTime
+    memoryRun = _memory()
+
+    statuses = [row[JobKey.Status].cell for row in tableData.data]
+    coalescer = jobsQueue.runJobs.coalescer
+    signals = dict(coalescer.statistics) if coalescer is not None else {}
+    commands = len(oCommand) * args.jobs
+    results["run"] = {
+        "seconds": runSeconds,
+        "finished": state["finished"],
+        "jobsDone": statuses.count(JobStatus.Done),
+        "jobsOther": len(statuses) - statuses.count(JobStatus.Done),
+        "perJob": runSeconds / args.jobs,
+        "perCommand": runSeconds / commands if commands else 0,
+        "signalsReceived": signals.get("received", 0),
+        "signalsEmitted": signals.get("emitted", 0),
+        "signalsPerSecond": signals.get("received", 0) / runSeconds,
+        "flushes": signals.get("flushes", 0),
+        "outputLines": window.jobsOutput.model().rowCount(),
+        "memoryGrowth": memoryRun - memoryQueued,
+    }
+
+    #
+    # History writes
+    #
+    config.data.set(config.ConfigKey.SimulateRun, False)
+    samples = []
+    for row in range(min(args.db_writes, args.jobs)):
+        job = JobInfo(row, model.dataset[row, ], model)
+        sampleStart = perf_counter()
+        saveToDb(job)
+        samples.append(perf_counter() - sampleStart)
+    config.data.set(config.ConfigKey.SimulateRun, True)
+    memoryEnd = _memory()
+    results["db"] = {
+        "writes": len(samples),
+        **_latencies(samples),
+        # WAL keeps the last writes in the -wal file
+        "databaseSize": sum(
+            _fileSize(f"{config.data.get(config.ConfigKey.SystemDB)}{suffix}")
+            for suffix in ["", "-wal"]),
+        "memoryGrowth": memoryEnd - memoryRun,
+    }
+
+    gc.collect()
+    memoryEnd = _memory()
+    results["memory"] = {
+        "source": "tracemalloc" if args.tracemalloc else "rss",
+        "start": memoryStart,
+        "end": memoryEnd,
+        "growthPerJob": (memoryEnd - memoryStart) / args.jobs,
+    }
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    JobEventLog.shutdown()
+    SqlJobsTable.shutdown()
+    config.close()
+
+    return results
+
+
+def printResults(results):
+    """
+    printResults print benchmark results
+
+    Args:
+        **results** (dict): results of runBenchmark
+    """
+
+    queue, run, db, memory = (
+        results["queue"], results["run"], results["db"], results["memory"])
+
+    print(
+        f"Python {results['python']} - {results['platform']}\n"
+        f"Jobs {results['jobs']} - workers {results['workers']} - "
+        f"iterations {results['iterations']} - commands per job "
+        f"{results['parse']['commands']}\n"
+        f"\n"
+        f"Parse command      {results['parse']['seconds']:10.3f} s\n"
+        f"\n"
+        f"Queue              {queue['seconds']:10.3f} s\n"
+        f"  per job          {_ms(queue['mean'])} mean {_ms(queue['p95'])} "
+        f"p95 {_ms(queue['max'])} max\n"
+        f"  memory           {_mb(queue['memoryGrowth'])}\n"
+        f"\n"
+        f"Run                {run['seconds']:10.3f} s "
+        f"{'' if run['finished'] else '(timeout)'}\n"
+        f"  jobs done        {run['jobsDone']:10d} other {run['jobsOther']}\n"
+        f"  per job          {_ms(run['perJob'])}\n"
+        f"  per command      {_ms(run['perCommand'])}\n"
+        f"  signals          {run['signalsReceived']:10d} received "
+        f"{run['signalsEmitted']} emitted {run['flushes']} flushes\n"
+        f"  signals/s        {run['signalsPerSecond']:10.0f}\n"
+        f"  output lines     {run['outputLines']:10d}\n"
+        f"  memory           {_mb(run['memoryGrowth'])}\n"
+        f"\n"
+        f"History writes     {db['writes']:10d}\n"
+        f"  latency          {_ms(db['mean'])} mean {_ms(db['p95'])} "
+        f"p95 {_ms(db['max'])} max\n"
+        f"  database         {_mb(db['databaseSize'])}\n"
+        f"  memory           {_mb(db['memoryGrowth'])}\n"
+        f"\n"
+        f"Memory ({memory['source']})\n"
+        f"  growth           {_mb(memory['end'] - memory['start'])}\n"
+        f"  per job          {memory['growthPerJob'] / 1000:10.1f} KB"
+    )
+
+
+def parseArguments(argv):
+    """
+    parseArguments command line arguments
+
+    Args:
+        **argv** (list): command line arguments
+
+    Returns:
+        argparse.Namespace: arguments parsed
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m MKVBatchMultiplex.benchmark",
+        description=(
+            "Measure the jobs queue engine running synthetic jobs with "
+            "SimulateRun under the offscreen Qt platform."
+        ),
+    )
+    parser.add_argument(
+        "-c",
+        "--command",
+        help="mkvmerge command used by every job",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        type=Path,
+        help="file with the command the first line not starting with # is "
+        "used",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=2000,
+        help="number of jobs defaults to 2000",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="jobs running at the same time defaults to 1",
+    )
+    parser.add_argument(
+        "-i",
+        "--iterations",
+        type=int,
+        default=1,
+        help="SimulateRunIterations for every command defaults to 1",
+    )
+    parser.add_argument(
+        "-d",
+        "--db-writes",
+        type=int,
+        default=500,
+        help="jobs saved in the history defaults to 500",
+    )
+    parser.add_argument(
+        "--no-events",
+        action="store_true",
+        help="don't write the jobs events",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="measure memory with tracemalloc instead of the resident set "
+        "size slower but only counts Python allocations",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=3600,
+        help="seconds to wait for the run defaults to 3600",
+    )
+    parser.add_argument(
+        "--json",
+        type=Path,
+        help="save results in file",
+    )
+
+    return parser.parse_args(argv)
+
+
+def _latencies(samples):
+    """mean, p50, p95 and max of samples in seconds"""
+
+    if not samples:
+        return {"mean": 0, "p50": 0, "p95": 0, "max": 0}
+
+    ordered = sorted(samples)
+
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def _memory():
+    """Python allocations if tracemalloc is on else resident set size"""
+
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+
+        maxRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # peak not current it only grows
+        return maxRSS if sys.platform == "darwin" else maxRSS * 1024
+    except ImportError:
+        return 0
+
+
+def _fileSize(fileName):
+    """size of file 0 if it does not exist"""
+
+    try:
+        return Path(fileName).stat().st_size
+    except (OSError, TypeError):
+        return 0
+
+
+def _ms(seconds):
+    """seconds in milliseconds"""
+
+    return f"{seconds * 1000:10.3f} ms"
+
+
+def _mb(size):
+    """bytes in MB"""
+
+    return f"{size / 1000000:10.1f} MB"
+
+
+if __name__ == "__main__":
+    benchmarkApp()
@@ -0,0 +1,491 @@
+"""
+cli run mkvtoolnix-gui commands from the command line without the interface
+
+The commands are verified and adjusted like the jobs run by the interface and
+saved in the jobs history. Qt is not loaded.
+"""
+# CLI0001
+
+import argparse
+import logging
+import sys
+
+from datetime import datetime
+from pathlib import Path
+from time import time
+
+import vsutillib.mkv as mkv
+
+from vsutillib.files import ConfigurationSettings
+from vsutillib.misc import strFormatTimeDelta
+
+from . import config
+from .jobs import (
+    PROGRESSREGEX,
+    ChunkedRunCommand,
+    HistoryWriter,
+    JobEventLog,
+    JobInfo,
+    JobKey,
+    JobStatus,
+    MetricsExporter,
+    SqlJobsTable,
+    addCheckpoint,
+    jobEvent,
+    jobMetricsSummary,
+    outputUpToDate,
+    recordCommandMetrics,
+    removeCheckpoints,
+    removeOldJobLogs,
+    saveJobMetrics,
+    saveToDb,
+    startCheckpoints,
+    updateManifest,
+    verifyCommand,
+)
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+def cliApp():
+    """entry point for the command line runner"""
+
+    args = parseArguments(sys.argv[1:])
+
+    config.init()
+
+    commands = list(args.commands)
+    if args.file is not None:
+        commands.extend(readCommands(args.file))
+
+    if not commands:
+        print("No commands to run.", file=sys.stderr)
+        sys.exit(2)
+
+    rc = 0
+    MetricsExporter.exporter().start()
+    try:
+        for command in commands:
+            jobRC = runJob(
+                command,
+                algorithm=args.algorithm,
+                incremental=args.incremental,
+                timeout=args.timeout,
+                history=not args.no_history,
+            )
+            rc = max(rc, jobRC)
+            if rc == 130:
+                break
+    finally:
+        MetricsExporter.shutdown()
+        HistoryWriter.shutdown()
+        SqlJobsTable.shutdown()
+        JobEventLog.shutdown()
+        removeOldJobLogs()
+        # the configuration is the one of the interface it saves it when it
+        # ends and is not written here
+
+    sys.exit(rc)
+
+
+def parseArguments(argv):
+    """
+    parseArguments command line arguments
+
+    Args:
+        **argv** (list): command line arguments
+
+    Returns:
+        argparse.Namespace: arguments parsed
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="mkvbatchmultiplex-cli",
+        description=(
+            "Run mkvtoolnix-gui commands for all the files in the source "
+            "directories without the interface."
+        ),
+    )
+    parser.add_argument(
+        "commands",
+        nargs="*",
+        help="command copied from mkvtoolnix-gui",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        type=Path,
+        help="file with one command per line, lines starting with # are "
+        "ignored",
+    )
+    parser.add_argument(
+        "-a",
+        "--algorithm",
+        type=int,
+        choices=[0, 1, 2],
+        help="algorithm to adjust commands with different track order "
+        "defaults to the Preferences setting",
+    )
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        default=None,
+        help="skip commands with an output up to date",
+    )
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        help="seconds a command can run 0 no limit defaults to the "
+        "configuration setting",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="don't save the jobs in the history",
+    )
+
+    return parser.parse_args(argv)
+
+
+def readCommands(fileName):
+    """
+    readCommands read commands from a file
+
+    Args:
+        **fileName** (Path): file with a command per line
+
+    Returns:
+        list: commands in file
+    """
+
+    commands = []
+    with open(fileName, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                commands.append(line)
+
+    return commands
+
+
+def nextJobID():
+    """
+    nextJobID job ID of the command line runner. The counter is kept in
+    CLICONFIGFILE not in the configuration of the interface that could be
+    running and the IDs start at CLIJOBIDSTART so they are not the ID of a
+    job of the interface.
+
+    Returns:
+        int: job ID
+    """
+
+    settings = ConfigurationSettings()
+    settings.setConfigFile(
+        Path(config.data.get(config.ConfigKey.SystemDB)).parent.joinpath(
+            config.CLICONFIGFILE))
+    settings.readFromFile()
+
+    jobID = settings.get(config.ConfigKey.JobID) or config.CLIJOBIDSTART
+    if jobID > config.CLIJOBIDSTART + 9999:
+        # Roll over
+        jobID = config.CLIJOBIDSTART
+    settings.set(config.ConfigKey.JobID, jobID + 1)
+    try:
+        settings.saveToFile()
+    except OSError as e:
+        MODULELOG.error("CLI0004: Job ID not saved - %s", e)
+
+    return jobID
+
+
+def runJob(
+        command,
+        algorithm=None,
+        incremental=None,
+        timeout=None,
+        history=True):
+    """
+    runJob execute all the commands of a job
+
+    Args:
+        **command** (str): command copied from mkvtoolnix-gui
+
+        **algorithm** (int, optional): algorithm to adjust commands. Defaults
+        to None use configuration setting.
+
+        **incremental** (bool, optional): skip commands with an output up to
+        date. Defaults to None use configuration setting.
+
+        **timeout** (float, optional): seconds a command can run. Defaults to
+        None use configuration setting.
+
+        **history** (bool, optional): save job in history. Defaults to True.
+
+    Returns:
+        int: 0 if all commands ended ok, 1 if there were errors and 130 if the
+        job was interrupted.
+    """
+
+    log = config.data.get(config.ConfigKey.Logging)
+    appDir = Path(__file__).resolve().parent
+    jobID = nextJobID()
+    job = JobInfo(
+        0,
+        [jobID, JobStatus.Running, command],
+        algorithm=algorithm,
+        appDir=appDir,
+        log=log,
+    )
+
+    if (not job.oCommand) or (not job.oCommand.command):
+        printOutput(
+            job, f"Job ID: {jobID} invalid command: {command}\n", error=True)
+        return 1
+
+    if incremental is None:
+        incremental = config.data.get(config.ConfigKey.IncrementalRun)
+    if timeout is None:
+        timeout = config.data.get(config.ConfigKey.CommandTimeout)
+
+    if not job.oCommand.commandsGenerated:
+        job.oCommand.generateCommands()
+
+    job.startTime = time()
+    dt = datetime.fromtimestamp(job.startTime)
+    printOutput(
+        job,
+        "*******************\n"
+        f"Job ID: {jobID} started at {dt.isoformat()} using algorithm "
+        f"{job.algorithm}.\n\n",
+    )
+
+    if history:
+        saveToDb(job)
+    jobEvent(
+        "jobStarted", jobID=jobID, source="cli", algorithm=job.algorithm,
+        commands=len(job.oCommand))
+
+    jobsDB = SqlJobsTable.shared()
+    startCheckpoints(jobsDB, job)
+
+    bSimulateRun = config.data.get(config.ConfigKey.SimulateRun)
+    iVerify = mkv.IVerifyStructure()
+    lineState = {"line": "", "percent": None}
+    cli = ChunkedRunCommand(
+        processLine=displayOutput,
+        processArgs=[job, lineState],
+        commandShlex=True,
+        timeout=timeout,
+        log=log,
+    )
+    totalCommands = len(job.oCommand)
+    errors = 0
+    runningFile = None
+    rc = 0
+
+    try:
+        for (
+            index,
+            (cmd, baseFiles, sourceFiles, destinationFile, _, _, _),
+        ) in enumerate(job.oCommand):
+
+            if incremental and (
+                    (doneFile := outputUpToDate(
+                        jobsDB, cmd, baseFiles, sourceFiles,
+                        destinationFile)) is not None):
+                printOutput(
+                    job,
+                    f"Destination File: {destinationFile}\n"
+                    f"Up to date skipped: {doneFile}\n\n",
+                )
+                job.statistics["skipped"] += 1
+                jobEvent(
+                    "commandSkipped", jobID=jobID, index=index,
+                    reason="upToDate", file=doneFile)
+                continue
+
+            # the manifest records the command before any adjustment
+            generatedCmd = cmd
+            runCmd, cmd, msg, adjusted = verifyCommand(
+                iVerify, job.oCommand, index, cmd, job.algorithm, jobID=jobID)
+
+            if msg is not None:
+                printOutput(job, msg + "\n", error=True)
+                if log:
+                    if adjusted:
+                        MODULELOG.warning("CLI0002: %s", msg)
+                    else:
+                        MODULELOG.warning("CLI0003: %s", msg)
+
+            if not runCmd:
+                errors += 1
+                printOutput(
+                    job,
+                    f"Destination File: {destinationFile}\n"
+                    "Failed adjustment\n\n",
+                    error=True,
+                )
+                for m in iVerify.analysis:
+                    printOutput(
+                        job, m if m.endswith("\n") else m + "\n", error=True)
+                printOutput(job, "\n", error=True)
+                continue
+
+            printOutput(
+                job,
+                f"Command {index + 1}/{totalCommands}: {cmd}\n"
+                f"Destination File: {destinationFile}\n",
+            )
+
+            if bSimulateRun:
+                continue
+
+            cli.command = cmd
+            cli.eventFields = {
+                "jobID": jobID,
+                "index": index,
+                "destinationFile": destinationFile,
+            }
+            runningFile = destinationFile
+            cli.run()
+            runningFile = None
+            if lineState["line"]:
+                endLine(job, lineState)
+            job.statistics["commands"] += 1
+            recordCommandMetrics(
+                HistoryWriter.historyWriter(), job, index, cli.result)
+
+            if cli.timedOut:
+                errors += 1
+                if Path(destinationFile).is_file():
+                    Path(destinationFile).unlink()
+                printOutput(
+                    job,
+                    f"Command stopped running longer than {timeout} seconds\n",
+                    error=True,
+                )
+            elif cli.rc in [0, 1]:
+                addCheckpoint(jobsDB, job, index, destinationFile)
+                if incremental:
+                    updateManifest(jobsDB, generatedCmd, destinationFile)
+            elif cli.error:
+                errors += 1
+                printOutput(job, f"Error: {cli.error}\n", error=True)
+            else:
+                errors += 1
+                printOutput(
+                    job,
+                    f"Command ended with rc = {cli.rc}\n",
+                    error=True,
+                )
+            printOutput(job, "\n")
+
+        job.jobRow[JobKey.Status] = (
+            JobStatus.DoneWithError if errors else JobStatus.Done)
+        rc = 1 if errors else 0
+
+    except KeyboardInterrupt:
+        # remove incomplete output of command running
+        if runningFile and Path(runningFile).is_file():
+            Path(runningFile).unlink()
+        job.jobRow[JobKey.Status] = JobStatus.Aborted
+        printOutput(job, "\nJob interrupted.\n", error=True)
+        rc = 130
+
+    job.endTime = time()
+    dtStart = datetime.fromtimestamp(job.startTime)
+    dtEnd = datetime.fromtimestamp(job.endTime)
+    printOutput(
+        job,
+        f"Job ID: {jobID} {job.jobRow[JobKey.Status].lower()} at "
+        f"{dtEnd.isoformat()}, running time "
+        f"{strFormatTimeDelta(dtEnd - dtStart)}.\n"
+        f"Commands: {job.statistics['commands']} "
+        f"Skipped: {job.statistics['skipped']} Errors: {errors}\n"
+        + jobMetricsSummary(job),
+    )
+    saveJobMetrics(HistoryWriter.historyWriter(), job)
+
+    job.output.flush()
+    job.errors.flush()
+    jobEvent(
+        "jobEnded", jobID=jobID, source="cli",
+        status=job.jobRow[JobKey.Status],
+        seconds=round(job.endTime - job.startTime, 3), errors=errors,
+        **job.statistics)
+    if history:
+        saveToDb(job, update=True)
+    else:
+        # nothing else reads the output
+        job.removeLogs()
+    removeCheckpoints(jobsDB, jobID)
+
+    if log:
+        MODULELOG.info(
+            "CLI0001: Job ID %s %s.", jobID, job.jobRow[JobKey.Status])
+
+    return rc
+
+
+def printOutput(job, msg, error=False):
+    """
+    printOutput print message and save it in the job output
+
+    Args:
+        **job** (JobInfo): job running
+
+        **msg** (str): message
+
+        **error** (bool, optional): message is also an error. Defaults to
+        False.
+    """
+
+    stream = sys.stderr if error else sys.stdout
+    stream.write(msg)
+    stream.flush()
+    job.output.append([msg, {}])
+    if error:
+        job.errors.append([msg, {}])
+
+
+def displayOutput(text, job, lineState):
+    """
+    displayOutput echo mkvmerge output as it is received the progress is
+    shown in the same line
+
+    Args:
+        **text** (str): line received ends with new line or %
+
+        **job** (JobInfo): job running
+
+        **lineState** (dict): current line
+    """
+
+    lineState["line"] += text
+    if not text.endswith("%") and not text.endswith("\n"):
+        return
+
+    line = lineState["line"].strip()
+    if m := PROGRESSREGEX.search(line):
+        lineState["percent"] = int(m.group(1))
+        lineState["line"] = ""
+        sys.stdout.write(f"\r{line}")
+        sys.stdout.flush()
+    elif text.endswith("\n"):
+        endLine(job, lineState)
+
+
+def endLine(job, lineState):
+    """output line received"""
+
+    if lineState["percent"] is not None:
+        sys.stdout.write("\n")
+        lineState["percent"] = None
+    line = lineState["line"].strip() + "\n"
+    lineState["line"] = ""
+    sys.stdout.write(line)
+    sys.stdout.flush()
+    job.output.append([line, {}])
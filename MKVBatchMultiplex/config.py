@@ -8,15 +8,15 @@ import logging
 import os
 import sys
 
-from typing import Callable, ClassVar, Dict, List, Optional
+from typing import TYPE_CHECKING, Callable, ClassVar, Dict, List, Optional
 from pathlib import Path
 
-from PySide6.QtGui import QFont
-from PySide6.QtWidgets import QApplication
-
 from vsutillib.files import ConfigurationSettings
 from vsutillib.log import LogRotateFileHandler
-from vsutillib.pyside6 import QSignalLogHandler
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QApplication
+    from .utils import LogRecordBuffer
 
 __VERSION__: tuple = (3, 0, "0", "2")
 __version__: str = ".".join(map(str, __VERSION__))
@@ -35,6 +35,7 @@ DESCRIPTION: str = "A mkv media batch multiplex."
 ENTRYPOINTS: Dict[str, List[str]] = {
     "console_scripts": [
         "mkvbatchmultiplex=MKVBatchMultiplex:mainApp",
+        "mkvbatchmultiplex-cli=MKVBatchMultiplex.cli:cliApp",
     ],
 }
 KEYWORDS: str = "mkv multimedia video mkvtoolnix plex"
@@ -78,9 +79,9 @@ LOCALE: str = CWD.joinpath("locale")
 data: Callable[
     [], ConfigurationSettings
 ] = ConfigurationSettings()  # pylint: disable=invalid-name
-logViewer: Callable[
-    [], QSignalLogHandler
-] = QSignalLogHandler()  # pylint: disable=invalid-name
+# LogRecordBuffer created by init when running with an interface the
+# command line runner don't load Qt
+logViewer: Optional["LogRecordBuffer"] = None  # pylint: disable=invalid-name
 
 FORCELOG: bool = True
 # endregion
@@ -93,8 +94,30 @@ FORCELOG: bool = True
 
 WORKERTHREADNAME: str = "jobsWorker"
 SYSTEMDATABASE: str = "itsue.db"
+JOBSLOGDIR: str = "JobsLogs"
+JOBSEVENTSDIR: str = "JobsEvents"
+PROFILESDIR: str = "Profiles"
+# the command line runner keeps its job ID in its own file in a range of IDs
+# the interface does not use
+CLICONFIGFILE: str = "cli.xml"
+CLIJOBIDSTART: int = 10000
 ALGORITHMDEFAULT: int = 1
-DATABASEVERSION: str = "2.1.0"
+JOBSWORKERSDEFAULT: int = 1
+JOBSWORKERSMAX: int = 16
+COMMANDSWORKERSDEFAULT: int = 1
+COMMANDSWORKERSMAX: int = 8
+DEVICEROTATIONALSLOTS: int = 1
+DEVICESOLIDSTATESLOTS: int = 4
+OUTPUTREFRESHRATE: int = 15
+COMMANDTIMEOUT: int = 0
+JOBOUTPUTLINES: int = 2000
+OUTPUTSCROLLBACK: int = 100000
+LOGVIEWERLINES: int = 20000
+JOBEVENTSDAYS: int = 30
+JOBLOGSDAYS: int = 30
+METRICSPORT: int = 0
+METRICSINTERVAL: int = 15
+DATABASEVERSION: str = "2.4.0"
 
 # endregion
 
@@ -136,14 +159,33 @@ class ConfigKey:  # pylint: disable=too-few-public-methods
     #
 
     Algorithm: ClassVar[str] = "Algorithm"
+    CommandsWorkers: ClassVar[str] = "CommandsWorkers"
+    CommandTimeout: ClassVar[str] = "CommandTimeout"
     CRC32: ClassVar[str] = "CRC32"
     DbVersion: ClassVar[str] = "DbVersion"
+    DeviceRotationalSlots: ClassVar[str] = "DeviceRotationalSlots"
+    DeviceSolidStateSlots: ClassVar[str] = "DeviceSolidStateSlots"
+    HistoryArchive: ClassVar[str] = "HistoryArchive"
     JobsAutoSave: ClassVar[str] = "JobsAutoSave"
     JobHistory: ClassVar[str] = "JobHistory"
     JobHistoryDisabled: ClassVar[str] = "JobsHistoryDisabled"
+    JobEvents: ClassVar[str] = "JobEvents"
+    JobEventsDays: ClassVar[str] = "JobEventsDays"
+    JobLogsDays: ClassVar[str] = "JobLogsDays"
     JobID: ClassVar[str] = "JobID"
+    JobOutputLines: ClassVar[str] = "JobOutputLines"
     JobsTable: ClassVar[str] = "jobs"
+    JobsWorkers: ClassVar[str] = "JobsWorkers"
+    IncrementalRun: ClassVar[str] = "IncrementalRun"
     LogViewer: ClassVar[str] = "LogViewer"
+    LogViewerLines: ClassVar[str] = "LogViewerLines"
+    MetricsFile: ClassVar[str] = "MetricsFile"
+    MetricsInterval: ClassVar[str] = "MetricsInterval"
+    MetricsPort: ClassVar[str] = "MetricsPort"
+    OutputRefreshRate: ClassVar[str] = "OutputRefreshRate"
+    OutputScrollback: ClassVar[str] = "OutputScrollback"
+    Profiling: ClassVar[str] = "Profiling"
+    ShortestJobFirst: ClassVar[str] = "ShortestJobFirst"
     Tab: ClassVar[str] = "Tab"
     TabText: ClassVar[str] = "TabText"
     TextSuffix: ClassVar[str] = "TextSuffix"
@@ -163,7 +205,7 @@ def init(
     logFile: Optional[str] = None,
     name: Optional[str] = None,
     version: Optional[str] = None,
-    app: Optional[QApplication] = None,
+    app: Optional["QApplication"] = None,
 ):
     """
     configures the system to save application configuration to xml file
@@ -183,8 +225,13 @@ def init(
 
         **version** (str, optional): application version . Defaults to
         [vsutillib version].
+
+        **app** (QApplication, optional): application running. Defaults to
+        None running without interface.
     """
 
+    global logViewer  # pylint: disable=global-statement,invalid-name
+
     if filesRoot is None:
         # root path for configuration files
         filesPath = Path(Path.home(), FILESROOT)
@@ -202,7 +249,8 @@ def init(
     data.setConfigFile(configFile)
     data.readFromFile()
 
-    setDefaultFont(app)
+    if app is not None:
+        setDefaultFont(app)
 
     #
     # Setup logging
@@ -212,6 +260,8 @@ def init(
         data.set(ConfigKey.LogWithCaller, True)
 
     data.set(ConfigKey.LogViewer, data.get(ConfigKey.LogViewer) or False)
+    data.set(ConfigKey.LogViewerLines,
+             data.get(ConfigKey.LogViewerLines) or LOGVIEWERLINES)
     data.set(ConfigKey.LogWithCaller, data.get(ConfigKey.LogWithCaller) or False)
 
     if logFile is None:
@@ -224,10 +274,16 @@ def init(
     formatter = logging.Formatter(
         "%(asctime)s %(levelname)-8s %(name)s %(message)s")
     logHandler.setFormatter(formatter)
-    # logViewer will be use with LogViewerWidget
-    logViewer.setFormatter(formatter)
     logging.getLogger("").addHandler(logHandler)
-    logging.getLogger("").addHandler(logViewer)
+    if app is not None:
+        # logViewer will be use with LogViewerWidget it keeps the records
+        # until the widget takes them in batches
+        from .utils import LogRecordBuffer
+
+        logViewer = LogRecordBuffer(
+            maxRecords=data.get(ConfigKey.LogViewerLines))
+        logViewer.setFormatter(formatter)
+        logging.getLogger("").addHandler(logViewer)
     logging.getLogger("").setLevel(logging.DEBUG)
 
     data.set(ConfigKey.Language,
@@ -264,8 +320,9 @@ def init(
     data.set(ConfigKey.CRC32,
              data.get(ConfigKey.CRC32) or CheckBoxState.UnChecked)
 
-    data.set(ConfigKey.DbVersion,
-             data.get(ConfigKey.DbVersion) or DATABASEVERSION)
+    # the version is the one of the tables the code creates the tables of
+    # an older version are migrated
+    data.set(ConfigKey.DbVersion, DATABASEVERSION)
 
     data.set(ConfigKey.JobsAutoSave,
              data.get(ConfigKey.JobsAutoSave) or False)
@@ -277,6 +334,72 @@ def init(
              data.get(ConfigKey.JobHistoryDisabled) or False)
     # data.set(ConfigKey.JobHistoryDisabled, False)
 
+    # Number of jobs running at the same time
+    data.set(ConfigKey.JobsWorkers,
+             data.get(ConfigKey.JobsWorkers) or JOBSWORKERSDEFAULT)
+
+    # Number of commands of a job running at the same time
+    data.set(ConfigKey.CommandsWorkers,
+             data.get(ConfigKey.CommandsWorkers) or COMMANDSWORKERSDEFAULT)
+
+    # Jobs with the same priority ordered by size of source files
+    data.set(ConfigKey.ShortestJobFirst,
+             data.get(ConfigKey.ShortestJobFirst) or False)
+
+    # Skip commands with output up to date
+    data.set(ConfigKey.IncrementalRun,
+             data.get(ConfigKey.IncrementalRun) or False)
+
+    # Number of commands using the same device at the same time
+    data.set(ConfigKey.DeviceRotationalSlots,
+             data.get(ConfigKey.DeviceRotationalSlots) or DEVICEROTATIONALSLOTS)
+    data.set(ConfigKey.DeviceSolidStateSlots,
+             data.get(ConfigKey.DeviceSolidStateSlots) or DEVICESOLIDSTATESLOTS)
+
+    # Times per second the jobs output and progress are updated 0 update on
+    # every change
+    if data.get(ConfigKey.OutputRefreshRate) is None:
+        data.set(ConfigKey.OutputRefreshRate, OUTPUTREFRESHRATE)
+
+    # Output lines of a job kept in memory the rest is in the job log file
+    data.set(ConfigKey.JobOutputLines,
+             data.get(ConfigKey.JobOutputLines) or JOBOUTPUTLINES)
+
+    # Lines kept by the jobs output and errors windows 0 keep all
+    if data.get(ConfigKey.OutputScrollback) is None:
+        data.set(ConfigKey.OutputScrollback, OUTPUTSCROLLBACK)
+
+    # Jobs events log in JSON Lines and days of files kept 0 keep all
+    if data.get(ConfigKey.JobEvents) is None:
+        data.set(ConfigKey.JobEvents, True)
+    if data.get(ConfigKey.JobEventsDays) is None:
+        data.set(ConfigKey.JobEventsDays, JOBEVENTSDAYS)
+
+    # Days the jobs output and errors files are kept 0 keep all
+    if data.get(ConfigKey.JobLogsDays) is None:
+        data.set(ConfigKey.JobLogsDays, JOBLOGSDAYS)
+
+    # Prometheus metrics in localhost port 0 disabled and in file empty
+    # disabled rewritten every MetricsInterval seconds
+    if data.get(ConfigKey.MetricsPort) is None:
+        data.set(ConfigKey.MetricsPort, METRICSPORT)
+    if data.get(ConfigKey.MetricsFile) is None:
+        data.set(ConfigKey.MetricsFile, "")
+    if data.get(ConfigKey.MetricsInterval) is None:
+        data.set(ConfigKey.MetricsInterval, METRICSINTERVAL)
+
+    # save the pickled job in the history besides its information
+    if data.get(ConfigKey.HistoryArchive) is None:
+        data.set(ConfigKey.HistoryArchive, False)
+
+    # cProfile and tracemalloc reports of slow paths
+    if data.get(ConfigKey.Profiling) is None:
+        data.set(ConfigKey.Profiling, False)
+
+    # Seconds a command can run 0 no limit
+    if data.get(ConfigKey.CommandTimeout) is None:
+        data.set(ConfigKey.CommandTimeout, COMMANDTIMEOUT)
+
     data.set(Key.MaxRegExCount, data.get(Key.MaxRegExCount) or 20)
 
     data.set(
@@ -312,9 +435,11 @@ def init(
     # data.set(ConfigKey.JobHistory, False)
 
 
-def setDefaultFont(app: QApplication) -> None:
+def setDefaultFont(app: "QApplication") -> None:
     """save and set default font point size"""
 
+    from PySide6.QtGui import QFont
+
     strSystemFont = data.get(ConfigKey.SystemFont)
     if strSystemFont is None:
         systemFont = app.font()
@@ -0,0 +1,263 @@
+"""
+ChunkedRunCommand run a command reading its output in blocks
+"""
+# CRN0001
+
+import codecs
+import logging
+import re
+import shlex
+
+from time import time
+
+from .JobEvents import jobEvent
+from .JobKeys import JobStatus
+from .ProcessSupervisor import ProcessSupervisor
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+# mkvmerge progress line "Progress: 10%"
+PROGRESSREGEX = re.compile(r":\W*(\d+)\%$")
+
+ABORTSTATUS = [JobStatus.Abort, JobStatus.AbortJob, JobStatus.AbortJobError]
+
+
+class ChunkedRunCommand:
+    """
+    ChunkedRunCommand execute a command in a subprocess and call
+    **processLine** with every line of its output.
+
+    The command is executed by the ProcessSupervisor event loop. The stdout
+    and stderr output is read in blocks, decoded and split in lines. A line
+    ends with a new line or with % so the mkvmerge progress is received as
+    soon as it is printed. A partial line is kept until the rest of it is
+    read. Every instance keeps its own state and more than one can run at the
+    same time.
+
+    While the command is running the **controlQueue** is checked an abort
+    request terminates the command. The request is left in the queue for the
+    caller to process. A command running longer than **timeout** seconds is
+    also terminated.
+
+    When **eventFields** is set the commandStarted, commandEnded and progress
+    samples every **progressEventInterval** seconds are written to the jobs
+    events log with the fields.
+
+    Args:
+        **command** (str, optional): command to execute. Defaults to None.
+
+        **processLine** (function, optional): called with every line read.
+        Defaults to None.
+
+        **processArgs** (list, optional): arguments for **processLine**.
+        Defaults to None.
+
+        **processKWArgs** (dict, optional): keyword arguments for
+        **processLine**. Defaults to None.
+
+        **controlQueue** (deque, optional): queue with control requests.
+        Defaults to None.
+
+        **commandShlex** (bool, optional): split command using shlex.
+        Defaults to True.
+
+        **timeout** (float, optional): seconds the command can run. None or 0
+        no limit. Defaults to None.
+
+        **supervisor** (ProcessSupervisor, optional): supervisor that runs the
+        command. Defaults to None use the shared supervisor.
+
+        **eventFields** (dict, optional): fields for the job events like job
+        ID and command index. Defaults to None no events.
+
+        **log** (bool, optional): log operations. Defaults to False.
+    """
+
+    reLine = re.compile(r"[^\n%]*[\n%]")
+    progressEventInterval = 5.0
+
+    def __init__(
+            self,
+            command=None,
+            processLine=None,
+            processArgs=None,
+            processKWArgs=None,
+            controlQueue=None,
+            commandShlex=True,
+            timeout=None,
+            supervisor=None,
+            eventFields=None,
+            log=False):
+
+        self.__decoders = {}
+        self.__pending = {}
+        self.__result = None
+        self.__error = ""
+        self.__eventTime = 0
+
+        self.command = command
+        self.processLine = processLine
+        self.processArgs = [] if processArgs is None else processArgs
+        self.processKWArgs = {} if processKWArgs is None else processKWArgs
+        self.controlQueue = controlQueue
+        self.commandShlex = commandShlex
+        self.timeout = timeout
+        self.supervisor = supervisor
+        self.eventFields = eventFields
+        self.log = log
+
+    def __bool__(self):
+        return bool(self.command)
+
+    @property
+    def error(self):
+        """
+        error if command can not be executed read only
+
+        Returns:
+            str: error message
+        """
+        return self.__error
+
+    @property
+    def rc(self):
+        """
+        rc return code of command read only
+
+        Returns:
+            int: return code None if command did not run
+        """
+        return None if self.__result is None else self.__result.rc
+
+    @property
+    def result(self):
+        """
+        result of command with the resources used read only
+
+        Returns:
+            CommandResult: result None if command did not run
+        """
+        return self.__result
+
+    @property
+    def aborted(self):
+        """
+        aborted command was stopped by an abort request read only
+
+        Returns:
+            bool: True if aborted
+        """
+        return (self.__result is not None) and self.__result.aborted
+
+    @property
+    def timedOut(self):
+        """
+        timedOut command was stopped by the timeout read only
+
+        Returns:
+            bool: True if command ran longer than timeout
+        """
+        return (self.__result is not None) and self.__result.timedOut
+
+    def run(self):
+        """
+        run execute command and process its output
+
+        Returns:
+            bool: True if the command was executed
+        """
+
+        self.__decoders = {}
+        self.__pending = {}
+        self.__result = None
+        self.__error = ""
+
+        cmd = self.command
+        if self.commandShlex and isinstance(cmd, str):
+            cmd = shlex.split(cmd)
+
+        supervisor = self.supervisor or ProcessSupervisor.supervisor()
+
+        startTime = time()
+        self.__eventTime = startTime
+        if self.eventFields is not None:
+            jobEvent("commandStarted", command=self.command, **self.eventFields)
+
+        try:
+            self.__result = supervisor.execute(
+                cmd,
+                onOutput=self._processChunk,
+                abort=self._abortRequested,
+                timeout=self.timeout,
+            )
+        except OSError as e:
+            self.__error = str(e)
+            if self.log:
+                MODULELOG.error("CRN0001: Command error %s - %s", cmd, e)
+            if self.eventFields is not None:
+                jobEvent(
+                    "commandEnded", rc=None, error=self.__error,
+                    seconds=round(time() - startTime, 3), **self.eventFields)
+            return False
+
+        for stream, decoder in self.__decoders.items():
+            self._processText(decoder.decode(b"", final=True), stream)
+            if pending := self.__pending.pop(stream, ""):
+                self._processLine(pending)
+
+        if self.log and self.__result.status is not None:
+            MODULELOG.debug(
+                "CRN0002: Command %s %s", self.__result.status, self.command)
+
+        if self.eventFields is not None:
+            jobEvent(
+                "commandEnded", rc=self.__result.rc,
+                status=self.__result.status,
+                seconds=round(time() - startTime, 3),
+                cpuTime=self.__result.cpuTime,
+                maxRSS=self.__result.maxRSS, **self.eventFields)
+
+        return True
+
+    def _abortRequested(self):
+        """abort request waiting in control queue"""
+
+        return bool(self.controlQueue) and (self.controlQueue[0] in ABORTSTATUS)
+
+    def _processChunk(self, chunk, stream):
+        """decode block of output of stream"""
+
+        if (decoder := self.__decoders.get(stream)) is None:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            self.__decoders[stream] = decoder
+
+        self._processText(decoder.decode(chunk), stream)
+
+    def _processText(self, text, stream):
+        """split text in lines keeping the last partial line"""
+
+        if not text:
+            return
+
+        data = self.__pending.get(stream, "") + text
+        end = 0
+        for m in self.reLine.finditer(data):
+            self._processLine(m.group())
+            end = m.end()
+        self.__pending[stream] = data[end:]
+
+    def _processLine(self, line):
+        """call processLine with the line"""
+
+        if (self.eventFields is not None) and line.endswith("%"):
+            now = time()
+            if now - self.__eventTime >= self.progressEventInterval:
+                if m := PROGRESSREGEX.search(line.strip()):
+                    self.__eventTime = now
+                    jobEvent(
+                        "progress", percent=int(m.group(1)), **self.eventFields)
+
+        if self.processLine is not None:
+            self.processLine(line, *self.processArgs, **self.processKWArgs)
@@ -0,0 +1,347 @@
+"""
+CommandPool run the commands of a job in parallel
+"""
+
+import logging
+import threading
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from vsutillib.pyside6 import SvgColor
+
+from ..utils import profiled
+from .ChunkedRunCommand import ABORTSTATUS, PROGRESSREGEX, ChunkedRunCommand
+from .JobKeys import JobKey
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class CommandPool:
+    """
+    CommandPool execute the commands generated for a job with a bounded number
+    of mkvmerge processes running at the same time.
+
+    The output of every command is collected separately and sent to the jobs
+    output as a block when the command ends so the output of the commands don't
+    mix. While waiting for a free slot or for the commands to end the worker
+    control queue is checked and abort requests are forwarded to every command
+    running.
+
+    Args:
+        **maxCommands** (int): maximum number of commands running
+
+        **job** (JobInfo): job been executed
+
+        **output** (OutputWindows): output signals through the
+        SignalCoalescer
+
+        **funcProgress** (Progress): progress signals
+
+        **controlQueue** (deque): worker control queue
+
+        **funcEnd** (function, optional): called with the command index,
+        destination file, return code, True if the command was stopped by
+        the timeout and the CommandResult when a command ends. Defaults to
+        None.
+
+        **scheduler** (DeviceScheduler, optional): limit the commands using the
+        same device. Defaults to None.
+
+        **timeout** (float, optional): seconds a command can run. None or 0 no
+        limit. Defaults to None.
+
+        **eventFields** (dict, optional): fields for the job events of the
+        commands the command index and destination file are added. Defaults
+        to None no events.
+
+        **baseProgress** (int, optional): progress of the commands of the job
+        completed outside the pool 100 for every command. Defaults to 0.
+
+        **log** (bool, optional): log operations. Defaults to False.
+    """
+
+    waitInterval = 0.25
+
+    def __init__(
+            self,
+            maxCommands,
+            job,
+            output,
+            funcProgress,
+            controlQueue,
+            funcEnd=None,
+            scheduler=None,
+            timeout=None,
+            eventFields=None,
+            baseProgress=0,
+            log=False):
+
+        self.__lock = threading.Lock()
+        self.__executor = ThreadPoolExecutor(
+            max_workers=maxCommands, thread_name_prefix="jobCommand")
+        self.__running = {}
+        self.__completed = 0
+        self.__baseProgress = baseProgress
+
+        self.maxCommands = maxCommands
+        self.job = job
+        self.output = output
+        self.progress = funcProgress
+        self.controlQueue = controlQueue
+        self.funcEnd = funcEnd
+        self.scheduler = scheduler
+        self.timeout = timeout
+        self.eventFields = eventFields
+        self.log = log
+        self.aborted = False
+        self.totalCommands = len(job.oCommand)
+
+    def __len__(self):
+        return len(self.__running)
+
+    def submit(self, index, cmd, destinationFile, sourceFiles=None):
+        """
+        submit command for execution. If all slots are used waits for a command
+        to end.
+
+        Args:
+            **index** (int): index of command in job
+
+            **cmd** (str): command to execute
+
+            **destinationFile** (Path): output file of command
+
+            **sourceFiles** (list, optional): input files of command. Defaults
+            to None.
+
+        Returns:
+            bool: True if command submitted. False if an abort request was
+            received the request is left in the control queue.
+        """
+
+        while len(self.__running) >= self.maxCommands:
+            if not self._wait():
+                return False
+
+        state = _CommandState(index, destinationFile, sourceFiles)
+        future = self.__executor.submit(self._run, cmd, state)
+        with self.__lock:
+            self.__running[future] = state
+
+        return True
+
+    def addProgress(self, progress=100):
+        """
+        addProgress add to the job total the progress of a command completed
+        outside the pool like the ones resumed or skipped
+
+        Args:
+            **progress** (int, optional): progress to add. Defaults to 100 one
+            command.
+        """
+
+        with self.__lock:
+            self.__baseProgress += progress
+
+        self._updateProgress()
+
+    def join(self):
+        """
+        join wait for all running commands to end
+
+        Returns:
+            bool: True if all commands ended. False if an abort request was
+            received the request is left in the control queue.
+        """
+
+        while self.__running:
+            if not self._wait():
+                break
+
+        # aborted commands still have to end
+        while self.__running:
+            self._wait(checkControl=False)
+
+        self.__executor.shutdown(wait=True)
+
+        return not self.aborted
+
+    def abort(self, status):
+        """
+        abort forward the abort request to all commands running
+
+        Args:
+            **status** (str): JobStatus abort request
+        """
+
+        self.aborted = True
+        with self.__lock:
+            for state in self.__running.values():
+                state.aborted = True
+                state.controlQueue.append(status)
+
+    def _wait(self, checkControl=True):
+        """wait for a command to end checking the control queue"""
+
+        if checkControl and self.controlQueue:
+            queueStatus = self.controlQueue[0]
+            if queueStatus in ABORTSTATUS:
+                if not self.aborted:
+                    self.abort(queueStatus)
+                return False
+
+        done, _ = wait(
+            list(self.__running), timeout=self.waitInterval,
+            return_when=FIRST_COMPLETED)
+
+        for future in done:
+            with self.__lock:
+                state = self.__running.pop(future)
+            self._commandEnded(state, future)
+
+        return True
+
+    def _run(self, cmd, state):
+        """execute command in pool thread"""
+
+        devices = []
+        if self.scheduler is not None:
+            devices = self.scheduler.devices(
+                state.sourceFiles, state.destinationFile)
+            if not self.scheduler.acquire(
+                    devices, cancel=lambda: state.aborted):
+                return None
+
+        try:
+            return self._runCommand(cmd, state)
+        finally:
+            if devices:
+                self.scheduler.release(devices)
+
+    @profiled()
+    def _runCommand(self, cmd, state):
+        """run command and collect output profiled when profiling is on"""
+
+        state.started = True
+        eventFields = None
+        if self.eventFields is not None:
+            eventFields = dict(
+                self.eventFields,
+                index=state.index,
+                destinationFile=state.destinationFile)
+        cli = ChunkedRunCommand(
+            processLine=self._processLine,
+            processArgs=[state],
+            controlQueue=state.controlQueue,
+            commandShlex=True,
+            timeout=self.timeout,
+            eventFields=eventFields,
+            log=self.log,
+        )
+        cli.command = cmd
+        cli.run()
+        state.timedOut = cli.timedOut
+        state.result = cli.result
+
+        if state.line:
+            state.lines.append(state.line)
+
+        return cli.rc
+
+    def _processLine(self, text, state):
+        """collect the output of a command"""
+
+        state.line += text
+        if not text.endswith("%") and not text.endswith("\n"):
+            return
+
+        line = state.line.strip()
+        if m := PROGRESSREGEX.search(line):
+            state.percent = int(m.group(1))
+            state.line = ""
+            self._updateProgress()
+        elif text.endswith("\n"):
+            state.lines.append(line + "\n")
+            state.line = ""
+
+    def _updateProgress(self):
+        """progress bar show the older command running and the job total"""
+
+        with self.__lock:
+            running = sorted(self.__running.values(), key=lambda s: s.index)
+            total = self.__baseProgress + self.__completed * 100
+
+        total += sum(s.percent for s in running)
+        self.progress.pbSetValues.emit(
+            running[0].percent if running else 0, total)
+
+    def _commandEnded(self, state, future):
+        """send command output to the jobs output"""
+
+        try:
+            rc = future.result()
+        except Exception as e:  # pylint: disable=broad-except
+            rc = None
+            state.lines.append(f"Error: {e}\n")
+            if self.log:
+                MODULELOG.error("CPL0001: Command error %s", e)
+
+        with self.__lock:
+            self.__completed += 1
+
+        if state.aborted:
+            if (
+                    state.started
+                    and state.destinationFile
+                    and state.destinationFile.is_file()):
+                state.destinationFile.unlink()
+            exitStatus = "aborted"
+        else:
+            exitStatus = "ended"
+            if self.funcEnd is not None:
+                self.funcEnd(
+                    state.index, state.destinationFile, rc, state.timedOut,
+                    state.result)
+
+        msg = (
+            f"Job ID: {self.job.jobRow[JobKey.ID]} - "
+            f"command {state.index + 1}/{self.totalCommands} {exitStatus} "
+            f"rc = {rc}\n"
+            f"Destination File: {state.destinationFile}\n"
+        )
+        msgArgs = {"color": SvgColor.cyan, "appendEnd": True}
+        self.output.job.emit(msg, msgArgs)
+        self.job.output.append([msg, msgArgs])
+
+        block = "".join(state.lines) + "\n"
+        self.output.job.emit(block, {"appendEnd": True})
+        self.job.output.append([block, {}])
+        self.output.flush()
+
+        self._updateProgress()
+
+        if self.log:
+            MODULELOG.debug(
+                "CPL0002: Job ID %s command %s %s.",
+                self.job.jobRow[JobKey.ID], state.index, exitStatus)
+
+
+class _CommandState:
+    """state of a command running in the pool"""
+
+    def __init__(self, index, destinationFile, sourceFiles=None):
+
+        self.aborted = False
+        self.controlQueue = deque()
+        self.destinationFile = destinationFile
+        self.index = index
+        self.line = ""
+        self.lines = []
+        self.percent = 0
+        self.result = None
+        self.sourceFiles = sourceFiles
+        self.started = False
+        self.timedOut = False
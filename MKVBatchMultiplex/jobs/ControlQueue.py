@@ -0,0 +1,129 @@
+"""
+ControlQueue route job control requests to the jobs workers
+"""
+
+import threading
+
+from collections import deque
+from typing import Optional
+
+
+class ControlQueue(deque):
+    """
+    ControlQueue deque used by the interface to request Abort, AbortJob and
+    AbortJobError operations on running jobs.
+
+    Every jobs worker registers with the queue and receives its own deque.
+    Requests appended to the ControlQueue are forwarded to all the registered
+    workers. **appendJob** forwards the request only to the worker running a
+    specific job. When no worker is registered there is nothing to control and
+    the request is discarded so it won't affect a later run.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.__lock = threading.Lock()
+        self.__workers = {}
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return sum(len(q) for q, _ in self.__workers.values())
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    @property
+    def workers(self) -> int:
+        """
+        workers number of registered workers read only
+
+        Returns:
+            int: workers registered
+        """
+        with self.__lock:
+            return len(self.__workers)
+
+    def register(self, workerID: int) -> deque:
+        """
+        register a worker
+
+        Args:
+            **workerID** (int): worker identification
+
+        Returns:
+            deque: queue for the worker to read control requests
+        """
+
+        workerQueue = deque()
+        with self.__lock:
+            self.__workers[workerID] = [workerQueue, None]
+
+        return workerQueue
+
+    def unregister(self, workerID: int) -> None:
+        """
+        unregister remove worker from queue
+
+        Args:
+            **workerID** (int): worker identification
+        """
+
+        with self.__lock:
+            self.__workers.pop(workerID, None)
+
+    def setJob(self, workerID: int, jobRowNumber: Optional[int]) -> None:
+        """
+        setJob set the job the worker is running
+
+        Args:
+            **workerID** (int): worker identification
+
+            **jobRowNumber** (int): row of job on jobs table None if idle
+        """
+
+        with self.__lock:
+            if workerID in self.__workers:
+                self.__workers[workerID][1] = jobRowNumber
+
+    def append(self, status: str) -> None:
+        """
+        append forward request to all workers
+
+        Args:
+            **status** (str): JobStatus request
+        """
+
+        with self.__lock:
+            for workerQueue, _ in self.__workers.values():
+                workerQueue.append(status)
+
+    def appendJob(self, status: str, jobRowNumber: int) -> bool:
+        """
+        appendJob forward request to the worker running the job
+
+        Args:
+            **status** (str): JobStatus request
+
+            **jobRowNumber** (int): row of job on jobs table
+
+        Returns:
+            bool: True if a worker is running the job. False otherwise.
+        """
+
+        with self.__lock:
+            for workerQueue, workerJob in self.__workers.values():
+                if workerJob == jobRowNumber:
+                    workerQueue.append(status)
+                    return True
+
+        return False
+
+    def clear(self) -> None:
+        """
+        clear any pending requests on the workers queues
+        """
+
+        with self.__lock:
+            for workerQueue, _ in self.__workers.values():
+                workerQueue.clear()
@@ -0,0 +1,230 @@
+"""
+DeviceScheduler limit the number of commands using a storage device
+"""
+
+import logging
+import os
+import threading
+
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+from .. import config
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class DeviceScheduler:
+    """
+    DeviceScheduler classify the commands by the devices their source and
+    destination files live on (st_dev) and cap the number of commands using
+    a device at the same time.
+
+    Rotational disks get **rotationalSlots** commands and any other device
+    **solidStateSlots** commands. A command is started only when all of its
+    devices have a free slot and all slots are taken at once, so commands
+    touching different disks overlap and a command never holds one device
+    while waiting for another.
+
+    The scheduler is shared by all the workers consuming a JobQueue.
+
+    Args:
+        **rotationalSlots** (int, optional): commands per rotational device.
+        Defaults to None read from configuration.
+
+        **solidStateSlots** (int, optional): commands per non rotational
+        device. Defaults to None read from configuration.
+
+        **log** (bool, optional): log operations. Defaults to False.
+    """
+
+    waitInterval = 0.25
+
+    def __init__(
+            self,
+            rotationalSlots: Optional[int] = None,
+            solidStateSlots: Optional[int] = None,
+            log: bool = False) -> None:
+
+        self.__condition = threading.Condition()
+        self.__inUse = {}
+        self.__rotational = {}
+
+        self.rotationalSlots = rotationalSlots
+        self.solidStateSlots = solidStateSlots
+        self.log = log
+
+    @property
+    def inUse(self) -> dict:
+        """
+        inUse commands using every device read only
+
+        Returns:
+            dict: st_dev -> number of commands
+        """
+        with self.__condition:
+            return dict(self.__inUse)
+
+    def devices(
+            self,
+            sourceFiles: Iterable,
+            destinationFile: Optional[Path] = None) -> List[int]:
+        """
+        devices used by a command
+
+        Args:
+            **sourceFiles** (list): source files of command
+
+            **destinationFile** (Path, optional): destination file of command.
+            Defaults to None.
+
+        Returns:
+            list: sorted st_dev of devices used
+        """
+
+        devices = set()
+        files = list(sourceFiles) if sourceFiles else []
+        if destinationFile:
+            files.append(destinationFile)
+        for f in files:
+            if (device := _deviceID(f)) is not None:
+                devices.add(device)
+
+        return sorted(devices)
+
+    def slots(self, device: int) -> int:
+        """
+        slots number of commands that can use a device at the same time
+
+        Args:
+            **device** (int): st_dev of device
+
+        Returns:
+            int: slots for device
+        """
+
+        if self.isRotational(device):
+            slots = self.rotationalSlots or config.data.get(
+                config.ConfigKey.DeviceRotationalSlots)
+        else:
+            slots = self.solidStateSlots or config.data.get(
+                config.ConfigKey.DeviceSolidStateSlots)
+
+        return max(slots or 1, 1)
+
+    def isRotational(self, device: int) -> bool:
+        """
+        isRotational check if device is a spinning disk. Devices that can not
+        be classified are considered non rotational.
+
+        Args:
+            **device** (int): st_dev of device
+
+        Returns:
+            bool: True if rotational device
+        """
+
+        if device not in self.__rotational:
+            self.__rotational[device] = _isRotational(device)
+            if self.log:
+                MODULELOG.debug(
+                    "DVS0001: Device %s:%s rotational %s.",
+                    os.major(device) if hasattr(os, "major") else device,
+                    os.minor(device) if hasattr(os, "minor") else "",
+                    self.__rotational[device],
+                )
+
+        return self.__rotational[device]
+
+    def acquire(
+            self,
+            devices: List[int],
+            cancel: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        acquire a slot in every device waiting until all are free
+
+        Args:
+            **devices** (list): st_dev of devices used by command
+
+            **cancel** (function, optional): called while waiting return True
+            to stop waiting. Defaults to None.
+
+        Returns:
+            bool: True if slots acquired. False if cancelled.
+        """
+
+        with self.__condition:
+            while not self._available(devices):
+                if (cancel is not None) and cancel():
+                    return False
+                self.__condition.wait(self.waitInterval)
+            for device in devices:
+                self.__inUse[device] = self.__inUse.get(device, 0) + 1
+
+        return True
+
+    def release(self, devices: List[int]) -> None:
+        """
+        release the slots acquired for a command
+
+        Args:
+            **devices** (list): st_dev of devices used by command
+        """
+
+        with self.__condition:
+            for device in devices:
+                if (count := self.__inUse.get(device, 0) - 1) > 0:
+                    self.__inUse[device] = count
+                else:
+                    self.__inUse.pop(device, None)
+            self.__condition.notify_all()
+
+    def _available(self, devices: List[int]) -> bool:
+        """check all devices have a free slot lock must be held"""
+
+        for device in devices:
+            inUse = self.__inUse.get(device, 0)
+            if inUse and (inUse >= self.slots(device)):
+                return False
+
+        return True
+
+
+def _deviceID(fileName) -> Optional[int]:
+    """st_dev of file or of the first existing parent directory"""
+
+    f = Path(fileName)
+    for p in [f, *f.parents]:
+        try:
+            return p.stat().st_dev
+        except OSError:
+            continue
+
+    return None
+
+
+def _isRotational(device: int) -> bool:
+    """read rotational flag from sysfs only available on Linux"""
+
+    if not hasattr(os, "major"):
+        return False
+
+    sysDevice = Path(f"/sys/dev/block/{os.major(device)}:{os.minor(device)}")
+    try:
+        sysDevice = sysDevice.resolve(strict=True)
+    except OSError:
+        # tmpfs, network file systems ...
+        return False
+
+    # partitions have the queue information in the parent device
+    for p in [sysDevice, sysDevice.parent]:
+        rotational = p / "queue" / "rotational"
+        if rotational.is_file():
+            try:
+                return rotational.read_text().strip() == "1"
+            except OSError:
+                return False
+
+    return False
@@ -0,0 +1,143 @@
+"""
+HistoryJob job saved in the history read on demand
+"""
+# HJB0001
+
+try:
+    import cPickle as pickle
+except:  # pylint: disable=bare-except
+    import pickle
+import json
+import logging
+import zlib
+
+from .SqlJobsTable import HISTORYFIELDS, SqlJobsTable
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class HistoryJob:  # pylint: disable=too-many-instance-attributes
+    """
+    HistoryJob job of the history made from its row in the jobs table. The
+    commands, output, errors and status changes saved as the job ran are read
+    from their tables the first time they are used and the archived job is
+    unpickled only when it is asked for.
+
+    The database is read with the shared connection of the calling thread.
+
+    Args:
+        **row** (tuple): row with the HISTORYFIELDS
+
+        **dbFile** (str, pathlib.Path, optional): database file. Defaults to
+        None use ConfigKey.SystemDB.
+    """
+
+    def __init__(self, row, dbFile=None):
+
+        self.__commands = None
+        self.__output = {}
+        self.__statusChanges = None
+        self.__job = None
+
+        self.dbFile = dbFile
+        for field, value in zip(HISTORYFIELDS, row):
+            setattr(self, field, value)
+
+    @property
+    def database(self):
+        """
+        database history database of the calling thread
+
+        Returns:
+            SqlJobsTable: database
+        """
+
+        return SqlJobsTable.shared(self.dbFile)
+
+    @property
+    def commands(self):
+        """
+        commands of the job
+
+        Returns:
+            list: (commandIndex, command, destinationFile, rc, status,
+            endTime) rc, status and endTime are None for the commands not
+            executed
+        """
+
+        if self.__commands is None:
+            cursor = self.database.historyCommands(self.rowid)
+            self.__commands = [] if cursor is None else cursor.fetchall()
+
+        return self.__commands
+
+    @property
+    def output(self):
+        """
+        output of the job
+
+        Returns:
+            list: entries as they were in the job
+        """
+
+        return self._outputLog("output")
+
+    @property
+    def errors(self):
+        """
+        errors of the job
+
+        Returns:
+            list: entries as they were in the job
+        """
+
+        return self._outputLog("errors")
+
+    @property
+    def statusChanges(self):
+        """
+        statusChanges status of the job every time it changed
+
+        Returns:
+            list: (status, changeTime)
+        """
+
+        if self.__statusChanges is None:
+            cursor = self.database.historyStatusChanges(self.rowid)
+            self.__statusChanges = [] if cursor is None else cursor.fetchall()
+
+        return self.__statusChanges
+
+    @property
+    def job(self):
+        """
+        job archived
+
+        Returns:
+            JobInfo: job unpickled. None if it was not archived.
+        """
+
+        if self.__job is None:
+            if (cmpJob := self.database.archivedJob(self.rowid)) is not None:
+                try:
+                    self.__job = pickle.loads(zlib.decompress(cmpJob))
+                except Exception as e:  # pylint: disable=broad-except
+                    MODULELOG.error(
+                        "HJB0001: History row %s job not read - %s",
+                        self.rowid, e)
+
+        return self.__job
+
+    def _outputLog(self, kind):
+        """entries of output or errors"""
+
+        if kind not in self.__output:
+            cursor = self.database.historyOutput(self.rowid, kind)
+            self.__output[kind] = [] if cursor is None else [
+                text if args is None else [text, json.loads(args)]
+                for text, args in cursor.fetchall()
+            ]
+
+        return self.__output[kind]
@@ -0,0 +1,233 @@
+"""
+HistoryWriter save the jobs in the history database in a thread
+"""
+# HWR0001
+
+import logging
+import queue
+import threading
+
+from .. import config
+from .jobsDB import addToDb
+from .JobKeys import JobKey
+from .MetricsRegistry import metrics
+from .SqlJobsTable import SqlJobsTable
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class HistoryWriter:
+    """
+    HistoryWriter the jobs workers queue a snapshot of the job and a thread
+    saves what changed since the last save so the next command does not wait
+    for the database. The metrics of the commands and jobs are also queued.
+    The jobs and metrics waiting when the thread takes them are saved in one
+    transaction of at most **batchSize** items.
+
+    Use **historyWriter** to get the instance shared by the application.
+
+    Args:
+        **batchSize** (int, optional): jobs and metrics saved in one
+        transaction. Defaults to 64.
+    """
+
+    __lock = threading.Lock()
+    __historyWriter = None
+
+    @classmethod
+    def historyWriter(cls):
+        """
+        historyWriter writer shared by the application
+
+        Returns:
+            HistoryWriter: shared instance
+        """
+
+        with cls.__lock:
+            if cls.__historyWriter is None:
+                cls.__historyWriter = cls()
+                metrics.collector(
+                    "history_backlog", "gauge",
+                    "Jobs and metrics waiting to be saved in the history.",
+                    lambda: cls.__historyWriter.backlog)
+
+        return cls.__historyWriter
+
+    @classmethod
+    def shutdown(cls):
+        """
+        shutdown save pending jobs of the shared instance if it was used
+        """
+
+        with cls.__lock:
+            historyWriter = cls.__historyWriter
+
+        if historyWriter is not None:
+            historyWriter.close()
+
+    def __init__(self, batchSize=64):
+
+        self.__lock = threading.Lock()
+        self.__saved = threading.Condition(self.__lock)
+        self.__queue = queue.SimpleQueue()
+        self.__thread = None
+        self.__backlog = 0
+
+        self.batchSize = batchSize
+
+    @property
+    def backlog(self):
+        """
+        backlog jobs and metrics queued and not yet saved
+
+        Returns:
+            int: items waiting
+        """
+
+        return self.__backlog
+
+    def save(self, job, update=False):
+        """
+        save queue a snapshot of the job to be saved
+
+        Args:
+            **job** (JobInfo): job to save
+
+            **update** (bool, optional): update is true if record should
+            exits. Defaults to False.
+        """
+
+        if config.data.get(config.ConfigKey.SimulateRun):
+            return
+
+        self._put((job.snapshot(), update, job))
+
+    def addCommandMetrics(self, *args):
+        """
+        addCommandMetrics queue the resources used by a command
+
+        Args:
+            **args**: arguments of SqlJobsTable.addCommandMetrics
+        """
+
+        self._put(("addCommandMetrics", args, None))
+
+    def addJobMetrics(self, *args):
+        """
+        addJobMetrics queue the resources used by the commands of a job
+
+        Args:
+            **args**: arguments of SqlJobsTable.addJobMetrics
+        """
+
+        self._put(("addJobMetrics", args, None))
+
+    def _put(self, item):
+        """queue item starting the writer thread on first use"""
+
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(
+                    target=self._writer, name="historyWriter", daemon=True)
+                self.__thread.start()
+            self.__backlog += 1
+            self.__queue.put(item)
+
+    def flush(self, timeout=None):
+        """
+        flush wait for the jobs queued to be saved
+
+        Args:
+            **timeout** (float, optional): seconds to wait. Defaults to None
+            wait until saved.
+
+        Returns:
+            bool: True if all jobs were saved
+        """
+
+        with self.__saved:
+            return self.__saved.wait_for(
+                lambda: self.__backlog == 0, timeout=timeout)
+
+    def close(self):
+        """
+        close save pending jobs and stop the writer thread
+        """
+
+        with self.__lock:
+            thread, self.__thread = self.__thread, None
+            if thread is not None:
+                self.__queue.put(None)
+
+        if thread is not None:
+            thread.join()
+
+    def _writer(self):
+        """save jobs as they are queued"""
+
+        running = True
+
+        while running:
+            items = [self.__queue.get()]
+            # take what is waiting and save it at once
+            while len(items) < self.batchSize:
+                try:
+                    items.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            running = None not in items
+            items = [item for item in items if item is not None]
+
+            if items:
+                self._saveJobs(items)
+
+            with self.__saved:
+                self.__backlog -= len(items)
+                self.__saved.notify_all()
+
+        # the connection belongs to this thread
+        SqlJobsTable.shutdown()
+
+    def _saveJobs(self, items):
+        """save jobs and metrics in one transaction"""
+
+        database = SqlJobsTable.shared()
+        rowids = {}
+        jobs = [job for _, _, job in items if job is not None]
+        try:
+            for item in items:
+                if item[2] is None:
+                    # metrics are the database method and its arguments
+                    method, args, _ = item
+                    getattr(database, method)(*args, commit=False)
+                    continue
+                snapshot, update, job = item
+                # the insert may be in this batch
+                snapshot.rowid = rowids.get(
+                    id(job), getattr(job, "rowid", None))
+                addToDb(
+                    database,
+                    snapshot,
+                    update=update,
+                    name="AutoSave",
+                    description="AutoSave",
+                    commit=False,
+                )
+                rowids[id(job)] = snapshot.rowid
+            database.commit()
+        except Exception as e:  # pylint: disable=broad-except
+            # the jobs keep the rowid they had the next save of a job not
+            # inserted inserts it
+            database.rollback()
+            MODULELOG.error(
+                "HWR0001: Jobs ID: %s and %s metrics not saved - %s",
+                [job.jobRow[JobKey.ID] for job in jobs],
+                len(items) - len(jobs), e)
+            return
+
+        # the updates of the jobs use the rows inserted
+        for job in jobs:
+            job.rowid = rowids[id(job)]
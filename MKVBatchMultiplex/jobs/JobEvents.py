@@ -0,0 +1,217 @@
+"""
+JobEvents machine readable log of the jobs events in JSON Lines
+"""
+# JEV0001
+
+import json
+import logging
+import queue
+import threading
+
+from datetime import date, timedelta
+from pathlib import Path
+from time import time
+
+from .. import config
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class JobEventLog:
+    """
+    JobEventLog write the events of the jobs as JSON Lines. Every event is a
+    JSON object in its own line with the keys:
+
+        - time: seconds since the epoch
+        - event: name of event
+        - the fields of the event
+
+    The events are queued and written by a thread so the workers don't wait
+    for the disk. There is a file for every day named
+    **prefix**-YYYY-MM-DD.jsonl in **directory**. Files older than
+    **keepDays** are removed when a new day starts.
+
+    Use **eventLog** to get the instance shared by the application.
+
+    Args:
+        **directory** (Path): directory for the event files
+
+        **enabled** (bool, optional): write events. Defaults to True.
+
+        **keepDays** (int, optional): days of files kept 0 keep all. Defaults
+        to 30.
+
+        **prefix** (str, optional): file names prefix. Defaults to "events".
+    """
+
+    __lock = threading.Lock()
+    __eventLog = None
+
+    @classmethod
+    def eventLog(cls):
+        """
+        eventLog event log shared by the application configured with
+        ConfigKey.JobEvents and ConfigKey.JobEventsDays
+
+        Returns:
+            JobEventLog: shared instance
+        """
+
+        with cls.__lock:
+            if cls.__eventLog is None:
+                cls.__eventLog = cls(
+                    Path(
+                        config.data.get(config.ConfigKey.SystemDB)
+                    ).parent.joinpath(config.JOBSEVENTSDIR),
+                    enabled=config.data.get(config.ConfigKey.JobEvents),
+                    keepDays=config.data.get(config.ConfigKey.JobEventsDays),
+                )
+
+        return cls.__eventLog
+
+    @classmethod
+    def shutdown(cls):
+        """
+        shutdown write pending events of the shared instance if it was used
+        """
+
+        with cls.__lock:
+            eventLog = cls.__eventLog
+
+        if eventLog is not None:
+            eventLog.close()
+
+    def __init__(self, directory, enabled=True, keepDays=30, prefix="events"):
+
+        self.__lock = threading.Lock()
+        self.__queue = queue.SimpleQueue()
+        self.__thread = None
+
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self.keepDays = keepDays
+        self.prefix = prefix
+
+    def event(self, event, **fields):
+        """
+        event queue event to be written
+
+        Args:
+            **event** (str): name of event
+
+            **fields** (dict): event information values that are not JSON
+            types are written as strings
+        """
+
+        if not self.enabled:
+            return
+
+        record = {"time": time(), "event": event}
+        record.update(fields)
+
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(
+                    target=self._writer, name="jobEvents", daemon=True)
+                self.__thread.start()
+            self.__queue.put(record)
+
+    def close(self):
+        """
+        close write pending events and stop the writer thread
+        """
+
+        with self.__lock:
+            thread, self.__thread = self.__thread, None
+            if thread is not None:
+                self.__queue.put(None)
+
+        if thread is not None:
+            thread.join()
+
+    def fileName(self, day):
+        """
+        fileName events file for a day
+
+        Args:
+            **day** (date): day of events
+
+        Returns:
+            Path: file name
+        """
+
+        return self.directory.joinpath(f"{self.prefix}-{day.isoformat()}.jsonl")
+
+    def _writer(self):
+        """write events as they are queued"""
+
+        f = None
+        currentDay = None
+        running = True
+
+        while running:
+            records = [self.__queue.get()]
+            # take what is waiting and write it at once
+            while True:
+                try:
+                    records.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                for record in records:
+                    if record is None:
+                        running = False
+                        break
+                    day = date.fromtimestamp(record["time"])
+                    if day != currentDay:
+                        if f is not None:
+                            f.close()
+                        self.directory.mkdir(parents=True, exist_ok=True)
+                        f = open(self.fileName(day), "a", encoding="utf-8")
+                        currentDay = day
+                        self._removeOldFiles(day)
+                    f.write(json.dumps(record, default=str) + "\n")
+                if f is not None:
+                    f.flush()
+            except OSError as e:
+                MODULELOG.error("JEV0001: Events file error - %s", e)
+                if f is not None:
+                    f.close()
+                f = None
+                currentDay = None
+
+        if f is not None:
+            f.close()
+
+    def _removeOldFiles(self, day):
+        """remove events files older than keepDays"""
+
+        if not self.keepDays:
+            return
+
+        oldest = self.fileName(day - timedelta(days=self.keepDays)).name
+        for eventsFile in self.directory.glob(f"{self.prefix}-*.jsonl"):
+            # ISO dates in the names sort as the dates
+            if eventsFile.name < oldest:
+                try:
+                    eventsFile.unlink()
+                except OSError as e:
+                    MODULELOG.error(
+                        "JEV0002: Events file remove error %s - %s",
+                        eventsFile, e)
+
+
+def jobEvent(event, **fields):
+    """
+    jobEvent write event in the shared event log
+
+    Args:
+        **event** (str): name of event
+
+        **fields** (dict): event information
+    """
+
+    JobEventLog.eventLog().event(event, **fields)
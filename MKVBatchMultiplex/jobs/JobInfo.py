@@ -0,0 +1,290 @@
+"""
+JobInfo information for a job used by the jobs workers and the command line
+"""
+# JBQ0001
+
+import copy
+import logging
+
+from datetime import datetime
+from pathlib import Path
+from time import time
+from typing import TYPE_CHECKING, Optional
+
+from vsutillib.mkv import MKVCommandParser
+
+from .. import config
+from .commandMetrics import newJobMetrics
+from .JobKeys import JobKey
+from .JobOutputLog import JobOutputLog
+
+if TYPE_CHECKING:
+    from ..models import TableProxyModel
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class JobInfo:  # pylint: disable=too-many-instance-attributes
+    """
+    JobInfo Information for a job
+
+    The output and errors are kept in JobOutputLog objects saved in
+    compressed files in the JOBSLOGDIR directory next to the system
+    database. The files are removed with the job from the history, for the
+    jobs not saved in the history when they are no longer listed and after
+    ConfigKey.JobLogsDays.
+
+    Args:
+        **jobRowNumber** (int): row of job in table
+
+        **jobRow** (list): row on job in table
+
+        **tableModel** (TableProxyModel, optional): model of jobs table the
+        command object is taken from it. Defaults to None.
+
+        **algorithm** (int, optional): algorithm used to adjust commands.
+        Defaults to None use configuration setting.
+
+        **errors** (list, optional): errors on job execution. Defaults to None.
+
+        **output** (list, optional): job execution output. Defaults to None.
+
+        **priority** (int, optional): priority of job in queue higher runs
+        first. Defaults to 0.
+
+        **checkpoints** (dict, optional): commands completed on a previous run
+        of the job. Defaults to None.
+
+        **appDir** (Path, optional): application directory. Defaults to None.
+
+        **oCommand** (MKVCommandParser, optional): command object to use when
+        there is no **tableModel**. Defaults to None parse command in
+        **jobRow**.
+
+        **log** (bool, optional): log operations. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        jobRowNumber: int,
+        jobRow: int,
+        tableModel: Optional["TableProxyModel"] = None,
+        algorithm: Optional[int] = None,
+        errors: Optional[list] = None,
+        output: Optional[list] = None,
+        priority: int = 0,
+        checkpoints: Optional[dict] = None,
+        appDir: Optional[Path] = None,
+        oCommand: Optional[MKVCommandParser] = None,
+        log: Optional[bool] = False
+    ) -> None:
+
+        self.__jobRow = []
+        self.__sourceSize = None
+        self.jobRowNumber = jobRowNumber
+        self.jobRow = jobRow
+        if tableModel is not None:
+            oCommand = tableModel.dataset.data[jobRowNumber][JobKey.Command].obj
+        self.oCommand = copy.deepcopy(oCommand)
+        if (not self.oCommand) or (not self.oCommand.command):
+            if tableModel is not None:
+                command = tableModel.dataset[jobRowNumber, JobKey.Command]
+            else:
+                command = self.jobRow[JobKey.Command]
+            # TODO: check this code more carefully
+            useEmbedded = config.data.get(config.ConfigKey.UseEmbedded)
+            self.oCommand = MKVCommandParser(
+                command,
+                appDir=appDir,
+                useEmbedded=useEmbedded,
+                log=log)
+            if log and (tableModel is not None):
+                MODULELOG.debug(
+                    "JBQ0001: Job %s- Bad MKVCommandParser object.", jobRow[JobKey.ID]
+                )
+        self.date = datetime.today()
+        self.addTime = time()
+        self.startTime = None
+        self.endTime = None
+        self.errors = self._outputLog("errors", errors)
+        self.output = self._outputLog("output", output)
+        self.algorithm = None
+        if algorithm is None:
+            self.algorithm = config.data.get(config.ConfigKey.Algorithm)
+        else:
+            self.algorithm = algorithm
+        self.commandsWorkers = config.data.get(config.ConfigKey.CommandsWorkers)
+        self.priority = priority
+        self.queueOrder = None
+        self.checkpoints = {} if checkpoints is None else checkpoints
+        # job ID of the run resumed its checkpoints are kept until it starts
+        self.resumedID = None
+        self.statistics = {"commands": 0, "resumed": 0, "skipped": 0}
+        self.metrics = newJobMetrics()
+        # rc, status and end time of the commands executed by index
+        self.commandResults = {}
+        # row of the job in the history set when it is saved
+        self.rowid = None
+
+    def _outputLog(self, name, entries):
+        """log for output or errors"""
+
+        fileName = None
+        if (directory := jobLogsDirectory()) is not None:
+            fileName = directory.joinpath(
+                f"{self.jobRow[JobKey.ID]}-{int(self.addTime * 1000)}-"
+                f"{name}.gz")
+
+        return JobOutputLog(
+            fileName,
+            entries=entries,
+            maxLines=config.data.get(config.ConfigKey.JobOutputLines),
+        )
+
+    def removeLogs(self):
+        """
+        removeLogs remove the output and errors files of the job the lines in
+        memory are kept
+        """
+
+        self.output.remove()
+        self.errors.remove()
+
+    @property
+    def jobRow(self):
+        """
+        jobRow row of job in table read write
+
+        Returns:
+            int: row number of job in table
+        """
+        return self.__jobRow
+
+    @jobRow.setter
+    def jobRow(self, value):
+        if isinstance(value, list):
+            self.__jobRow = []
+            for cell in value:
+                self.__jobRow.append(cell)
+
+    @property
+    def sourceSize(self):
+        """
+        sourceSize total bytes of the source files of the job read only
+
+        Returns:
+            int: size in bytes
+        """
+
+        if self.__sourceSize is None:
+            if not self.oCommand.commandsGenerated:
+                self.oCommand.generateCommands()
+            size = 0
+            for files in self.oCommand.sourceFiles or []:
+                for f in files:
+                    try:
+                        size += Path(f).stat().st_size
+                    except OSError:
+                        pass
+            self.__sourceSize = size
+
+        return self.__sourceSize
+
+    @property
+    def status(self):
+        """
+        status of job read write
+
+        Returns:
+            [type]: [description]
+        """
+        return self.jobRow[JobKey.Status]
+
+    @status.setter
+    def status(self, value):
+        if isinstance(value, str):
+            self.jobRow[JobKey.Status] = value
+
+    def snapshot(self):
+        """
+        snapshot copy of the job to save it while the job keeps running. The
+        values that change while the job runs are copied, the command object
+        and the output logs are shared.
+
+        Returns:
+            JobInfo: copy of job
+        """
+
+        job = copy.copy(self)
+        job.jobRow = self.jobRow
+        job.checkpoints = dict(self.checkpoints)
+        job.statistics = dict(self.statistics)
+        job.metrics = dict(self.metrics)
+        job.commandResults = dict(self.commandResults)
+
+        return job
+
+
+def jobLogsDirectory():
+    """
+    jobLogsDirectory directory of the jobs output and errors files
+
+    Returns:
+        Path: directory. None if there is no system database.
+    """
+
+    if systemDB := config.data.get(config.ConfigKey.SystemDB):
+        return Path(systemDB).parent.joinpath(config.JOBSLOGDIR)
+
+    return None
+
+
+def removeJobLogs(jobID):
+    """
+    removeJobLogs remove the output and errors files of a job
+
+    Args:
+        **jobID** (int): job ID
+    """
+
+    if (directory := jobLogsDirectory()) is None:
+        return
+
+    for logFile in directory.glob(f"{jobID}-*.gz"):
+        _removeLog(logFile)
+
+
+def removeOldJobLogs(keepDays=None):
+    """
+    removeOldJobLogs remove the output and errors files not modified in the
+    last keepDays
+
+    Args:
+        **keepDays** (int, optional): days files are kept 0 keep all. Defaults
+        to None use ConfigKey.JobLogsDays.
+    """
+
+    if keepDays is None:
+        keepDays = config.data.get(config.ConfigKey.JobLogsDays)
+
+    if (not keepDays) or ((directory := jobLogsDirectory()) is None):
+        return
+
+    oldest = time() - keepDays * 86400
+    for logFile in directory.glob("*.gz"):
+        try:
+            if logFile.stat().st_mtime < oldest:
+                _removeLog(logFile)
+        except OSError:
+            pass
+
+
+def _removeLog(logFile):
+    """remove log file"""
+
+    try:
+        logFile.unlink()
+    except OSError as e:
+        MODULELOG.error("JBQ0002: Job log remove error %s - %s", logFile, e)
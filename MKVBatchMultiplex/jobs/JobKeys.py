@@ -21,6 +21,9 @@ class JobsTableKey:
     projectInfo: str = "projectInfo"
     saved: str = "saved"
     deleteMark: str = "deleteMark"
+    status: str = "status"
+    algorithm: str = "algorithm"
+    totalCommands: str = "totalCommands"
 
     rowidIndex: int = 0
     IDIndex: int = 1
@@ -34,6 +37,9 @@ class JobsTableKey:
     projectInfoIndex: int = 9
     savedIndex: int = 10
     deleteMarkIndex: int = 11
+    statusIndex: int = 12
+    algorithmIndex: int = 13
+    totalCommandsIndex: int = 14
 
 
 class JobKey:
@@ -0,0 +1,215 @@
+"""
+JobOutputLog bounded output of a job saved to a compressed file
+"""
+# JOL0001
+
+import gzip
+import logging
+import pickle
+import threading
+
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class JobOutputLog:
+    """
+    JobOutputLog replaces the lists used for the output and errors of a job.
+
+    Only the last **maxLines** entries are kept in memory. Every entry is
+    also appended to a gzip compressed file, entries are written in blocks of
+    **writeBlock**. Iterating the log reads the entries from the file one at
+    a time. When pickled for the jobs history the file name and the entries
+    in memory are saved so memory and history size don't grow with the job
+    and a job whose file was removed keeps its last entries.
+
+    It keeps the **append** method and iteration of the list it replaces and
+    is safe to use from more than one thread.
+
+    Args:
+        **fileName** (Path, optional): log file. Defaults to None keep entries
+        only in memory.
+
+        **entries** (Iterable, optional): initial entries. Defaults to None.
+
+        **maxLines** (int, optional): entries kept in memory. Defaults to
+        2000.
+
+        **writeBlock** (int, optional): entries written to file at once.
+        Defaults to 256.
+    """
+
+    def __init__(
+            self,
+            fileName: Optional[Path] = None,
+            entries: Optional[Iterable] = None,
+            maxLines: int = 2000,
+            writeBlock: int = 256) -> None:
+
+        self.__lock = threading.RLock()
+        self.__pending = []
+        self.__count = 0
+
+        self.fileName = None if fileName is None else Path(fileName)
+        self.maxLines = maxLines
+        self.writeBlock = writeBlock
+        self.tail = deque(maxlen=maxLines)
+
+        for entry in entries or []:
+            self.append(entry)
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __bool__(self) -> bool:
+        return self.__count > 0
+
+    def __iter__(self) -> Iterator:
+        return self.entries()
+
+    def __getstate__(self) -> dict:
+        self.flush()
+        with self.__lock:
+            state = {
+                "fileName": self.fileName,
+                "count": self.__count,
+                "maxLines": self.maxLines,
+                "writeBlock": self.writeBlock,
+                # what is left if the file is removed
+                "tail": list(self.tail),
+            }
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__lock = threading.RLock()
+        self.__pending = []
+        self.__count = state["count"]
+        self.fileName = state["fileName"]
+        self.maxLines = state["maxLines"]
+        self.writeBlock = state["writeBlock"]
+        self.tail = deque(state.get("tail", []), maxlen=self.maxLines)
+
+    def append(self, entry) -> None:
+        """
+        append entry to log
+
+        Args:
+            **entry** (list): [msg, msgArgs] entry
+        """
+
+        with self.__lock:
+            self.tail.append(entry)
+            self.__count += 1
+            if self.fileName is not None:
+                self.__pending.append(entry)
+                if len(self.__pending) >= self.writeBlock:
+                    self.flush()
+
+    def flush(self) -> None:
+        """
+        flush write pending entries to file
+        """
+
+        with self.__lock:
+            if (not self.__pending) or (self.fileName is None):
+                return
+            try:
+                self.fileName.parent.mkdir(parents=True, exist_ok=True)
+                # every block is a gzip member gzip reads them as one stream
+                with gzip.open(self.fileName, "ab") as f:
+                    for entry in self.__pending:
+                        pickle.dump(entry, f)
+            except OSError as e:
+                MODULELOG.error(
+                    "JOL0001: Log file error %s - %s", self.fileName, e)
+                # continue in memory
+                self.fileName = None
+            self.__pending = []
+
+    def remove(self) -> None:
+        """
+        remove the log file the entries in memory are kept
+        """
+
+        with self.__lock:
+            self.__pending = []
+            fileName, self.fileName = self.fileName, None
+            if fileName is not None:
+                try:
+                    fileName.unlink(missing_ok=True)
+                except OSError as e:
+                    MODULELOG.error(
+                        "JOL0003: Log file remove error %s - %s", fileName, e)
+
+    def entries(self) -> Iterator:
+        """
+        entries all the entries of the log read one at a time
+
+        Yields:
+            entry read from file. Only the entries in memory if there is no
+            file.
+        """
+
+        for _, entry in self._indexedEntries():
+            yield entry
+
+    def indexedEntries(self, start: int = 0) -> List:
+        """
+        indexedEntries entries from **start** with their index in the log.
+        The file is only read if the entries are no longer in memory.
+
+        Args:
+            **start** (int, optional): index of first entry. Defaults to 0.
+
+        Returns:
+            list: (index, entry) of the entries from start. The entries lost
+            when there is no file are skipped.
+        """
+
+        with self.__lock:
+            first = self.__count - len(self.tail)
+            if start >= first:
+                return list(
+                    enumerate(islice(self.tail, start - first, None), start))
+
+        return [
+            (index, entry) for index, entry in self._indexedEntries()
+            if index >= start
+        ]
+
+    def _indexedEntries(self) -> Iterator[Tuple[int, object]]:
+        """
+        (index, entry) read from file the entries appended after the read
+        starts are not read. If the file can't be read the rest is taken from
+        the entries in memory.
+        """
+
+        self.flush()
+        with self.__lock:
+            fileName = self.fileName
+            count = self.__count
+            first = count - len(self.tail)
+            tail = list(self.tail)
+
+        index = 0
+        if (fileName is not None) and fileName.is_file():
+            try:
+                with gzip.open(fileName, "rb") as f:
+                    while index < count:
+                        entry = pickle.load(f)
+                        yield index, entry
+                        index += 1
+                return
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                MODULELOG.error("JOL0002: Log file error %s - %s", fileName, e)
+
+        # the entries lost when there is no file are skipped
+        start = max(index, first)
+        yield from enumerate(tail[start - first:], start)
@@ -3,22 +3,20 @@
 """
 # JOB0001
 
-import copy
 import logging
-
-from collections import deque
-from datetime import datetime
-from pathlib import Path
-from time import time
-from typing import Optional
+import threading
 
 from PySide6.QtCore import QObject, Slot, Signal
 
-from vsutillib.mkv import MKVCommandParser
-
 from .. import config
 from ..models import TableProxyModel
+from .ControlQueue import ControlQueue
+from .DeviceScheduler import DeviceScheduler
+from .JobEvents import jobEvent
+# JobInfo imported here also to load jobs saved in history
+from .JobInfo import JobInfo
 from .JobKeys import JobStatus, JobKey
+from .JobWorkQueue import JobWorkQueue
 from .RunJobs import RunJobs
 
 
@@ -26,98 +24,6 @@ MODULELOG = logging.getLogger(__name__)
 MODULELOG.addHandler(logging.NullHandler())
 
 
-class JobInfo:  # pylint: disable=too-many-instance-attributes
-    """
-    JobInfo Information for a job
-
-    Args:
-        **status** (str, optional): job status. Defaults to "".
-
-        **index** (QModelIndex, optional): index on job in table. Defaults to None.
-
-        **job** (list, optional): row on job in table. Defaults to None.
-
-        **errors** (list, optional): errors on job execution. Defaults to None.
-
-        **output** (list, optional): job execution output. Defaults to None.
-    """
-
-    def __init__(
-        self,
-        jobRowNumber: int,
-        jobRow: int,
-        tableModel: TableProxyModel,
-        algorithm: Optional[int] = None,
-        errors: Optional[list] = None,
-        output: Optional[list] = None,
-        appDir: Optional[Path] = None,
-        log: Optional[bool] = False
-    ) -> None:
-
-        self.__jobRow = []
-        self.jobRowNumber = jobRowNumber
-        self.jobRow = jobRow
-        self.oCommand = copy.deepcopy(
-            tableModel.dataset.data[jobRowNumber][JobKey.Command].obj
-        )
-        if (not self.oCommand) or (not self.oCommand.command):
-            command = tableModel.dataset[jobRowNumber, JobKey.Command]
-            # TODO: check this code more carefully
-            useEmbedded = config.data.get(config.ConfigKey.UseEmbedded)
-            self.oCommand = MKVCommandParser(
-                command,
-                appDir=appDir,
-                useEmbedded=useEmbedded,
-                log=log)
-            if log:
-                MODULELOG.debug(
-                    "JBQ0001: Job %s- Bad MKVCommandParser object.", jobRow[JobKey.ID]
-                )
-        self.date = datetime.today()
-        self.addTime = time()
-        self.startTime = None
-        self.endTime = None
-        self.errors = [] if errors is None else errors
-        self.output = [] if output is None else output
-        self.algorithm = None
-        if algorithm is None:
-            self.algorithm = config.data.get(config.ConfigKey.Algorithm)
-        else:
-            self.algorithm = algorithm
-
-    @property
-    def jobRow(self):
-        """
-        jobRow row of job in table read write
-
-        Returns:
-            int: row number of job in table
-        """
-        return self.__jobRow
-
-    @jobRow.setter
-    def jobRow(self, value):
-        if isinstance(value, list):
-            self.__jobRow = []
-            for cell in value:
-                self.__jobRow.append(cell)
-
-    @property
-    def status(self):
-        """
-        status of job read write
-
-        Returns:
-            [type]: [description]
-        """
-        return self.jobRow[JobKey.Status]
-
-    @status.setter
-    def status(self, value):
-        if isinstance(value, str):
-            self.jobRow[JobKey.Status] = value
-
-
 class JobQueue(QObject):
     """
     JobQueue - class to manage jobs queue
@@ -131,15 +37,19 @@ class JobQueue(QObject):
         **funcProgress** (function, optional): Function that updates progress bar.
         Defaults to None.
 
-        **jobWorkQueue** (deque, optional): Queue to use to save Jobs to execute.
-        Defaults to None.
+        **jobWorkQueue** (JobWorkQueue, optional): Queue to use to save Jobs to
+        execute. Defaults to None.
 
-        **controlQueue** (deque, optional): Queue to control Jobs execution.
-        Some status conditions are routed through here to Stop, Skip or Abort Jobs.
-        Defaults to None.
+        **controlQueue** (ControlQueue, optional): Queue to control Jobs
+        execution. Some status conditions are routed through here to Stop, Skip
+        or Abort Jobs. Defaults to None.
 
         **log** (bool, optional): Logging can be controlled using this parameter.
         Defaults to None.
+
+    The queue can be consumed by more than one jobs worker at the same time.
+    The commands executed by the workers share the **deviceScheduler** that
+    limits the commands using the same storage device.
     """
 
     # Class logging state
@@ -168,6 +78,8 @@ class JobQueue(QObject):
         super(JobQueue, self).__init__(parent)
 
         self.__log = None
+        self.__lock = threading.Lock()
+        self.__checkpoints = {}
         self.__progress = None
         self.__model = None
         self.__proxyModel = None
@@ -175,11 +87,16 @@ class JobQueue(QObject):
         self.parent = parent
         self.proxyModel = proxyModel
         self.progress = funcProgress
-        self.controlQueue = controlQueue
+        self.controlQueue = (
+            ControlQueue() if controlQueue is None else controlQueue)
         self.appDir = appDir
+        self.deviceScheduler = DeviceScheduler(log=log)
 
         if jobWorkQueue is None:
-            self._workQueue = deque()
+            self._workQueue = JobWorkQueue(
+                shortestJobFirst=lambda: config.data.get(
+                    config.ConfigKey.ShortestJobFirst)
+            )
         else:
             self._workQueue = jobWorkQueue
 
@@ -333,6 +250,7 @@ class JobQueue(QObject):
             self.__jobID += 1
             config.data.set(config.ConfigKey.JobID, self.__jobID)
 
+        checkpoints, resumedID = self.__checkpoints.pop(jobRow, (None, None))
         newJob = JobInfo(
             jobRow,
             self.model.dataset[
@@ -340,13 +258,19 @@ class JobQueue(QObject):
             ],
             self.model,
             algorithm=algorithm,
+            checkpoints=checkpoints,
             appDir=self.appDir,
             log=self.log,
         )
+        newJob.resumedID = resumedID
 
-        self._workQueue.append(newJob)
+        with self.__lock:
+            self._workQueue.append(newJob)
         index = self.model.index(jobRow, JobKey.Status)
         self.model.setData(index, JobStatus.Queue)
+        jobEvent(
+            "jobQueued", jobID=newJob.jobRow[JobKey.ID],
+            algorithm=newJob.algorithm, resumed=bool(checkpoints))
         if self._workQueue:
             index = self.model.index(jobRow, JobKey.ID)
             self.addQueueItemSignal.emit(index)
@@ -368,13 +292,13 @@ class JobQueue(QObject):
             JobInfo: next job in queue
         """
 
-        if self._workQueue:
-            element = self._workQueue.popleft()
-            self._checkEmptied()
+        with self.__lock:
+            element = self._workQueue.popleft() if self._workQueue else None
 
-            return element
+        if element is not None:
+            self._checkEmptied()
 
-        return None
+        return element
 
     def popRight(self):
         """
@@ -384,13 +308,13 @@ class JobQueue(QObject):
             JobInfo: last job in queue
         """
 
-        if self._workQueue:
-            element = self._workQueue.pop()
+        with self.__lock:
+            element = self._workQueue.pop() if self._workQueue else None
+
+        if element is not None:
             self._checkEmptied()
 
-            return element
-
-        return None
+        return element
 
     def pop(self):
         """
@@ -400,14 +324,87 @@ class JobQueue(QObject):
             JobInfo: next job in queue
         """
 
-        if self._workQueue:
-            element = self._workQueue.popleft()
+        with self.__lock:
+            element = self._workQueue.popleft() if self._workQueue else None
+
+        if element is not None:
             self._checkEmptied()
 
-            return element
+        return element
+
+    def resume(self, jobRow, checkpoints, resumedID=None):
+        """
+        resume set the commands completed on a previous run for the job that
+        will be added at jobRow
+
+        Args:
+            **jobRow** (int): row of job in table
+
+            **checkpoints** (dict): commands completed by index
+
+            **resumedID** (int, optional): job ID of the previous run its
+            checkpoints are removed when the job starts. Defaults to None.
+        """
+
+        self.__checkpoints[jobRow] = (checkpoints, resumedID)
+
+    def setPriority(self, jobRow, priority):
+        """
+        setPriority change priority of a queued job
+
+        Args:
+            **jobRow** (int): row of job in table
+
+            **priority** (int): new priority higher runs first
+
+        Returns:
+            bool: True if job is in queue
+        """
+
+        return self._workQueue.setPriority(jobRow, priority)
+
+    def priority(self, jobRow):
+        """
+        priority of a queued job
+
+        Args:
+            **jobRow** (int): row of job in table
+
+        Returns:
+            int: priority of job None if not in queue
+        """
+
+        if (job := self._workQueue.find(jobRow)) is not None:
+            return job.priority
 
         return None
 
+    def moveUp(self, jobRow):
+        """
+        moveUp run queued job before the job ahead of it
+
+        Args:
+            **jobRow** (int): row of job in table
+
+        Returns:
+            bool: True if job moved
+        """
+
+        return self._workQueue.moveUp(jobRow)
+
+    def moveDown(self, jobRow):
+        """
+        moveDown run queued job after the job behind it
+
+        Args:
+            **jobRow** (int): row of job in table
+
+        Returns:
+            bool: True if job moved
+        """
+
+        return self._workQueue.moveDown(jobRow)
+
     def _checkEmptied(self):
         """
         _checkEmptied emit queueEmptiedSignal if job queue is empty
@@ -427,6 +424,9 @@ class JobQueue(QObject):
         self.runJobs.output = self.output
         self.runJobs.log = self.log
 
+        # shortest job first setting could have changed
+        self._workQueue.sort()
+
         if JobQueue.__firstRun:
             self.parent.jobsOutput.setAsCurrentTab()
             JobQueue.__firstRun = False
@@ -0,0 +1,361 @@
+"""
+JobWorkQueue ordered queue of jobs waiting to run
+"""
+
+import bisect
+import itertools
+import threading
+
+from typing import Optional
+
+
+# order of the jobs not moved by hand the ones moved have a negative order
+MANUALNONE = 0
+# size of the jobs not read yet they go after the ones with a known size
+UNKNOWNSIZE = float("inf")
+
+
+class JobWorkQueue:
+    """
+    JobWorkQueue keep the jobs waiting to run ordered by priority.
+
+    Jobs with higher **priority** run first. Jobs with the same priority run
+    in the order they were added or, with **shortestJobFirst**, by the total
+    size of their source files so small jobs don't wait behind big ones.
+    Jobs can also be moved up or down the queue, the job moved takes the
+    priority of the job it passes over. A move fixes the order of the jobs
+    with that priority, the jobs added later go after them, and it is kept
+    when the queue is sorted again.
+
+    The size of the source files is read in a thread, reading it generates
+    the commands and reads every source file. Until it is known the job goes
+    after the jobs with a known size. A job is not returned while its size
+    is being read, the next job is returned instead and if it is the only
+    job its size is waited for.
+
+    It keeps the **popleft**, **pop** and **append** methods of the deque it
+    replaces and is safe to use from more than one thread.
+
+    Args:
+        **shortestJobFirst** (bool, function, optional): order jobs with the
+        same priority by size. A function returning the current setting can be
+        used. Defaults to False.
+    """
+
+    def __init__(self, shortestJobFirst=False) -> None:
+
+        self.__lock = threading.RLock()
+        self.__sized = threading.Condition(self.__lock)
+        self.__sizing = None
+        self.__jobs = []
+        self.__keys = []
+        self.__sequence = itertools.count()
+        self.__sizes = {}
+        self.__unsized = []
+        self.__sizer = None
+
+        self.__shortestJobFirst = shortestJobFirst
+
+    def __bool__(self) -> bool:
+        return len(self.__jobs) > 0
+
+    def __len__(self) -> int:
+        return len(self.__jobs)
+
+    def __iter__(self):
+        with self.__lock:
+            return iter(list(self.__jobs))
+
+    @property
+    def shortestJobFirst(self) -> bool:
+        """
+        shortestJobFirst order jobs with the same priority by size read write
+
+        Returns:
+            bool: True if shortest job first policy is active
+        """
+        if callable(self.__shortestJobFirst):
+            return bool(self.__shortestJobFirst())
+
+        return bool(self.__shortestJobFirst)
+
+    @shortestJobFirst.setter
+    def shortestJobFirst(self, value) -> None:
+        self.__shortestJobFirst = value
+        self.sort()
+
+    def append(self, job) -> None:
+        """
+        append insert job in queue according to its priority
+
+        Args:
+            **job** (JobInfo): job to add
+        """
+
+        with self.__lock:
+            job.queueOrder = self._order(job, MANUALNONE)
+            key = self._key(job)
+            index = bisect.bisect_right(self.__keys, key)
+            self.__jobs.insert(index, job)
+            self.__keys.insert(index, key)
+
+    def popleft(self):
+        """
+        popleft remove and return next job to run
+
+        Raises:
+            IndexError: queue is empty
+
+        Returns:
+            JobInfo: next job
+        """
+
+        return self._pop(0)
+
+    def pop(self):
+        """
+        pop remove and return last job in queue
+
+        Raises:
+            IndexError: queue is empty
+
+        Returns:
+            JobInfo: last job
+        """
+
+        return self._pop(-1)
+
+    def clear(self) -> None:
+        """
+        clear remove all jobs
+        """
+
+        with self.__lock:
+            self.__jobs.clear()
+            self.__keys.clear()
+            self.__sizes.clear()
+            self.__unsized.clear()
+            self.__sized.notify_all()
+
+    def find(self, jobRowNumber: int):
+        """
+        find job in queue by its row in the jobs table
+
+        Args:
+            **jobRowNumber** (int): row of job in table
+
+        Returns:
+            JobInfo: job found None otherwise
+        """
+
+        with self.__lock:
+            if (index := self._index(jobRowNumber)) is not None:
+                return self.__jobs[index]
+
+        return None
+
+    def setPriority(self, jobRowNumber: int, priority: int) -> bool:
+        """
+        setPriority change the priority of a job waiting in the queue
+
+        Args:
+            **jobRowNumber** (int): row of job in table
+
+            **priority** (int): new priority higher runs first
+
+        Returns:
+            bool: True if job found
+        """
+
+        with self.__lock:
+            if (index := self._index(jobRowNumber)) is None:
+                return False
+            job = self.__jobs.pop(index)
+            self.__keys.pop(index)
+            job.priority = priority
+            # goes after the jobs ordered by hand like a job added
+            job.queueOrder = self._order(
+                job, MANUALNONE, job.queueOrder[-1])
+            key = self._key(job)
+            index = bisect.bisect_right(self.__keys, key)
+            self.__jobs.insert(index, job)
+            self.__keys.insert(index, key)
+
+        return True
+
+    def moveUp(self, jobRowNumber: int) -> bool:
+        """
+        moveUp move job one place closer to the head of the queue
+
+        Args:
+            **jobRowNumber** (int): row of job in table
+
+        Returns:
+            bool: True if job moved
+        """
+
+        return self._move(jobRowNumber, -1)
+
+    def moveDown(self, jobRowNumber: int) -> bool:
+        """
+        moveDown move job one place closer to the end of the queue
+
+        Args:
+            **jobRowNumber** (int): row of job in table
+
+        Returns:
+            bool: True if job moved
+        """
+
+        return self._move(jobRowNumber, 1)
+
+    def sort(self) -> None:
+        """
+        sort order the queue again after a policy change the order of the
+        jobs moved by hand is kept
+        """
+
+        with self.__lock:
+            for job in self.__jobs:
+                job.queueOrder = self._order(
+                    job, job.queueOrder[0], job.queueOrder[-1])
+            self._sort()
+
+    def waitSizes(self, timeout: Optional[float] = None) -> bool:
+        """
+        waitSizes wait for the size of the jobs queued to be read
+
+        Args:
+            **timeout** (float, optional): seconds to wait. Defaults to None
+            wait until read.
+
+        Returns:
+            bool: True if the sizes are known
+        """
+
+        with self.__sized:
+            return self.__sized.wait_for(
+                lambda: not self.__unsized, timeout=timeout)
+
+    def _pop(self, end: int):
+        """remove job nearest to end 0 head -1 tail skipping the job sized"""
+
+        with self.__lock:
+            while True:
+                if not self.__jobs:
+                    raise IndexError("pop from an empty queue")
+                indexes = range(len(self.__jobs))
+                for index in indexes if end == 0 else reversed(indexes):
+                    if self.__jobs[index] is not self.__sizing:
+                        break
+                else:
+                    # the only job is being read
+                    self.__sized.wait()
+                    continue
+                break
+            self.__keys.pop(index)
+            job = self.__jobs.pop(index)
+            self.__sizes.pop(id(job), None)
+
+        return job
+
+    def _index(self, jobRowNumber: int) -> Optional[int]:
+        """index of job in queue lock must be held"""
+
+        for index, job in enumerate(self.__jobs):
+            if job.jobRowNumber == jobRowNumber:
+                return index
+
+        return None
+
+    def _key(self, job) -> tuple:
+        """sort key of job"""
+
+        return (-job.priority, job.queueOrder)
+
+    def _order(self, job, manual: int, sequence: Optional[int] = None) -> tuple:
+        """order of job between jobs with same priority lock must be held"""
+
+        if sequence is None:
+            sequence = next(self.__sequence)
+        size = self._size(job) if self.shortestJobFirst else 0
+
+        return (manual, size, sequence)
+
+    def _sort(self) -> None:
+        """sort jobs by their key lock must be held"""
+
+        self.__keys = [self._key(job) for job in self.__jobs]
+        order = sorted(range(len(self.__jobs)), key=lambda i: self.__keys[i])
+        self.__jobs = [self.__jobs[i] for i in order]
+        self.__keys = [self.__keys[i] for i in order]
+
+    def _size(self, job) -> float:
+        """size of job read in a thread if not known lock must be held"""
+
+        if (size := self.__sizes.get(id(job))) is not None:
+            return size
+
+        if job not in self.__unsized:
+            self.__unsized.append(job)
+            if self.__sizer is None:
+                self.__sizer = threading.Thread(
+                    target=self._sizeJobs, name="jobsSizer", daemon=True)
+                self.__sizer.start()
+
+        return UNKNOWNSIZE
+
+    def _sizeJobs(self) -> None:
+        """read the size of the jobs queued"""
+
+        while True:
+            with self.__lock:
+                job = None
+                while self.__unsized and (job is None):
+                    job = self.__unsized.pop(0)
+                    if not any(j is job for j in self.__jobs):
+                        job = None
+                if job is None:
+                    self.__sizer = None
+                    self.__sized.notify_all()
+                    return
+                # the job is not returned while it is read
+                self.__sizing = job
+
+            try:
+                size = job.sourceSize
+            finally:
+                with self.__lock:
+                    self.__sizing = None
+                    self.__sized.notify_all()
+
+            with self.__lock:
+                if any(j is job for j in self.__jobs):
+                    self.__sizes[id(job)] = size
+                    self.sort()
+                self.__sized.notify_all()
+
+    def _move(self, jobRowNumber: int, step: int) -> bool:
+        """swap job with its neighbour"""
+
+        with self.__lock:
+            if (index := self._index(jobRowNumber)) is None:
+                return False
+            other = index + step
+            if not 0 <= other < len(self.__jobs):
+                return False
+            job, neighbour = self.__jobs[index], self.__jobs[other]
+            # job takes the place of its neighbour with its priority
+            job.priority = neighbour.priority
+            self.__jobs[index], self.__jobs[other] = neighbour, job
+            # the jobs with the priority keep this order from now on the
+            # ones added later go after them
+            group = [
+                i for i, j in enumerate(self.__jobs)
+                if j.priority == job.priority]
+            for manual, i in enumerate(group, -len(group)):
+                self.__jobs[i].queueOrder = (
+                    manual, *self.__jobs[i].queueOrder[1:])
+            self._sort()
+
+        return True
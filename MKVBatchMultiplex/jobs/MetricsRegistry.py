@@ -0,0 +1,354 @@
+"""
+MetricsRegistry application metrics in Prometheus text format
+"""
+# MTR0001
+
+import logging
+import os
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from .. import config
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+PREFIX = "mkvbatchmultiplex_"
+
+
+class MetricsRegistry:
+    """
+    MetricsRegistry keeps the counters, gauges and summaries of the
+    application. Updating a value is a dictionary operation under a lock.
+    Values that are expensive or belong to other objects are registered as
+    collectors, functions called only when the metrics are rendered.
+
+    A collector returns a number or a list of (labels, value) with labels a
+    dictionary.
+    """
+
+    def __init__(self):
+
+        self.__lock = threading.Lock()
+        self.__help = {}
+        self.__values = {}
+        self.__collectors = {}
+
+    def describe(self, name, metricType, helpText):
+        """
+        describe set type and help of metric
+
+        Args:
+            **name** (str): metric name without prefix
+
+            **metricType** (str): counter, gauge or summary
+
+            **helpText** (str): metric description
+        """
+
+        with self.__lock:
+            self.__help[name] = (metricType, helpText)
+
+    def inc(self, name, value=1, **labels):
+        """
+        inc increment counter
+
+        Args:
+            **name** (str): metric name
+
+            **value** (float, optional): increment. Defaults to 1.
+
+            **labels** (dict): metric labels
+        """
+
+        key = (name, tuple(sorted(labels.items())))
+        with self.__lock:
+            self.__values[key] = self.__values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """
+        set gauge value
+
+        Args:
+            **name** (str): metric name
+
+            **value** (float): value
+
+            **labels** (dict): metric labels
+        """
+
+        key = (name, tuple(sorted(labels.items())))
+        with self.__lock:
+            self.__values[key] = value
+
+    def observe(self, name, value):
+        """
+        observe add a sample to a summary it keeps count and sum
+
+        Args:
+            **name** (str): metric name
+
+            **value** (float): sample
+        """
+
+        with self.__lock:
+            for suffix, increment in [("_count", 1), ("_sum", value)]:
+                key = (name + suffix, ())
+                self.__values[key] = self.__values.get(key, 0) + increment
+
+    def collector(self, name, metricType, helpText, function):
+        """
+        collector register a function that returns the metric value when the
+        metrics are rendered
+
+        Args:
+            **name** (str): metric name
+
+            **metricType** (str): counter or gauge
+
+            **helpText** (str): metric description
+
+            **function** (function): returns a number or a list of
+            (labels, value)
+        """
+
+        with self.__lock:
+            self.__help[name] = (metricType, helpText)
+            self.__collectors[name] = function
+
+    def render(self):
+        """
+        render metrics in Prometheus text format
+
+        Returns:
+            str: metrics
+        """
+
+        with self.__lock:
+            values = dict(self.__values)
+            collectors = dict(self.__collectors)
+            helpTexts = dict(self.__help)
+
+        samples = {}
+        for (name, labels), value in values.items():
+            samples.setdefault(_baseName(name, helpTexts), []).append(
+                (name, dict(labels), value))
+
+        for name, function in collectors.items():
+            try:
+                result = function()
+            except Exception as e:  # pylint: disable=broad-except
+                MODULELOG.error("MTR0001: Collector %s error - %s", name, e)
+                continue
+            if isinstance(result, (list, tuple)):
+                samples[name] = [(name, labels, v) for labels, v in result]
+            elif result is not None:
+                samples[name] = [(name, {}, result)]
+
+        lines = []
+        for baseName in sorted(samples):
+            if baseName in helpTexts:
+                metricType, helpText = helpTexts[baseName]
+                lines.append(f"# HELP {PREFIX}{baseName} {helpText}")
+                lines.append(f"# TYPE {PREFIX}{baseName} {metricType}")
+            for name, labels, value in samples[baseName]:
+                lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """
+    MetricsExporter publish the metrics of a registry for Prometheus. With a
+    **port** a HTTP server listening only in localhost renders the metrics on
+    every request. With a **fileName** the metrics are rendered to the file
+    every **interval** seconds, the file is replaced at once so a reader never
+    sees it incomplete.
+
+    Use **exporter** to get the instance for the shared registry.
+
+    Args:
+        **registry** (MetricsRegistry): metrics to publish
+
+        **port** (int, optional): localhost port 0 no HTTP server. Defaults
+        to 0.
+
+        **fileName** (str, optional): file for the metrics. Defaults to None.
+
+        **interval** (float, optional): seconds between file updates.
+        Defaults to 15.
+    """
+
+    __lock = threading.Lock()
+    __exporter = None
+
+    @classmethod
+    def exporter(cls):
+        """
+        exporter of the shared registry configured with ConfigKey.MetricsPort,
+        ConfigKey.MetricsFile and ConfigKey.MetricsInterval
+
+        Returns:
+            MetricsExporter: shared instance it evaluates to False if the
+            metrics are not published
+        """
+
+        with cls.__lock:
+            if cls.__exporter is None:
+                cls.__exporter = cls(
+                    metrics,
+                    port=config.data.get(config.ConfigKey.MetricsPort),
+                    fileName=config.data.get(config.ConfigKey.MetricsFile),
+                    interval=config.data.get(config.ConfigKey.MetricsInterval),
+                )
+
+        return cls.__exporter
+
+    @classmethod
+    def shutdown(cls):
+        """
+        shutdown stop the shared instance if it was used
+        """
+
+        with cls.__lock:
+            exporter = cls.__exporter
+
+        if exporter is not None:
+            exporter.stop()
+
+    def __init__(self, registry, port=0, fileName=None, interval=15):
+
+        self.__server = None
+        self.__stopEvent = threading.Event()
+        self.__threads = []
+
+        self.registry = registry
+        self.port = port
+        self.fileName = Path(fileName) if fileName else None
+        self.interval = interval
+
+    def __bool__(self):
+        return bool(self.port) or (self.fileName is not None)
+
+    def start(self):
+        """
+        start publishing the metrics
+        """
+
+        if self.port and (self.__server is None):
+            registry = self.registry
+
+            class _Handler(BaseHTTPRequestHandler):
+                """serve the metrics"""
+
+                def do_GET(self):  # pylint: disable=invalid-name
+                    body = registry.render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header(
+                        "Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):  # pylint: disable=arguments-differ
+                    pass
+
+            try:
+                self.__server = ThreadingHTTPServer(
+                    ("127.0.0.1", self.port), _Handler)
+            except OSError as e:
+                MODULELOG.error(
+                    "MTR0002: Metrics port %s error - %s", self.port, e)
+            else:
+                self.__server.daemon_threads = True
+                self._startThread(self.__server.serve_forever, "metricsServer")
+
+        if self.fileName is not None:
+            self.__stopEvent.clear()
+            self._startThread(self._fileWriter, "metricsFile")
+
+    def stop(self):
+        """
+        stop publishing the metrics
+        """
+
+        self.__stopEvent.set()
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+
+    def _startThread(self, target, name):
+
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self.__threads.append(thread)
+
+    def _fileWriter(self):
+        """write metrics to file at interval"""
+
+        while True:
+            tmpFile = self.fileName.with_name(self.fileName.name + ".tmp")
+            try:
+                self.fileName.parent.mkdir(parents=True, exist_ok=True)
+                tmpFile.write_text(self.registry.render(), encoding="utf-8")
+                os.replace(tmpFile, self.fileName)
+            except OSError as e:
+                MODULELOG.error(
+                    "MTR0003: Metrics file %s error - %s", self.fileName, e)
+            if self.__stopEvent.wait(self.interval):
+                break
+
+
+def _baseName(name, helpTexts):
+    """summary samples use the help of the summary"""
+
+    for suffix in ["_count", "_sum"]:
+        if name.endswith(suffix) and (name[:-len(suffix)] in helpTexts):
+            return name[:-len(suffix)]
+
+    return name
+
+
+def _labels(labels):
+    """labels in Prometheus format"""
+
+    if not labels:
+        return ""
+
+    text = ",".join(
+        f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+
+    return "{" + text + "}"
+
+
+def _escape(value):
+    """escape label value"""
+
+    return (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+# registry shared by the application
+metrics = MetricsRegistry()  # pylint: disable=invalid-name
+
+metrics.describe(
+    "bytes_processed_total", "counter",
+    "Bytes read and written by the commands ended.")
+metrics.describe(
+    "commands_total", "counter", "Commands ended.")
+metrics.describe(
+    "errors_total", "counter",
+    "Commands that failed, timed out or could not be adjusted.")
+metrics.describe(
+    "db_write_seconds", "summary", "Time to save a job in the history.")
+metrics.describe(
+    "gui_event_loop_lag_seconds", "gauge",
+    "Delay of the last interface timer event.")
@@ -0,0 +1,405 @@
+"""
+ProcessSupervisor run the commands of all the jobs in one asyncio event loop
+"""
+# PSV0001
+
+import asyncio
+import logging
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .MetricsRegistry import metrics
+
+# os.wait4 gives the resources used by a command
+_WAIT4 = hasattr(os, "wait4")
+# os.waitid waits for a command without reaping it
+_WAITID = hasattr(os, "waitid") and hasattr(os, "WNOWAIT")
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class CommandResult:
+    """
+    CommandResult result of a command executed by the ProcessSupervisor
+
+    The resources are None if the system does not report them.
+
+    Args:
+        **rc** (int): return code
+
+        **status** (str, optional): "aborted" or "timeout" if the command was
+        stopped. Defaults to None.
+
+        **seconds** (float, optional): wall time. Defaults to None.
+
+        **cpuTime** (float, optional): user and system CPU seconds. Defaults
+        to None.
+
+        **maxRSS** (int, optional): maximum resident set size in bytes.
+        Defaults to None.
+    """
+
+    def __init__(self, rc, status=None, seconds=None, cpuTime=None, maxRSS=None):
+
+        self.rc = rc
+        self.status = status
+        self.seconds = seconds
+        self.cpuTime = cpuTime
+        self.maxRSS = maxRSS
+
+    @property
+    def aborted(self):
+        """command was stopped by an abort request"""
+        return self.status == "aborted"
+
+    @property
+    def timedOut(self):
+        """command was stopped because it ran longer than the timeout"""
+        return self.status == "timeout"
+
+
+class ProcessSupervisor:
+    """
+    ProcessSupervisor start the commands with asyncio.create_subprocess_exec
+    in an event loop running on its own thread. The loop reads stdout and
+    stderr of every command, checks for abort requests and enforces the
+    timeouts. The threads submitting commands wait for the result and
+    process the output read, the loop only queues it so a slow output
+    callback doesn't stop the reading of the other commands.
+
+    An abort request is checked every **pollInterval** seconds. A command
+    aborted or past its timeout is terminated and if it is still running
+    after **killDelay** seconds it is killed.
+
+    Where os.wait4 is available the commands are reaped with it to get the
+    CPU time and maximum memory used by every command.
+
+    Use **supervisor** to get the instance shared by the application.
+
+    Args:
+        **pollInterval** (float, optional): seconds between checks for abort
+        requests and timeouts. Defaults to 0.25.
+
+        **killDelay** (float, optional): seconds to wait for a terminated
+        command to end. Defaults to 5.
+
+        **log** (bool, optional): log operations. Defaults to False.
+    """
+
+    __lock = threading.Lock()
+    __supervisor = None
+
+    chunkSize = 65536
+
+    @classmethod
+    def supervisor(cls):
+        """
+        supervisor shared by all the jobs workers
+
+        Returns:
+            ProcessSupervisor: shared instance
+        """
+
+        with cls.__lock:
+            if cls.__supervisor is None:
+                cls.__supervisor = cls()
+
+        return cls.__supervisor
+
+    def __init__(self, pollInterval=0.25, killDelay=5, log=False):
+
+        self.__lock = threading.Lock()
+        self.__loop = None
+        self.__thread = None
+        self.__running = 0
+        self.__waitExecutor = None
+
+        self.pollInterval = pollInterval
+        self.killDelay = killDelay
+        self.log = log
+
+    @property
+    def running(self):
+        """
+        running number of commands running read only
+
+        Returns:
+            int: commands running
+        """
+        return self.__running
+
+    def execute(self, cmd, onOutput=None, abort=None, timeout=None):
+        """
+        execute run command in the event loop and wait for it to end
+
+        Args:
+            **cmd** (list): command and arguments
+
+            **onOutput** (function, optional): called in the calling thread
+            with every block of output read and the stream 1 stdout and 2
+            stderr. Defaults to None.
+
+            **abort** (function, optional): returns True if the command has to
+            be stopped. Defaults to None.
+
+            **timeout** (float, optional): seconds the command can run. None
+            or 0 no limit. Defaults to None.
+
+        Raises:
+            OSError: command could not be started
+
+            KeyboardInterrupt: received while waiting, it is raised after the
+            command is stopped
+
+        Returns:
+            CommandResult: result of command
+        """
+
+        # the loop queues the output and None when the command ends
+        chunks = queue.SimpleQueue()
+        interrupted = threading.Event()
+        future = asyncio.run_coroutine_threadsafe(
+            self._execute(
+                cmd, None if onOutput is None else chunks.put,
+                lambda: interrupted.is_set() or (
+                    (abort is not None) and abort()),
+                timeout),
+            self._eventLoop())
+        future.add_done_callback(lambda _: chunks.put(None))
+
+        try:
+            while (item := chunks.get()) is not None:
+                if onOutput is not None:
+                    try:
+                        onOutput(*item)
+                    except Exception as e:  # pylint: disable=broad-except
+                        # keep reading so the command don't block on a full
+                        # pipe
+                        onOutput = None
+                        MODULELOG.error(
+                            "PSV0002: Output processing error %s", e)
+            return future.result()
+        except BaseException:
+            # KeyboardInterrupt on the waiting thread stop the command and
+            # wait for it to end so the caller can remove its output
+            interrupted.set()
+            try:
+                future.result()
+            except Exception:  # pylint: disable=broad-except
+                pass
+            raise
+
+    def _eventLoop(self):
+        """start event loop thread on first use"""
+
+        with self.__lock:
+            if self.__thread is None:
+                self.__loop = asyncio.new_event_loop()
+                self.__thread = threading.Thread(
+                    target=self.__loop.run_forever,
+                    name="processSupervisor",
+                    daemon=True,
+                )
+                self.__thread.start()
+
+        return self.__loop
+
+    async def _execute(self, cmd, onOutput, abort, timeout):
+        """run command and supervise it"""
+
+        loop = asyncio.get_running_loop()
+        startTime = loop.time()
+        if _WAIT4:
+            process = await self._startProcess(loop, cmd)
+        else:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        self.__running += 1
+        readers = [
+            asyncio.ensure_future(self._read(process.stdout, 1, onOutput)),
+            asyncio.ensure_future(self._read(process.stderr, 2, onOutput)),
+        ]
+        waitProcess = asyncio.ensure_future(process.wait())
+        stopTime = None
+        status = None
+
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    {waitProcess}, timeout=self.pollInterval)
+                if done:
+                    break
+                if status is None:
+                    if (abort is not None) and abort():
+                        status = "aborted"
+                    elif timeout and (loop.time() - startTime > timeout):
+                        status = "timeout"
+                    if status is not None:
+                        self._stop(process)
+                        stopTime = loop.time()
+                        if self.log:
+                            MODULELOG.debug(
+                                "PSV0001: Command %s %s", status, cmd)
+                elif loop.time() - stopTime > self.killDelay:
+                    self._stop(process, kill=True)
+                    stopTime = loop.time()
+            await asyncio.gather(*readers)
+        except asyncio.CancelledError:
+            self._stop(process, kill=True)
+            for reader in readers:
+                reader.cancel()
+            await asyncio.gather(waitProcess, return_exceptions=True)
+            raise
+        finally:
+            self.__running -= 1
+
+        rusage = getattr(process, "rusage", None)
+
+        return CommandResult(
+            process.returncode,
+            status,
+            seconds=loop.time() - startTime,
+            cpuTime=(
+                None if rusage is None
+                else rusage.ru_utime + rusage.ru_stime),
+            maxRSS=None if rusage is None else _maxRSS(rusage),
+        )
+
+    async def _startProcess(self, loop, cmd):
+        """start process reaped with os.wait4"""
+
+        if self.__waitExecutor is None:
+            self.__waitExecutor = ThreadPoolExecutor(
+                thread_name_prefix="processWait")
+
+        popen = subprocess.Popen(  # pylint: disable=consider-using-with
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        process = _Wait4Process(popen, self.__waitExecutor)
+        try:
+            process.stdout = await _pipeReader(loop, popen.stdout)
+            process.stderr = await _pipeReader(loop, popen.stderr)
+        except BaseException:
+            process.kill()
+            await process.wait()
+            raise
+
+        return process
+
+    @staticmethod
+    def _stop(process, kill=False):
+        """terminate or kill process if still running"""
+
+        try:
+            if kill:
+                process.kill()
+            else:
+                process.terminate()
+        except ProcessLookupError:
+            pass
+
+    async def _read(self, stream, streamID, putOutput):
+        """read command output in blocks and queue them"""
+
+        while chunk := await stream.read(self.chunkSize):
+            if putOutput is not None:
+                putOutput((chunk, streamID))
+
+
+class _Wait4Process:
+    """
+    process started with subprocess.Popen and reaped with os.wait4 same
+    interface as asyncio.subprocess.Process used by the supervisor
+    """
+
+    def __init__(self, popen, waitExecutor):
+
+        self.__popen = popen
+        self.__waitExecutor = waitExecutor
+        self.__waiter = None
+        self.__lock = threading.Lock()
+        self.__reaped = False
+
+        self.pid = popen.pid
+        self.returncode = None
+        self.rusage = None
+        self.stdout = None
+        self.stderr = None
+
+    async def wait(self):
+        """wait for process to end"""
+
+        if self.__waiter is None:
+            loop = asyncio.get_running_loop()
+            self.__waiter = loop.run_in_executor(
+                self.__waitExecutor, self._wait4)
+        _, status, self.rusage = await asyncio.shield(self.__waiter)
+        self.returncode = os.waitstatus_to_exitcode(status)
+        # Popen must not try to reap the process again
+        self.__popen.returncode = self.returncode
+
+        return self.returncode
+
+    def _wait4(self):
+        """
+        wait for the process to end and reap it. With waitid the process is
+        reaped holding the lock so a signal is never sent to a pid that could
+        have been reused.
+        """
+
+        if _WAITID:
+            os.waitid(os.P_PID, self.pid, os.WEXITED | os.WNOWAIT)
+
+        with self.__lock:
+            result = os.wait4(self.pid, 0)
+            self.__reaped = True
+
+        return result
+
+    def terminate(self):
+        """send SIGTERM"""
+        self._signal(signal.SIGTERM)
+
+    def kill(self):
+        """send SIGKILL"""
+        self._signal(signal.SIGKILL)
+
+    def _signal(self, sig):
+        # os.kill directly Popen.send_signal polls and could reap the process
+        with self.__lock:
+            if not self.__reaped:
+                os.kill(self.pid, sig)
+
+
+async def _pipeReader(loop, pipe):
+    """asyncio.StreamReader for a pipe"""
+
+    reader = asyncio.StreamReader(limit=ProcessSupervisor.chunkSize)
+    protocol = asyncio.StreamReaderProtocol(reader)
+    await loop.connect_read_pipe(lambda: protocol, pipe)
+
+    return reader
+
+
+def _maxRSS(rusage):
+    """ru_maxrss in bytes it is in kilobytes except on macOS"""
+
+    if sys.platform == "darwin":
+        return rusage.ru_maxrss
+
+    return rusage.ru_maxrss * 1024
+
+
+metrics.collector(
+    "running_commands", "gauge", "Commands running.",
+    lambda: ProcessSupervisor.supervisor().running)
@@ -4,6 +4,7 @@ Class to process jobs queue
 # 11
 
 import logging
+import threading
 
 from PySide6.QtCore import QObject, Signal
 
@@ -14,8 +15,9 @@ from vsutillib.pyside6 import SvgColor
 from .. import config
 from ..models import TableProxyModel
 
-#from .jobsWorker import jobsWorker
-from .jobsWorker import jobsWorker
+from .ControlQueue import ControlQueue
+from .jobsWorker import jobsWorker, JobsWorkerState
+from .SignalCoalescer import SignalCoalescer
 
 MODULELOG = logging.getLogger(__name__)
 MODULELOG.addHandler(logging.NullHandler())
@@ -24,7 +26,12 @@ MODULELOG.addHandler(logging.NullHandler())
 class RunJobs(QObject):
     """
     RunJobs - class instantiated and called by JobQueue.run() it will start the
-    Jobs Worker in a new thread to proccess the Jobs queue.
+    Jobs Workers in new threads to proccess the Jobs queue. The number of
+    workers running jobs at the same time is set by ConfigKey.JobsWorkers.
+
+    The output and progress signals of the workers go through a
+    SignalCoalescer that updates the interface ConfigKey.OutputRefreshRate
+    times per second.
 
     Args:
         **parent** (QWidget): parent widget
@@ -38,9 +45,9 @@ class RunJobs(QObject):
         **proxyModel** (TableProxyModel, optional): Proxy model for model/view.
         Defaults to None.
 
-        **controlQueue** (deque, optional): Queue to control Jobs execution.
-        Some status conditions are routed through here to Stop, Skip or Abort Jobs.
-        Defaults to None.
+        **controlQueue** (ControlQueue, optional): Queue to control Jobs
+        execution. Some status conditions are routed through here to Stop, Skip
+        or Abort Jobs. Defaults to None.
 
         **log** (bool, optional): Logging can be cotrolled using this parameter.
         Defaults to None.
@@ -90,6 +97,7 @@ class RunJobs(QObject):
         super(RunJobs, self).__init__()
 
         self.__jobsQueue = None
+        self.__lock = threading.Lock()
         self.__logging = False
         self.__output = None
         self.__process = None
@@ -101,9 +109,11 @@ class RunJobs(QObject):
         self.jobsqueue = jobsQueue
         self.progress = progressFunc
         self.proxyModel = proxyModel
-        self.controlQueue = controlQueue
+        self.controlQueue = ControlQueue() if controlQueue is None else controlQueue
         self.mainWindow = self.parent.parent
-        self.worker = None
+        self.workers = []
+        self.workerState = None
+        self.coalescer = None
         self.log = log
 
     @property
@@ -137,6 +147,17 @@ class RunJobs(QObject):
         """
         return isThreadRunning(config.WORKERTHREADNAME)
 
+    @property
+    def runningWorkers(self):
+        """
+        runningWorkers number of workers in the pool still running read only
+
+        Returns:
+            int: workers running
+        """
+        with self.__lock:
+            return len(self.workers)
+
     @property
     def jobsqueue(self):
         """
@@ -226,21 +247,47 @@ class RunJobs(QObject):
         """
 
         if self.jobsqueue and not self.running:
-            self.worker = ThreadWorker(
-                jobsWorker,
-                self.jobsqueue,
+            totalWorkers = min(
+                max(config.data.get(config.ConfigKey.JobsWorkers) or 1, 1),
+                len(self.jobsqueue),
+            )
+            self.workerState = JobsWorkerState(
+                len(self.jobsqueue), self.progress.lbl[4], workers=totalWorkers
+            )
+            self.controlQueue.clear()
+            self.coalescer = SignalCoalescer(
                 self.output,
-                self.proxyModel,
                 self.progress,
-                self.controlQueue,
-                self.parent.parent.trayIconMessageSignal,
+                rate=config.data.get(config.ConfigKey.OutputRefreshRate),
                 log=self.log,
-                funcStart=self.start,
-                funcResult=self.result,
-                funcFinished=self.finished,
             )
-            self.worker.name = config.WORKERTHREADNAME
-            self.worker.start()
+            self.coalescer.start()
+
+            with self.__lock:
+                for workerID in range(totalWorkers):
+                    worker = ThreadWorker(
+                        jobsWorker,
+                        self.jobsqueue,
+                        self.coalescer.output,
+                        self.proxyModel,
+                        self.coalescer.progress,
+                        self.controlQueue.register(workerID),
+                        self.parent.parent.trayIconMessageSignal,
+                        workerID=workerID,
+                        workerState=self.workerState,
+                        log=self.log,
+                        funcStart=self.start if workerID == 0 else None,
+                        funcResult=self.result,
+                        funcFinished=lambda w=workerID: self.workerFinished(w),
+                    )
+                    # all workers share the name isThreadRunning is True
+                    # while any worker in the pool is running
+                    worker.name = config.WORKERTHREADNAME
+                    self.workers.append(workerID)
+                    worker.start()
+
+            if self.log:
+                MODULELOG.debug("RJB0013: Jobs workers started %s.", totalWorkers)
 
             return True
 
@@ -270,11 +317,34 @@ class RunJobs(QObject):
         if self.log:
             MODULELOG.debug("RJB0003: Jobs started.")
 
+    def workerFinished(self, workerID):
+        """
+        workerFinished a worker in the pool ended. The run is finished when the
+        last worker ends.
+
+        Args:
+            workerID (int): worker identification
+        """
+
+        self.controlQueue.unregister(workerID)
+
+        with self.__lock:
+            if workerID in self.workers:
+                self.workers.remove(workerID)
+            lastWorker = not self.workers
+
+        if lastWorker:
+            self.finished()
+
     def finished(self):
         """
         finished generate signal for finished run
         """
 
+        if self.coalescer is not None:
+            # send pending output before the run ends
+            self.coalescer.stop()
+
         self.finishedSignal.emit()
 
         if self.log:
@@ -0,0 +1,246 @@
+"""
+SignalCoalescer limit the rate of the output and progress signals sent by the
+jobs workers
+"""
+# SGC0001
+
+import logging
+import threading
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class SignalCoalescer:
+    """
+    SignalCoalescer sits between the jobs workers and the OutputWindows and
+    Progress signals. The workers emit as before and the signals are sent to
+    the interface at most **rate** times per second.
+
+    Text for the same output window with the same arguments is joined, for
+    lines that replace the last line only the latest is kept. For the
+    progress bars and labels only the latest value is kept. Pending signals
+    are also sent when **flush** is called at command and job boundaries.
+
+    The number of signals received, sent and the flushes are kept in
+    **statistics**.
+
+    Args:
+        **output** (OutputWindows): output signals
+
+        **progress** (Progress): progress signals
+
+        **rate** (int, optional): flushes per second 0 send signals
+        immediately. Defaults to 15.
+
+        **log** (bool, optional): log statistics. Defaults to False.
+    """
+
+    def __init__(self, output, progress, rate=15, log=False):
+
+        self.__lock = threading.Lock()
+        self.__text = []
+        self.__values = {}
+        self.__stopEvent = threading.Event()
+        self.__thread = None
+
+        self.rate = rate
+        self.log = log
+        self.statistics = {"received": 0, "emitted": 0, "flushes": 0}
+        self.output = _CoalescedOutput(self, output)
+        self.progress = _CoalescedProgress(self, progress)
+
+    @property
+    def running(self):
+        """
+        running flush thread is running read only
+
+        Returns:
+            bool: True if running
+        """
+        return (self.__thread is not None) and self.__thread.is_alive()
+
+    def start(self):
+        """
+        start the thread that flushes the signals
+        """
+
+        self.statistics = {"received": 0, "emitted": 0, "flushes": 0}
+        if self.rate and not self.running:
+            self.__stopEvent.clear()
+            self.__thread = threading.Thread(
+                target=self._flushLoop, name="signalCoalescer", daemon=True)
+            self.__thread.start()
+
+    def stop(self):
+        """
+        stop the flush thread and send pending signals
+        """
+
+        if self.running:
+            self.__stopEvent.set()
+            self.__thread.join()
+        self.__thread = None
+        self.flush()
+
+        if self.log:
+            MODULELOG.debug(
+                "SGC0001: Signals received %s emitted %s flushes %s.",
+                self.statistics["received"],
+                self.statistics["emitted"],
+                self.statistics["flushes"])
+
+    def flush(self):
+        """
+        flush send pending signals
+        """
+
+        with self.__lock:
+            text, self.__text = self.__text, []
+            values, self.__values = self.__values, {}
+            if text or values:
+                self.statistics["flushes"] += 1
+                self.statistics["emitted"] += len(text) + len(values)
+
+        for signal, msg, msgArgs in text:
+            signal.emit(msg, msgArgs)
+        for signal, args in values.values():
+            signal.emit(*args)
+
+    def addText(self, signal, msg, msgArgs):
+        """
+        addText queue text for an output window
+
+        Args:
+            **signal** (Signal): output window signal
+
+            **msg** (str): text
+
+            **msgArgs** (dict): text arguments
+        """
+
+        if not self.running:
+            self._emit(signal, msg, msgArgs)
+            return
+
+        with self.__lock:
+            self.statistics["received"] += 1
+            if self.__text:
+                last = self.__text[-1]
+                if (last[0] is signal) and (last[2] == msgArgs):
+                    if msgArgs.get("replaceLine", False):
+                        last[1] = msg
+                        return
+                    if not msgArgs.get("appendLine", False):
+                        last[1] += msg
+                        return
+            self.__text.append([signal, msg, dict(msgArgs)])
+
+    def setValue(self, key, signal, *args):
+        """
+        setValue keep latest value for a progress bar or label. The values
+        are sent in the order of their last change so a value is sent after
+        the maximum set before it.
+
+        Args:
+            **key** (tuple): identify the value
+
+            **signal** (Signal): progress signal
+
+            **args** (list): signal arguments
+        """
+
+        if not self.running:
+            self._emit(signal, *args)
+            return
+
+        with self.__lock:
+            self.statistics["received"] += 1
+            # the newest value goes last
+            self.__values.pop(key, None)
+            self.__values[key] = (signal, args)
+
+    def _emit(self, signal, *args):
+        """emit signal immediately"""
+
+        with self.__lock:
+            self.statistics["received"] += 1
+            self.statistics["emitted"] += 1
+        signal.emit(*args)
+
+    def _flushLoop(self):
+        """flush signals at rate"""
+
+        interval = 1 / self.rate
+        while not self.__stopEvent.wait(interval):
+            self.flush()
+
+
+class _CoalescedOutput:
+    """OutputWindows signals through the coalescer"""
+
+    def __init__(self, coalescer, output):
+
+        self.coalescer = coalescer
+        self.command = _TextSignal(coalescer, output.command)
+        self.job = _TextSignal(coalescer, output.job)
+        self.error = _TextSignal(coalescer, output.error)
+
+    def flush(self):
+        """send pending signals"""
+        self.coalescer.flush()
+
+
+class _CoalescedProgress:
+    """Progress signals through the coalescer"""
+
+    def __init__(self, coalescer, progress):
+
+        self.coalescer = coalescer
+        self.lbl = progress.lbl
+        self.pbReset = _ImmediateSignal(coalescer, progress.pbReset)
+        self.pbSetMaximum = _ValueSignal(coalescer, progress.pbSetMaximum)
+        self.pbSetValues = _ValueSignal(coalescer, progress.pbSetValues)
+        self.lblSetValue = _ValueSignal(
+            coalescer, progress.lblSetValue, keyed=True)
+
+    def flush(self):
+        """send pending signals"""
+        self.coalescer.flush()
+
+
+class _TextSignal:
+    """text signal"""
+
+    def __init__(self, coalescer, signal):
+        self.coalescer = coalescer
+        self.signal = signal
+
+    def emit(self, msg, msgArgs):
+        self.coalescer.addText(self.signal, msg, msgArgs)
+
+
+class _ValueSignal:
+    """signal that only needs the latest value keyed by first argument"""
+
+    def __init__(self, coalescer, signal, keyed=False):
+        self.coalescer = coalescer
+        self.signal = signal
+        self.keyed = keyed
+
+    def emit(self, *args):
+        key = (id(self.signal), args[0] if self.keyed else None)
+        self.coalescer.setValue(key, self.signal, *args)
+
+
+class _ImmediateSignal:
+    """signal sent after the pending signals"""
+
+    def __init__(self, coalescer, signal):
+        self.coalescer = coalescer
+        self.signal = signal
+
+    def emit(self, *args):
+        self.coalescer.flush()
+        self.coalescer._emit(self.signal, *args)  # pylint: disable=protected-access
@@ -1,19 +1,137 @@
 """
  Jobs database
 """
+# SJT0001
+
+import logging
+import re
+import threading
+
 from sqlite3 import Error as SQLiteError
+from time import time
 
 from vsutillib.sql import SqlDb
 
 from .. import config
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+# set on every connection WAL lets the interface read while a worker writes
+# and with it synchronous NORMAL is safe and does not sync on every commit
+PRAGMAS = [
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA cache_size = -8000;",
+    "PRAGMA temp_store = MEMORY;",
+]
+
+# lookups by job id and the history listed by date don't scan the table
+SQLINDEXES = """
+    CREATE INDEX IF NOT EXISTS jobsID ON jobs(id);
+    CREATE INDEX IF NOT EXISTS jobsStartTime ON jobs(startTime);
+    CREATE INDEX IF NOT EXISTS jobsAddDate ON jobs(addDate);
+    """
+
+# job information in columns and tables so the history is read without
+# unpickling the job that is saved only if it is archived
+SQLSTRUCTURED = """
+    CREATE TABLE IF NOT EXISTS jobsCommands (
+        jobRowid INTEGER NOT NULL,
+        commandIndex INTEGER NOT NULL,
+        command TEXT,
+        destinationFile TEXT,
+        rc INTEGER,
+        status TEXT,
+        endTime REAL,
+        UNIQUE(jobRowid, commandIndex)
+    );
+
+    CREATE TABLE IF NOT EXISTS jobsOutput (
+        jobRowid INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        lineIndex INTEGER NOT NULL,
+        text TEXT,
+        args TEXT,
+        UNIQUE(jobRowid, kind, lineIndex)
+    );
+
+    CREATE INDEX IF NOT EXISTS jobsStatus ON jobs(status);
+    """
+
+# status changes of the jobs saved appended as they happen
+SQLSTATUSCHANGES = """
+    CREATE TABLE IF NOT EXISTS jobsStatusChanges (
+        jobRowid INTEGER NOT NULL,
+        status TEXT,
+        changeTime REAL
+    );
+
+    CREATE INDEX IF NOT EXISTS jobsStatusChangesRowid
+        ON jobsStatusChanges(jobRowid);
+    """
+
+# columns of the history listing
+HISTORYFIELDS = (
+    "rowid", "id", "addDate", "startTime", "endTime", "status", "algorithm",
+    "totalCommands", "command", "projectName", "projectInfo",
+)
+
+
 class SqlJobsTable(SqlDb):
     """
     SqlJobsDB class to access sqlite database for saving jobs
 
+    Use **shared** to get the connection of the calling thread that is kept
+    open instead of connecting, creating the tables and closing for every
+    operation.
+
     Args:
         **dbFile** (str, pathlib.Path): database file.
     """
 
+    __local = threading.local()
+
+    @classmethod
+    def shared(cls, dbFile=None):
+        """
+        shared database of the calling thread. sqlite3 connections can only be
+        used by the thread that opened them so there is one for every thread
+        and database file. It is opened the first time is requested.
+
+        Args:
+            **dbFile** (str, pathlib.Path, optional): database file. Defaults
+            to ConfigKey.SystemDB.
+
+        Returns:
+            SqlJobsTable: database of the calling thread
+        """
+
+        if dbFile is None:
+            dbFile = config.data.get(config.ConfigKey.SystemDB)
+
+        if (databases := getattr(cls.__local, "databases", None)) is None:
+            databases = cls.__local.databases = {}
+
+        database = databases.get(str(dbFile))
+        if (database is None) or (database.connection is None):
+            database = databases[str(dbFile)] = cls(dbFile)
+
+        return database
+
+    @classmethod
+    def shutdown(cls):
+        """
+        shutdown close the shared databases of the calling thread. The ones
+        of other threads are closed when the threads end.
+        """
+
+        databases = getattr(cls.__local, "databases", {})
+        for database in databases.values():
+            database.close()
+        databases.clear()
+
     def __init__(self, dbFile=None):
 
         # initialize local properties
@@ -27,12 +145,21 @@ class SqlJobsTable(SqlDb):
         if self.connection is not None:
             self._createJobsTable()
 
+    def _setPragmas(self):
+        # tune the connection before the first use
+        if self.connection is not None:
+            try:
+                for sqlPragma in PRAGMAS:
+                    self.connection.execute(sqlPragma)
+            except SQLiteError as e:
+                self.__lastError = "SQLiteError: {}".format(e)
+
     def _createJobsTable(self):
         # Create jobs table
         dbVersion = config.data.get(config.ConfigKey.DbVersion)
 
         if self.connection is not None:
-            # version 2.1.0
+            # version 2.4.0
 
             sqlCreateTableScript = """
                 -- start a transaction
@@ -50,7 +177,10 @@ class SqlJobsTable(SqlDb):
                     projectName TEXT,
                     projectInfo TEXT,
                     saved INTEGER,
-                    deleteMark INTEGER
+                    deleteMark INTEGER,
+                    status TEXT,
+                    algorithm INTEGER,
+                    totalCommands INTEGER
                 );
 
                 CREATE TABLE IF NOT EXISTS dbInfo (
@@ -60,20 +190,88 @@ class SqlJobsTable(SqlDb):
 
                 CREATE VIRTUAL TABLE IF NOT EXISTS jobsSearch
                     USING fts5(rowidKey, id, startTime, command);
-                """
 
-            sqlDropTablesScript = """
-                -- start a transaction
-                BEGIN TRANSACTION;
+                -- jobs running and the commands they completed
+                CREATE TABLE IF NOT EXISTS jobsResume (
+                    id INTEGER NOT NULL UNIQUE,
+                    command TEXT,
+                    algorithm INTEGER,
+                    totalCommands INTEGER,
+                    startTime REAL
+                );
 
-                -- drop the table
-                DROP TABLE jobs;
+                CREATE TABLE IF NOT EXISTS jobsCheckpoints (
+                    id INTEGER NOT NULL,
+                    commandIndex INTEGER NOT NULL,
+                    destinationFile TEXT,
+                    size INTEGER,
+                    endTime REAL,
+                    UNIQUE(id, commandIndex)
+                );
+
+                -- outputs of commands ended successfully
+                CREATE TABLE IF NOT EXISTS outputsManifest (
+                    destinationFile TEXT NOT NULL UNIQUE,
+                    size INTEGER,
+                    mtime REAL,
+                    tracks TEXT,
+                    command TEXT
+                );
 
-                DROP TABLE jobsSearch;
+                -- resources used by the commands and jobs executed
+                CREATE TABLE IF NOT EXISTS commandsMetrics (
+                    id INTEGER NOT NULL,
+                    commandIndex INTEGER NOT NULL,
+                    destinationFile TEXT,
+                    rc INTEGER,
+                    endTime REAL,
+                    wallTime REAL,
+                    cpuTime REAL,
+                    maxRSS INTEGER,
+                    bytesRead INTEGER,
+                    bytesWritten INTEGER
+                );
+
+                CREATE TABLE IF NOT EXISTS jobsMetrics (
+                    id INTEGER NOT NULL,
+                    startTime REAL,
+                    endTime REAL,
+                    commands INTEGER,
+                    wallTime REAL,
+                    cpuTime REAL,
+                    maxRSS INTEGER,
+                    bytesRead INTEGER,
+                    bytesWritten INTEGER
+                );
+
+                CREATE INDEX IF NOT EXISTS commandsMetricsID
+                    ON commandsMetrics(id);
+                CREATE INDEX IF NOT EXISTS jobsMetricsID ON jobsMetrics(id);
+                """ + SQLINDEXES + SQLSTRUCTURED + SQLSTATUSCHANGES + """
+                COMMIT;
                 """
 
             self.__lastError = None
 
+            # the tables of an older version are migrated before the create
+            # script adds what is missing
+            version = self.version("jobs")
+            if (version is not None) and (version != dbVersion):
+                migrated = updateTables(self, version, dbVersion)
+                if migrated is False:
+                    # the table is left in the last version migrated the
+                    # migration continues from there on next start
+                    self.__lastError = (
+                        f"Jobs table migration from version {version} error")
+                    return
+                if migrated is None:
+                    self._backupJobsTable(version)
+                self.setVersion("jobs", dbVersion)
+                self.setVersion("jobsSearch", dbVersion)
+                self.commit()
+
+            self.__lastError = None
+
             try:
                 self.connection.executescript(sqlCreateTableScript)
                 self.commit()
@@ -82,22 +280,50 @@ class SqlJobsTable(SqlDb):
                 self.rollback()
 
             if self.__lastError is None:
-                version = self.version("jobs")
-                if version is None:
+                if self.version("jobs") is None:
                     self.setVersion("jobs", dbVersion)
-                elif version != dbVersion:
-                    self.connection.executescript(sqlDropTablesScript)
-                    self.commit()
-                    self.connection.executescript(sqlCreateTableScript)
-                    self.commit()
-
-                    self.setVersion("jobs", dbVersion)
-                    self.setVersion("jobsSearch", dbVersion)
 
                 version = self.version("jobsSearch")
                 if version is None:
                     self.setVersion("jobsSearch", "2.1.0")
 
+                for dbTable in [
+                        "jobsResume", "jobsCheckpoints", "outputsManifest",
+                        "commandsMetrics", "jobsMetrics", "jobsCommands",
+                        "jobsOutput", "jobsStatusChanges"]:
+                    if self.version(dbTable) is None:
+                        self.setVersion(dbTable, dbVersion)
+                self.commit()
+
+    def _backupJobsTable(self, version):
+        """
+        keep the jobs of a version with no migration path in a table renamed
+        with the version so the jobs table can be created
+        """
+
+        backupTable = "jobs_" + re.sub(r"\W", "_", f"{version}_{int(time())}")
+        sqlBackupScript = f"""
+            BEGIN TRANSACTION;
+
+            DROP INDEX IF EXISTS jobsID;
+            DROP INDEX IF EXISTS jobsStartTime;
+            DROP INDEX IF EXISTS jobsAddDate;
+            ALTER TABLE jobs RENAME TO {backupTable};
+            DROP TABLE IF EXISTS jobsSearch;
+
+            COMMIT;
+            """
+
+        try:
+            self.connection.executescript(sqlBackupScript)
+        except SQLiteError as e:
+            self.rollback()
+            MODULELOG.error("SJT0002: Jobs table backup error - %s", e)
+        else:
+            MODULELOG.warning(
+                "SJT0003: Jobs table version %s saved as %s",
+                version, backupTable)
+
     @property
     def error(self):
         """
@@ -183,6 +409,7 @@ class SqlJobsTable(SqlDb):
 
         rc = super().connect(database, autoCommit)
 
+        self._setPragmas()
         self._initHelper()
 
         return rc
@@ -202,6 +429,14 @@ class SqlJobsTable(SqlDb):
 
         cursor = None
         if isinstance(jobID, int):
+            for sqlDeleteRecords in [
+                    """DELETE FROM jobsCommands WHERE jobRowid IN
+                        (SELECT rowid FROM jobs WHERE id = ?);""",
+                    """DELETE FROM jobsOutput WHERE jobRowid IN
+                        (SELECT rowid FROM jobs WHERE id = ?);""",
+                    """DELETE FROM jobsStatusChanges WHERE jobRowid IN
+                        (SELECT rowid FROM jobs WHERE id = ?);"""]:
+                self.sqlExecute(sqlDeleteRecords, jobID)
             sqlDeleteJob = "DELETE FROM jobs WHERE id = ?;"
             cursor = self.sqlExecute(sqlDeleteJob, jobID)
             if cursor is not None:
@@ -213,13 +448,16 @@ class SqlJobsTable(SqlDb):
 
         return cursor
 
-    def insert(self, *args):
+    def insert(self, *args, commit=True):
         """
         insert job into database
 
         Args:
             **jobID** (int): job id to insert
 
+            **commit** (bool, optional): commit the insert. Defaults to True
+            False when it is part of a larger transaction.
+
         Returns:
             sqlite3.cursor: cursor to the database after operation
         """
@@ -227,11 +465,13 @@ class SqlJobsTable(SqlDb):
 
         sqlJob = """ INSERT INTO
                      jobs(id, addDate, addTime, startTime, endTime, job,
-                        command, projectName, projectInfo, saved, deleteMark)
-                     VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?); """
+                        command, projectName, projectInfo, saved, deleteMark,
+                        status, algorithm, totalCommands)
+                     VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?); """
         cursor = self.sqlExecute(sqlJob, *args)
         if cursor is not None:
-            self.connection.commit()
+            if commit:
+                self.connection.commit()
             return cursor.lastrowid
 
         return 0
@@ -327,6 +567,601 @@ class SqlJobsTable(SqlDb):
 
         return cursor
 
+    def startCheckpoints(self, jobID, command, algorithm, totalCommands, startTime):
+        """
+        startCheckpoints register a job running any previous checkpoints for
+        the job are removed
+
+        Args:
+            **jobID** (int): job id
+
+            **command** (str): job command
+
+            **algorithm** (int): algorithm used to generate commands
+
+            **totalCommands** (int): number of commands in job
+
+            **startTime** (float): job start time
+
+        Returns:
+            sqlite3.cursor: cursor to the database after operation
+        """
+
+        self.__lastError = None
+
+        self.removeCheckpoints(jobID)
+
+        sqlJob = """ INSERT INTO
+                     jobsResume(id, command, algorithm, totalCommands, startTime)
+                     VALUES(?, ?, ?, ?, ?); """
+        cursor = self.sqlExecute(
+            sqlJob, jobID, command, algorithm, totalCommands, startTime)
+        if cursor is not None:
+            self.connection.commit()
+
+        return cursor
+
+    def checkpoint(self, jobID, commandIndex, destinationFile, size, endTime):
+        """
+        checkpoint record a command of a job completed
+
+        Args:
+            **jobID** (int): job id
+
+            **commandIndex** (int): index of command in job
+
+            **destinationFile** (str): output file of command
+
+            **size** (int): size of output file
+
+            **endTime** (float): time command ended
+
+        Returns:
+            sqlite3.cursor: cursor to the database after operation
+        """
+
+        self.__lastError = None
+
+        sqlCheckpoint = """ INSERT OR REPLACE INTO
+                     jobsCheckpoints(id, commandIndex, destinationFile, size, endTime)
+                     VALUES(?, ?, ?, ?, ?); """
+        cursor = self.sqlExecute(
+            sqlCheckpoint, jobID, commandIndex, destinationFile, size, endTime)
+        if cursor is not None:
+            self.connection.commit()
+
+        return cursor
+
+    def checkpoints(self, jobID):
+        """
+        checkpoints commands completed for a job
+
+        Args:
+            **jobID** (int): job id
+
+        Returns:
+            sqlite3.cursor: cursor with rows commandIndex, destinationFile, size
+        """
+
+        self.__lastError = None
+
+        sqlCheckpoints = """
+            SELECT commandIndex, destinationFile, size
+                FROM jobsCheckpoints
+                WHERE id = ?
+                ORDER BY commandIndex; """
+
+        return self.sqlExecute(sqlCheckpoints, jobID)
+
+    def resumableJobs(self):
+        """
+        resumableJobs jobs that started and did not end
+
+        Returns:
+            sqlite3.cursor: cursor with rows id, command, algorithm,
+            totalCommands, startTime
+        """
+
+        self.__lastError = None
+
+        sqlResume = """
+            SELECT id, command, algorithm, totalCommands, startTime
+                FROM jobsResume
+                ORDER BY startTime; """
+
+        return self.sqlExecute(sqlResume)
+
+    def removeCheckpoints(self, jobID):
+        """
+        removeCheckpoints delete job from the jobs running
+
+        Args:
+            **jobID** (int): job id
+        """
+
+        self.__lastError = None
+
+        for sqlDelete in [
+                "DELETE FROM jobsCheckpoints WHERE id = ?;",
+                "DELETE FROM jobsResume WHERE id = ?;"]:
+            if self.sqlExecute(sqlDelete, jobID) is not None:
+                self.connection.commit()
+
+    def manifest(self, destinationFile):
+        """
+        manifest of output file
+
+        Args:
+            **destinationFile** (str): output file
+
+        Returns:
+            tuple: size, tracks and command recorded. None if not found.
+        """
+
+        self.__lastError = None
+
+        sqlManifest = """
+            SELECT size, tracks, command
+                FROM outputsManifest
+                WHERE destinationFile = ?; """
+
+        if (cursor := self.sqlExecute(sqlManifest, destinationFile)) is not None:
+            return cursor.fetchone()
+
+        return None
+
+    def setManifest(self, destinationFile, size, mtime, tracks, command):
+        """
+        setManifest record output file of command
+
+        Args:
+            **destinationFile** (str): output file
+
+            **size** (int): size of file
+
+            **mtime** (float): modification time of file
+
+            **tracks** (str): json with track structure of file
+
+            **command** (str): command that produced the file
+
+        Returns:
+            sqlite3.cursor: cursor to the database after operation
+        """
+
+        self.__lastError = None
+
+        sqlManifest = """ INSERT OR REPLACE INTO
+                     outputsManifest(destinationFile, size, mtime, tracks, command)
+                     VALUES(?, ?, ?, ?, ?); """
+        cursor = self.sqlExecute(
+            sqlManifest, destinationFile, size, mtime, tracks, command)
+        if cursor is not None:
+            self.connection.commit()
+
+        return cursor
+
+    def addCommandMetrics(
+            self, jobID, commandIndex, destinationFile, rc, endTime,
+            wallTime, cpuTime, maxRSS, bytesRead, bytesWritten, commit=True):
+        """
+        addCommandMetrics record the resources used by a command
+
+        Args:
+            **jobID** (int): job id
+
+            **commandIndex** (int): index of command in job
+
+            **destinationFile** (str): output file of command
+
+            **rc** (int): command return code
+
+            **endTime** (float): time command ended
+
+            **wallTime** (float): seconds command ran
+
+            **cpuTime** (float): user and system CPU seconds
+
+            **maxRSS** (int): maximum resident set size in bytes
+
+            **bytesRead** (int): size of source files
+
+            **bytesWritten** (int): size of output file
+
+            **commit** (bool, optional): commit the insert. Defaults to True
+            False when it is part of a larger transaction.
+
+        Returns:
+            sqlite3.cursor: cursor to the database after operation
+        """
+
+        self.__lastError = None
+
+        sqlMetrics = """ INSERT INTO
+                     commandsMetrics(id, commandIndex, destinationFile, rc,
+                        endTime, wallTime, cpuTime, maxRSS, bytesRead,
+                        bytesWritten)
+                     VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?); """
+        cursor = self.sqlExecute(
+            sqlMetrics, jobID, commandIndex, destinationFile, rc, endTime,
+            wallTime, cpuTime, maxRSS, bytesRead, bytesWritten)
+        if (cursor is not None) and commit:
+            self.connection.commit()
+
+        return cursor
+
+    def addJobMetrics(
+            self, jobID, startTime, endTime, commands, wallTime, cpuTime,
+            maxRSS, bytesRead, bytesWritten, commit=True):
+        """
+        addJobMetrics record the resources used by the commands of a job
+
+        Args:
+            **jobID** (int): job id
+
+            **startTime** (float): time job started
+
+            **endTime** (float): time job ended
+
+            **commands** (int): commands executed
+
+            **wallTime** (float): seconds commands ran
+
+            **cpuTime** (float): user and system CPU seconds of commands
+
+            **maxRSS** (int): maximum resident set size of a command in bytes
+
+            **bytesRead** (int): size of source files
+
+            **bytesWritten** (int): size of output files
+
+            **commit** (bool, optional): commit the insert. Defaults to True
+            False when it is part of a larger transaction.
+
+        Returns:
+            sqlite3.cursor: cursor to the database after operation
+        """
+
+        self.__lastError = None
+
+        sqlMetrics = """ INSERT INTO
+                     jobsMetrics(id, startTime, endTime, commands, wallTime,
+                        cpuTime, maxRSS, bytesRead, bytesWritten)
+                     VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?); """
+        cursor = self.sqlExecute(
+            sqlMetrics, jobID, startTime, endTime, commands, wallTime,
+            cpuTime, maxRSS, bytesRead, bytesWritten)
+        if (cursor is not None) and commit:
+            self.connection.commit()
+
+        return cursor
+
+    def commandsMetrics(self, jobID):
+        """
+        commandsMetrics resources used by the commands of a job
+
+        Args:
+            **jobID** (int): job id
+
+        Returns:
+            sqlite3.cursor: cursor with rows commandIndex, destinationFile, rc,
+            endTime, wallTime, cpuTime, maxRSS, bytesRead, bytesWritten, rate
+            the MB/s of the bytes read and written over the wall time
+        """
+
+        self.__lastError = None
+
+        sqlMetrics = """
+            SELECT commandIndex, destinationFile, rc, endTime, wallTime,
+                cpuTime, maxRSS, bytesRead, bytesWritten,
+                IFNULL((bytesRead + bytesWritten) / wallTime / 1000000, 0.0)
+                FROM commandsMetrics
+                WHERE id = ?
+                ORDER BY endTime; """
+
+        return self.sqlExecute(sqlMetrics, jobID)
+
+    def setCommands(self, jobRowid, commands):
+        """
+        setCommands save the commands of a job and their results
+
+        Args:
+            **jobRowid** (int): rowid of job in jobs table
+
+            **commands** (list): (commandIndex, command, destinationFile, rc,
+            status, endTime) of every command rc, status and endTime are None
+            for the commands not executed
+
+        Returns:
+            sqlite3.cursor: cursor to the database after operation
+        """
+
+        self.__lastError = None
+
+        sqlCommands = """ INSERT OR REPLACE INTO
+                     jobsCommands(jobRowid, commandIndex, command,
+                        destinationFile, rc, status, endTime)
+                     VALUES(?, ?, ?, ?, ?, ?, ?); """
+        try:
+            return self.connection.executemany(
+                sqlCommands, [(jobRowid, *command) for command in commands])
+        except SQLiteError as e:
+            self.__lastError = "SQLiteError: {}".format(e)
+
+        return None
+
+    def setOutput(self, jobRowid, kind, lines):
+        """
+        setOutput save the output or errors of a job
+
+        Args:
+            **jobRowid** (int): rowid of job in jobs table
+
+            **kind** (str): "output" or "errors"
+
+            **lines** (list): (lineIndex, text, args) args is the JSON of the
+            format arguments
+
+        Returns:
+            sqlite3.cursor: cursor to the database after operation
+        """
+
+        self.__lastError = None
+
+        sqlOutput = """ INSERT OR REPLACE INTO
+                     jobsOutput(jobRowid, kind, lineIndex, text, args)
+                     VALUES(?, ?, ?, ?, ?); """
+        try:
+            return self.connection.executemany(
+                sqlOutput, [(jobRowid, kind, *line) for line in lines])
+        except SQLiteError as e:
+            self.__lastError = "SQLiteError: {}".format(e)
+
+        return None
+
+    def setCommandResults(self, jobRowid, results):
+        """
+        setCommandResults save the results of the commands executed. The
+        commands with a result saved are not updated.
+
+        Args:
+            **jobRowid** (int): rowid of job in jobs table
+
+            **results** (list): (commandIndex, rc, status, endTime) of the
+            commands executed
+
+        Returns:
+            sqlite3.cursor: cursor to the database after operation
+        """
+
+        self.__lastError = None
+
+        sqlResults = """ UPDATE jobsCommands
+                     SET rc = ?, status = ?, endTime = ?
+                     WHERE jobRowid = ? AND commandIndex = ?
+                        AND endTime IS NULL; """
+        try:
+            return self.connection.executemany(
+                sqlResults,
+                [
+                    (rc, status, endTime, jobRowid, index)
+                    for index, rc, status, endTime in results
+                ],
+            )
+        except SQLiteError as e:
+            self.__lastError = "SQLiteError: {}".format(e)
+
+        return None
+
+    def addStatusChange(self, jobRowid, status, changeTime):
+        """
+        addStatusChange append a status change of a job
+
+        Args:
+            **jobRowid** (int): rowid of job in jobs table
+
+            **status** (str): new status
+
+            **changeTime** (float): time of the change
+
+        Returns:
+            sqlite3.cursor: cursor to the database after operation
+        """
+
+        self.__lastError = None
+
+        sqlStatus = """ INSERT INTO
+                     jobsStatusChanges(jobRowid, status, changeTime)
+                     VALUES(?, ?, ?); """
+
+        return self.sqlExecute(sqlStatus, jobRowid, status, changeTime)
+
+    def savedRecords(self, jobRowid):
+        """
+        savedRecords what is saved of a job so only what changed is added
+
+        Args:
+            **jobRowid** (int): rowid of job in jobs table
+
+        Returns:
+            tuple: (commands, outputLines, errorsLines, status) commands
+            saved, next line index of output and errors and last status
+            saved. None on error.
+        """
+
+        self.__lastError = None
+
+        sqlSaved = """
+            SELECT
+                (SELECT COUNT(*) FROM jobsCommands WHERE jobRowid = ?),
+                (SELECT IFNULL(MAX(lineIndex) + 1, 0) FROM jobsOutput
+                    WHERE jobRowid = ? AND kind = 'output'),
+                (SELECT IFNULL(MAX(lineIndex) + 1, 0) FROM jobsOutput
+                    WHERE jobRowid = ? AND kind = 'errors'),
+                (SELECT status FROM jobsStatusChanges WHERE jobRowid = ?
+                    ORDER BY rowid DESC LIMIT 1); """
+
+        cursor = self.sqlExecute(sqlSaved, *[jobRowid] * 4)
+        if cursor is not None:
+            return cursor.fetchone()
+
+        return None
+
+    def historyJob(self, jobRowid):
+        """
+        historyJob a job saved
+
+        Args:
+            **jobRowid** (int): rowid of job in jobs table
+
+        Returns:
+            tuple: row with the HISTORYFIELDS. None if not found.
+        """
+
+        self.__lastError = None
+
+        sqlHistory = (
+            f"SELECT {', '.join(HISTORYFIELDS)} FROM jobs WHERE rowid = ?;")
+
+        cursor = self.sqlExecute(sqlHistory, jobRowid)
+        if cursor is not None:
+            return cursor.fetchone()
+
+        return None
+
+    def historyJobs(
+            self, status=None, orderBy="startTime", descending=True,
+            limit=-1, offset=0):
+        """
+        historyJobs list the jobs saved from the columns the jobs are not
+        unpickled
+
+        Args:
+            **status** (str, optional): only jobs with status. Defaults to
+            None all jobs.
+
+            **orderBy** (str, optional): one of HISTORYFIELDS. Defaults to
+            "startTime".
+
+            **descending** (bool, optional): descending order. Defaults to
+            True.
+
+            **limit** (int, optional): rows to read -1 all. Defaults to -1.
+
+            **offset** (int, optional): rows to skip. Defaults to 0.
+
+        Returns:
+            sqlite3.cursor: cursor with rows with the HISTORYFIELDS. None if
+            orderBy is not valid.
+        """
+
+        self.__lastError = None
+
+        if orderBy not in HISTORYFIELDS:
+            self.__lastError = f"Invalid order field {orderBy}"
+            return None
+
+        values = []
+        wClause = ""
+        if status is not None:
+            wClause = "WHERE status = ?"
+            values.append(status)
+
+        sqlHistory = (
+            f"SELECT {', '.join(HISTORYFIELDS)} FROM jobs {wClause} "
+            f"ORDER BY {orderBy} {'DESC' if descending else 'ASC'} "
+            f"LIMIT ? OFFSET ?;"
+        )
+
+        return self.sqlExecute(sqlHistory, *values, limit, offset)
+
+    def historyCommands(self, jobRowid):
+        """
+        historyCommands commands of a job saved
+
+        Args:
+            **jobRowid** (int): rowid of job in jobs table
+
+        Returns:
+            sqlite3.cursor: cursor with rows commandIndex, command,
+            destinationFile, rc, status, endTime
+        """
+
+        self.__lastError = None
+
+        sqlCommands = """
+            SELECT commandIndex, command, destinationFile, rc, status, endTime
+                FROM jobsCommands
+                WHERE jobRowid = ?
+                ORDER BY commandIndex; """
+
+        return self.sqlExecute(sqlCommands, jobRowid)
+
+    def historyOutput(self, jobRowid, kind="output"):
+        """
+        historyOutput output or errors of a job saved
+
+        Args:
+            **jobRowid** (int): rowid of job in jobs table
+
+            **kind** (str, optional): "output" or "errors". Defaults to
+            "output".
+
+        Returns:
+            sqlite3.cursor: cursor with rows text, args
+        """
+
+        self.__lastError = None
+
+        sqlOutput = """
+            SELECT text, args
+                FROM jobsOutput
+                WHERE jobRowid = ? AND kind = ?
+                ORDER BY lineIndex; """
+
+        return self.sqlExecute(sqlOutput, jobRowid, kind)
+
+    def historyStatusChanges(self, jobRowid):
+        """
+        historyStatusChanges status changes of a job saved
+
+        Args:
+            **jobRowid** (int): rowid of job in jobs table
+
+        Returns:
+            sqlite3.cursor: cursor with rows status, changeTime
+        """
+
+        self.__lastError = None
+
+        sqlStatus = """
+            SELECT status, changeTime
+                FROM jobsStatusChanges
+                WHERE jobRowid = ?
+                ORDER BY rowid; """
+
+        return self.sqlExecute(sqlStatus, jobRowid)
+
+    def archivedJob(self, jobRowid):
+        """
+        archivedJob compressed pickled job if it was archived
+
+        Args:
+            **jobRowid** (int): rowid of job in jobs table
+
+        Returns:
+            bytes: compressed job. None if not archived.
+        """
+
+        self.__lastError = None
+
+        cursor = self.sqlExecute(
+            "SELECT job FROM jobs WHERE rowid = ?;", jobRowid)
+        if (cursor is not None) and ((row := cursor.fetchone()) is not None):
+            return row[0]
+
+        return None
+
     def textSearch(self, searchText):
         """
         textSearch do a full text search on jobs table command field
@@ -415,103 +1250,235 @@ class SqlJobsTable(SqlDb):
         return cursor
 
 
-def updateTables(database, fromVersion, toVersion):
+def _addJobsColumns(database):
     """
-    update jobs table form no version to version 2.0.0a1
+    add the job information columns to the jobs table. Only the columns
+    missing are added so a migration stopped after they were committed can
+    run again.
     """
 
-    sqlScript = ""
+    cursor = database.connection.execute("PRAGMA table_info(jobs);")
+    columns = {row[1] for row in cursor.fetchall()}
+    for column, columnType in [
+            ("status", "TEXT"),
+            ("algorithm", "INTEGER"),
+            ("totalCommands", "INTEGER")]:
+        if column not in columns:
+            database.connection.execute(
+                f"ALTER TABLE jobs ADD COLUMN {column} {columnType};")
+    database.commit()
+
+
+def _backfillHistory(database):
+    """fill the job information columns and tables from the jobs saved"""
 
-    if toVersion == "2.0.0a1" and fromVersion == "":
-        sqlScript = """
-            -- disable foreign key constraint check
-            PRAGMA foreign_keys=off;
+    # jobsDB imports this module
+    from .jobsDB import backfillHistory  # pylint: disable=import-outside-toplevel,cyclic-import
 
+    backfillHistory(database)
+
+
+# forward migrations of the jobs table by version they apply to with the
+# version they leave the table in. A step is committed with its version so an
+# upgrade that stops can continue from there.
+MIGRATIONS = {
+    "": (
+        "2.0.0a1",
+        """
+        -- disable foreign key constraint check
+        PRAGMA foreign_keys=off;
+
+        -- start a transaction
+        BEGIN TRANSACTION;
+
+        -- Here you can drop column or rename column
+        CREATE TABLE IF NOT EXISTS new_jobs_table(
+            id INTEGER,
+            addDate TEXT,
+            addTime REAL,
+            startTime REAL,
+            endTime REAL,
+            job BLOB,
+            projectName TEXT,
+            projectInfo TEXT,
+            saved INTEGER,
+            toDelete INTEGER
+        );
+        -- copy data from the table to the new_table
+        INSERT INTO new_jobs_table(id, addDate, addTime, startTime, endTime, job)
+            SELECT id, addDate, addTime, startTime, endTime, job
+                FROM jobs;
+
+        -- drop the table
+        DROP TABLE jobs;
+
+        -- rename the new_table to the table
+        ALTER TABLE new_jobs_table RENAME TO jobs;
+
+        -- set new fields with default values
+        UPDATE jobs SET
+        projectName = "AutoSaved",
+        projectInfo = "AutoSaved",
+        saved = 0,
+        toDelete = 0;
+
+        -- commit the transaction
+        COMMIT;
+
+        -- enable foreign key constraint check
+        PRAGMA foreign_keys=on; """
+    ),
+    "2.0.0a1": (
+        "2.0.0a2",
+        """
+        -- disable foreign key constraint check
+        PRAGMA foreign_keys=off;
+
+        -- start a transaction
+        BEGIN TRANSACTION;
+
+        -- Here you can drop column or rename column
+        CREATE TABLE IF NOT EXISTS new_jobs_table(
+            id INTEGER,
+            addDate TEXT,
+            addTime REAL,
+            startTime REAL,
+            endTime REAL,
+            job BLOB,
+            command TEXT,
+            projectName TEXT,
+            projectInfo TEXT,
+            saved INTEGER,
+            Deleted INTEGER
+        );
+        -- copy data from the table to the new_table
+        INSERT INTO new_jobs_table(id, addDate, addTime, startTime, endTime, job,
+            projectName, projectInfo, saved, Deleted)
+        SELECT id, addDate, addTime, startTime, endTime, job, "AutoSaved", "AutoSaved", 0, 0
+        FROM jobs;
+
+        -- drop the table
+        DROP TABLE jobs;
+
+        -- rename the new_table to the table
+        ALTER TABLE new_jobs_table RENAME TO jobs;
+
+        -- set new fields with default values
+        UPDATE jobs SET
+        command = "";
+
+        -- commit the transaction
+        COMMIT;
+
+        -- enable foreign key constraint check
+        PRAGMA foreign_keys=on; """
+    ),
+    "2.0.0a2": (
+        "2.1.0",
+        """
+        -- start a transaction
+        BEGIN TRANSACTION;
+
+        ALTER TABLE jobs RENAME COLUMN Deleted TO deleteMark;
+
+        -- full text search of the commands saved
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobsSearch
+            USING fts5(rowidKey, id, startTime, command);
+        DELETE FROM jobsSearch;
+        INSERT INTO jobsSearch(rowidKey, id, startTime, command)
+            SELECT rowid, id, startTime, command FROM jobs;
+
+        -- commit the transaction
+        COMMIT; """
+    ),
+    "2.1.0": (
+        "2.2.0",
+        """
+        -- start a transaction
+        BEGIN TRANSACTION;
+        """ + SQLINDEXES + """
+        -- commit the transaction
+        COMMIT; """
+    ),
+    "2.2.0": (
+        "2.3.0",
+        [
+            _addJobsColumns,
+            """
             -- start a transaction
             BEGIN TRANSACTION;
+            """ + SQLSTRUCTURED + """
+            -- commit the transaction
+            COMMIT; """,
+            # the jobs saved are unpickled one last time the ones without
+            # status are converted if it runs again
+            _backfillHistory,
+        ]
+    ),
+    "2.3.0": (
+        "2.4.0",
+        """
+        -- start a transaction
+        BEGIN TRANSACTION;
+        """ + SQLSTATUSCHANGES + """
+        -- the status of the jobs saved is their first change
+        INSERT INTO jobsStatusChanges(jobRowid, status, changeTime)
+            SELECT rowid, status, IFNULL(endTime, startTime) FROM jobs
+                WHERE status IS NOT NULL;
 
-            -- Here you can drop column or rename column
-            CREATE TABLE IF NOT EXISTS new_jobs_table(
-                id INTEGER,
-                addDate TEXT,
-                addTime REAL,
-                startTime REAL,
-                endTime REAL,
-                job BLOB,
-                projectName TEXT,
-                projectInfo TEXT,
-                saved INTEGER,
-                toDelete INTEGER
-            );
-            -- copy data from the table to the new_table
-            INSERT INTO new_jobs_table(id, addDate, addTime, startTime, endTime, job)
-                SELECT id, addDate, addTime, startTime, endTime, job
-                    FROM jobs;
-
-            -- drop the table
-            DROP TABLE jobs;
-
-            -- rename the new_table to the table
-            ALTER TABLE new_jobs_table RENAME TO jobs;
-
-            -- set new fields with default values
-            UPDATE jobs SET
-            projectName = "AutoSaved",
-            projectInfo = "AutoSaved",
-            saved = 0,
-            toDelete = 0;
+        -- commit the transaction
+        COMMIT; """
+    ),
+}
 
-            -- commit the transaction
-            COMMIT;
 
-            -- enable foreign key constraint check
-            PRAGMA foreign_keys=on; """
+def updateTables(database, fromVersion, toVersion):
+    """
+    updateTables migrate the jobs table from fromVersion to toVersion applying
+    the MIGRATIONS in order. The rows are kept. A step is a SQL script, a
+    function called with the database or a list of them.
 
-    if toVersion == "2.0.0a2" and fromVersion == "2.0.0a1":
-        sqlScript = """
-            -- disable foreign key constraint check
-            PRAGMA foreign_keys=off;
+    Args:
+        **database** (SqlJobsTable): history database
 
-            -- start a transaction
-            BEGIN TRANSACTION;
+        **fromVersion** (str): version of the table
 
-            -- Here you can drop column or rename column
-            CREATE TABLE IF NOT EXISTS new_jobs_table(
-                id INTEGER,
-                addDate TEXT,
-                addTime REAL,
-                startTime REAL,
-                endTime REAL,
-                job BLOB,
-                command TEXT,
-                projectName TEXT,
-                projectInfo TEXT,
-                saved INTEGER,
-                Deleted INTEGER
-            );
-            -- copy data from the table to the new_table
-            INSERT INTO new_jobs_table(id, addDate, addTime, startTime, endTime, job,
-                projectName, projectInfo, saved, Deleted)
-            SELECT id, addDate, addTime, startTime, endTime, job, "AutoSaved", "AutoSaved", 0, 0
-            FROM jobs;
-
-            -- drop the table
-            DROP TABLE jobs;
-
-            -- rename the new_table to the table
-            ALTER TABLE new_jobs_table RENAME TO jobs;
-
-            -- set new fields with default values
-            UPDATE jobs SET
-            command = "";
+        **toVersion** (str): version to migrate to
 
-            -- commit the transaction
-            COMMIT;
+    Returns:
+        bool: True if the table is in toVersion. False if a step failed, the
+        table is left in the last version migrated. None if there is no
+        migration path.
+    """
+
+    version = fromVersion
 
-            -- enable foreign key constraint check
-            PRAGMA foreign_keys=on; """
+    while version != toVersion:
+        if version not in MIGRATIONS:
+            MODULELOG.error(
+                "SJT0004: No jobs table migration from version %s to %s",
+                version, toVersion)
+            return None
 
-    if sqlScript:
-        #print("Updating database...")
-        cursor = database.connection.cursor()
-        cursor.executescript(sqlScript)
+        nextVersion, steps = MIGRATIONS[version]
+        try:
+            for step in steps if isinstance(steps, list) else [steps]:
+                if callable(step):
+                    step(database)
+                else:
+                    database.connection.executescript(step)
+        except SQLiteError as e:
+            database.rollback()
+            MODULELOG.error(
+                "SJT0005: Jobs table migration from version %s to %s error - "
+                "%s", version, nextVersion, e)
+            return False
+
+        database.setVersion("jobs", nextVersion)
+        database.commit()
+        MODULELOG.info(
+            "SJT0001: Jobs table migrated from version %s to %s",
+            version, nextVersion)
+        version = nextVersion
+
+    return True
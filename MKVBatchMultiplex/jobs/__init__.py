@@ -1,11 +1,51 @@
 """
 Import jobs module entry point
+
+JobQueue and RunJobs need Qt they are imported on first use so the command
+line runner can use the rest of the module without it.
 """
 
+import importlib
+
+from .ChunkedRunCommand import PROGRESSREGEX, ChunkedRunCommand
+from .commandMetrics import (
+    jobMetricsSummary, newJobMetrics, recordCommandMetrics, saveJobMetrics,
+    throughput)
+from .commandVerify import verifyCommand
+from .ControlQueue import ControlQueue
+from .DeviceScheduler import DeviceScheduler
+from .HistoryJob import HistoryJob
+from .HistoryWriter import HistoryWriter
+from .JobEvents import JobEventLog, jobEvent
+from .JobInfo import JobInfo, removeJobLogs, removeOldJobLogs
 from .JobKeys import (
     JobHistoryKey, JobKey, JobStatus,
     JobsTableKey, jobStatusTooltip)
-from .JobQueue import JobInfo, JobQueue
-from .jobsDB import addToDb, removeFromDb, saveToDb
-from .RunJobs import RunJobs
+from .JobOutputLog import JobOutputLog
+from .JobWorkQueue import JobWorkQueue
+from .MetricsRegistry import MetricsExporter, MetricsRegistry, metrics
+from .jobsDB import (
+    addCheckpoint, addToDb, checkpointFile, discardResumableJobs,
+    fetchHistoryJob, fetchResumableJobs, removeCheckpoints, removeFromDb,
+    saveToDb, startCheckpoints)
+from .outputManifest import outputUpToDate, updateManifest
+from .ProcessSupervisor import CommandResult, ProcessSupervisor
+from .SignalCoalescer import SignalCoalescer
 from .SqlJobsTable import SqlJobsTable
+
+_QTCLASSES = {
+    "JobQueue": ".JobQueue",
+    "RunJobs": ".RunJobs",
+}
+
+
+def __getattr__(name):
+    if name in _QTCLASSES:
+        for className, moduleName in _QTCLASSES.items():
+            module = importlib.import_module(moduleName, __name__)
+            # importing the module set the package attribute to the module
+            # replace it with the class
+            globals()[className] = getattr(module, className)
+        return globals()[name]
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,226 @@
+"""
+commandMetrics record the resources used by the commands of the jobs
+"""
+
+import logging
+import threading
+
+from collections import deque
+from datetime import timedelta
+from pathlib import Path
+from time import time
+
+from vsutillib.misc import strFormatTimeDelta
+
+from .JobKeys import JobKey
+from .MetricsRegistry import metrics as _metrics
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+# seconds of commands ended used for the current MB/s
+THROUGHPUTWINDOW = 300
+
+_throughputLock = threading.Lock()
+_recentBytes = deque()
+
+
+def newJobMetrics():
+    """
+    newJobMetrics totals of the resources used by the commands of a job
+
+    Returns:
+        dict: totals in zero
+    """
+
+    return {
+        "commands": 0,
+        "wallTime": 0.0,
+        "cpuTime": 0.0,
+        "maxRSS": 0,
+        "bytesRead": 0,
+        "bytesWritten": 0,
+    }
+
+
+def recordCommandMetrics(writer, job, index, result):
+    """
+    recordCommandMetrics save the resources used by a command and add them to
+    the job totals. The bytes read are the size of the source files and the
+    bytes written the size of the output. The rate is the MB/s of the bytes
+    read and written over the wall time.
+
+    Args:
+        **writer** (HistoryWriter): writer that saves the metrics
+
+        **job** (JobInfo): job running
+
+        **index** (int): index of command in job
+
+        **result** (CommandResult): result of the command
+
+    Returns:
+        dict: metrics of command. None if command did not run.
+    """
+
+    if result is None:
+        return None
+
+    _, _, sourceFiles, destinationFile, _, _, _ = job.oCommand[index]
+
+    metrics = {
+        "wallTime": result.seconds or 0.0,
+        "cpuTime": result.cpuTime,
+        "maxRSS": result.maxRSS,
+        "bytesRead": sum(_fileSize(f) for f in sourceFiles or []),
+        "bytesWritten": _fileSize(destinationFile),
+    }
+    processed = metrics["bytesRead"] + metrics["bytesWritten"]
+    metrics["rate"] = _rate(processed, metrics["wallTime"])
+    endTime = time()
+
+    writer.addCommandMetrics(
+        job.jobRow[JobKey.ID],
+        index,
+        str(destinationFile),
+        result.rc,
+        endTime,
+        metrics["wallTime"],
+        metrics["cpuTime"],
+        metrics["maxRSS"],
+        metrics["bytesRead"],
+        metrics["bytesWritten"],
+    )
+
+    job.commandResults[index] = (result.rc, result.status, endTime)
+
+    with _throughputLock:
+        _recentBytes.append((endTime, processed))
+    _metrics.inc("commands_total")
+    _metrics.inc("bytes_processed_total", processed)
+    if result.status is not None:
+        _metrics.inc("errors_total", reason=result.status)
+    elif result.rc not in [0, 1]:
+        _metrics.inc("errors_total", reason="returnCode")
+
+    totals = job.metrics
+    totals["commands"] += 1
+    totals["wallTime"] += metrics["wallTime"]
+    totals["cpuTime"] += metrics["cpuTime"] or 0.0
+    totals["maxRSS"] = max(totals["maxRSS"], metrics["maxRSS"] or 0)
+    totals["bytesRead"] += metrics["bytesRead"]
+    totals["bytesWritten"] += metrics["bytesWritten"]
+
+    return metrics
+
+
+def saveJobMetrics(writer, job):
+    """
+    saveJobMetrics save the totals of the job if it executed commands
+
+    Args:
+        **writer** (HistoryWriter): writer that saves the metrics
+
+        **job** (JobInfo): job ended
+    """
+
+    totals = job.metrics
+    if totals["commands"]:
+        writer.addJobMetrics(
+            job.jobRow[JobKey.ID],
+            job.startTime,
+            job.endTime,
+            totals["commands"],
+            totals["wallTime"],
+            totals["cpuTime"],
+            totals["maxRSS"],
+            totals["bytesRead"],
+            totals["bytesWritten"],
+        )
+
+
+def jobMetricsSummary(job):
+    """
+    jobMetricsSummary totals of the job for the jobs output. CPU time near the
+    wall time means the commands were limited by the CPU, far below it by the
+    disks. The MB/s are the bytes read and written over the job running time
+    the commands could have run at the same time.
+
+    Args:
+        **job** (JobInfo): job ended
+
+    Returns:
+        str: summary. Empty string if no commands were executed.
+    """
+
+    totals = job.metrics
+    if not totals["commands"]:
+        return ""
+
+    wallTime = totals["wallTime"]
+    runningTime = wallTime
+    if job.startTime and job.endTime:
+        runningTime = job.endTime - job.startTime
+    cpuPercent = (totals["cpuTime"] / wallTime * 100) if wallTime else 0
+    rate = _rate(totals["bytesRead"] + totals["bytesWritten"], runningTime)
+
+    return (
+        f"Commands metrics - wall time "
+        f"{strFormatTimeDelta(timedelta(seconds=wallTime))} - CPU time "
+        f"{strFormatTimeDelta(timedelta(seconds=totals['cpuTime']))} "
+        f"({cpuPercent:.0f}%) - max RSS {_formatBytes(totals['maxRSS'])}\n"
+        f"Read {_formatBytes(totals['bytesRead'])} - written "
+        f"{_formatBytes(totals['bytesWritten'])} - {rate:.1f} MB/s.\n"
+    )
+
+
+def throughput():
+    """
+    throughput MB/s of the bytes read and written by the commands ended in
+    the last THROUGHPUTWINDOW seconds
+
+    Returns:
+        float: MB/s
+    """
+
+    oldest = time() - THROUGHPUTWINDOW
+    with _throughputLock:
+        while _recentBytes and (_recentBytes[0][0] < oldest):
+            _recentBytes.popleft()
+        processed = sum(size for _, size in _recentBytes)
+
+    return _rate(processed, THROUGHPUTWINDOW)
+
+
+def _rate(processed, seconds):
+    """MB/s of bytes read and written 0 if there is no time"""
+
+    return (processed / seconds / 1000000) if seconds else 0.0
+
+
+def _fileSize(fileName):
+    """size of file 0 if it does not exist"""
+
+    try:
+        f = Path(fileName)
+        return f.stat().st_size if f.is_file() else 0
+    except (OSError, TypeError):
+        return 0
+
+
+def _formatBytes(size):
+    """size in B, KB, MB, GB or TB"""
+
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1000:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} {unit}"
+        size /= 1000
+
+    return f"{size:.1f} TB"
+
+
+_metrics.collector(
+    "throughput_mb_per_second", "gauge",
+    f"MB/s processed by the commands ended in the last {THROUGHPUTWINDOW} "
+    f"seconds.", throughput)
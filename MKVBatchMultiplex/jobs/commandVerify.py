@@ -0,0 +1,75 @@
+"""
+commandVerify structure checks shared by the interface and the command line
+"""
+
+import vsutillib.mkv as mkv
+
+from .JobEvents import jobEvent
+from .MetricsRegistry import metrics
+
+
+def verifyCommand(iVerify, oCommand, index, cmd, algorithm, jobID=None):
+    """
+    verifyCommand check the structure of the source files of a command and
+    when they differ from the base files try to adjust the command using the
+    selected algorithm. Commands that can not be executed are counted in
+    the errors metric.
+
+    Args:
+        **iVerify** (IVerifyStructure): structure verification object
+
+        **oCommand** (MKVCommandParser): commands of job
+
+        **index** (int): index of command to verify
+
+        **cmd** (str): command to verify
+
+        **algorithm** (int): algorithm used to adjust command 0 no adjustment
+
+        **jobID** (int, optional): job ID for the adjustSources event.
+        Defaults to None.
+
+    Returns:
+        tuple: (runJob, cmd, msg, adjusted)
+
+            - **runJob** (bool): True if command can be executed
+            - **cmd** (str): command to execute could have been adjusted
+            - **msg** (str): warning message if adjustment was attempted None
+              otherwise
+            - **adjusted** (bool): True if command was adjusted
+    """
+
+    iVerify.verifyStructure(oCommand, index)
+
+    runJob = bool(iVerify)
+    msg = None
+    adjusted = False
+
+    if (algorithm >= 1) and (not iVerify):
+        rc, confidence = mkv.adjustSources(oCommand, index, algorithm)
+        runJob = rc
+        jobEvent(
+            "adjustSources", jobID=jobID, index=index, algorithm=algorithm,
+            adjusted=bool(rc), confidence=confidence)
+        if rc:
+            _, shellCommand = oCommand.generateCommandByIndex(
+                index, update=True)
+            originalCmd = cmd
+            cmd = shellCommand
+            adjusted = True
+            msg = (
+                f"Warning command adjusted - confidence "
+                f"{confidence}:\n\n"
+                f"Original: {originalCmd}\n"
+                f"     New: {cmd}\n"
+            )
+        else:
+            msg = (
+                f"Warning command failed adjustment:\n\n"
+                f"Command: {cmd}\n"
+            )
+
+    if not runJob:
+        metrics.inc("errors_total", reason="adjustment")
+
+    return runJob, cmd, msg, adjusted
@@ -1,23 +1,41 @@
 """
 jobsDB
 """
+# JDB0001
 
 try:
     import cPickle as pickle
 except:  # pylint: disable=bare-except
     import pickle
-import sys
+import json
+import logging
+import shlex
 import zlib
 
+from pathlib import Path
+from time import perf_counter, time
+
 from .. import config
 
+from .HistoryJob import HistoryJob
+from .JobInfo import removeJobLogs
 from .JobKeys import JobKey, JobsTableKey
+from .MetricsRegistry import metrics
 from .SqlJobsTable import SqlJobsTable
 
 
-def addToDb(database, job, update=False):
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+def addToDb(
+        database, job, update=False, name=None, description=None,
+        commit=True, archive=None):
     """
-    Save job in the database.
+    Save job in the database. The job information is saved in the jobs table
+    columns and the jobsCommands, jobsOutput and jobsStatusChanges tables.
+    An update only adds what changed since the last save. The pickled job is
+    saved only if it is archived, the updates archive it when the job ends.
 
     Args:
         **database** (SqlJobsTable): history database
@@ -25,7 +43,20 @@ def addToDb(database, job, update=False):
         **job** (JobInfo): running job information
 
         **update** (bool, optional): update is true if record should exits.
-        Defaults to False.
+        The row saved by the insert is updated. A job without a row, its
+        insert was rolled back, is inserted. Defaults to False.
+
+        **name** (str, optional): name for job to be saved. Defaults to
+        "AutoSaved".
+
+        **description** (str, optional): description for the job to be saved.
+        Defaults to "AutoSaved".
+
+        **commit** (bool, optional): commit the changes. Defaults to True
+        False when the caller commits a batch of jobs.
+
+        **archive** (bool, optional): save the pickled job. Defaults to None
+        use ConfigKey.HistoryArchive.
 
     Returns:
         int: rowid if insert successful. 0 otherwise.
@@ -45,7 +76,14 @@ def addToDb(database, job, update=False):
     rc = 0
 
     if not bSimulateRun:
-        cmpJob = zlib.compress(pickle.dumps(job))
+        startWrite = perf_counter()
+        if update and not getattr(job, "rowid", None):
+            # the insert did not reach the history
+            update = False
+        if archive is None:
+            archive = config.data.get(config.ConfigKey.HistoryArchive)
+        totalCommands = (
+            len(job.oCommand) if job.oCommand.commandsGenerated else None)
         if not update:
             rowid = database.insert(
                 job.jobRow[JobKey.ID],
@@ -53,16 +91,21 @@ def addToDb(database, job, update=False):
                 job.addTime,
                 job.startTime,
                 job.endTime,
-                cmpJob,
+                zlib.compress(pickle.dumps(job)) if archive else None,
                 job.oCommand.command,
-                "AutoSaved",
-                "AutoSaved",
+                "AutoSaved" if name is None else name,
+                "AutoSaved" if description is None else description,
                 0,
                 0,
+                job.jobRow[JobKey.Status],
+                job.algorithm,
+                totalCommands,
+                commit=commit,
             )
             rc = rowid
 
             if rowid > 0:
+                job.rowid = rowid
                 sqlSearchUpdate = """
                     INSERT INTO jobsSearch(rowidKey, id, startTime, command)
                         VALUES(?, ?, ?, ?); """
@@ -73,22 +116,165 @@ def addToDb(database, job, update=False):
                     job.startTime,
                     job.oCommand.command,
                 )
-            if rowid == 0:
-                print("error", database.error)
-                sys.exit()
+            else:
+                MODULELOG.error(
+                    "JDB0001: Job ID: %s not saved - %s",
+                    job.jobRow[JobKey.ID], database.error)
         else:
-            # jobsDB.update(449, (JobsTableKey.startTime, ), 80)
+            # the row saved by the insert
+            rowid = job.rowid
+            fields = [
+                JobsTableKey.startTime, JobsTableKey.endTime,
+                JobsTableKey.status, JobsTableKey.totalCommands]
+            values = [
+                job.startTime, job.endTime, job.jobRow[JobKey.Status],
+                totalCommands]
+            if archive and (job.endTime is not None):
+                # pickled only once when the job ends
+                fields.append(JobsTableKey.job)
+                values.append(zlib.compress(pickle.dumps(job)))
             database.update(
-                job.jobRow[JobKey.ID],
-                (JobsTableKey.startTime, JobsTableKey.endTime, JobsTableKey.job),
-                job.startTime,
-                job.endTime,
-                cmpJob,
+                {JobsTableKey.rowid: rowid},
+                tuple(fields),
+                *values,
             )
+        if rowid:
+            saveRecords(database, rowid, job)
+        if commit:
+            database.commit()
+        metrics.observe("db_write_seconds", perf_counter() - startWrite)
 
     return rc
 
 
+def saveRecords(database, rowid, job, saved=None):
+    """
+    saveRecords append to the jobsCommands, jobsOutput and jobsStatusChanges
+    tables what changed since the job was saved. The commands are saved once,
+    then only the results of the commands executed, the output lines not
+    saved and the status if it changed are added so the cost of a save is the
+    size of the change not the size of the job.
+
+    Args:
+        **database** (SqlJobsTable): history database
+
+        **rowid** (int): rowid of job in jobs table
+
+        **job** (JobInfo): job information
+
+        **saved** (tuple, optional): (commands, outputLines, errorsLines,
+        status) saved. Defaults to None read them from the database.
+    """
+
+    if saved is None:
+        saved = database.savedRecords(rowid)
+        if saved is None:
+            return
+    savedCommands, outputLines, errorsLines, savedStatus = saved
+
+    if job.oCommand.commandsGenerated:
+        results = getattr(job, "commandResults", {})
+        if not savedCommands:
+            commands = []
+            for index, (cmd, _, _, destinationFile, _, _, _) in enumerate(
+                    job.oCommand):
+                commands.append(
+                    (
+                        index,
+                        cmd if isinstance(cmd, str) else shlex.join(
+                            [str(arg) for arg in cmd]),
+                        str(destinationFile),
+                        *results.get(index, (None, None, None)),
+                    )
+                )
+            database.setCommands(rowid, commands)
+        elif results:
+            # the results saved are not updated
+            database.setCommandResults(
+                rowid,
+                [(index, *result) for index, result in results.items()],
+            )
+
+    for kind, log, start in [
+            ("output", job.output, outputLines),
+            ("errors", job.errors, errorsLines)]:
+        if len(log) > start:
+            database.setOutput(
+                rowid,
+                kind,
+                [
+                    (index, *_outputLine(entry))
+                    for index, entry in _logEntries(log, start)
+                ],
+            )
+
+    status = job.jobRow[JobKey.Status]
+    if status != savedStatus:
+        database.addStatusChange(rowid, status, time())
+
+
+def backfillHistory(database):
+    """
+    backfillHistory fill the job information columns and tables of the jobs
+    saved before they existed. Every job is unpickled once, the jobs that
+    cannot be unpickled keep only the columns they had.
+
+    Args:
+        **database** (SqlJobsTable): history database
+    """
+
+    cursor = database.sqlExecute(
+        "SELECT rowid FROM jobs WHERE job IS NOT NULL AND status IS NULL;")
+    rowids = [row[0] for row in cursor.fetchall()] if cursor else []
+
+    for rowid in rowids:
+        cursor = database.sqlExecute(
+            "SELECT job FROM jobs WHERE rowid = ?;", rowid)
+        try:
+            job = pickle.loads(zlib.decompress(cursor.fetchone()[0]))
+            totalCommands = (
+                len(job.oCommand) if job.oCommand.commandsGenerated else None)
+            database.update(
+                {JobsTableKey.rowid: rowid},
+                (
+                    JobsTableKey.status,
+                    JobsTableKey.algorithm,
+                    JobsTableKey.totalCommands,
+                ),
+                job.jobRow[JobKey.Status],
+                job.algorithm,
+                totalCommands,
+            )
+            # the status change is added by the migration to version 2.4.0
+            saveRecords(
+                database, rowid, job,
+                saved=(0, 0, 0, job.jobRow[JobKey.Status]))
+        except Exception as e:  # pylint: disable=broad-except
+            MODULELOG.warning(
+                "JDB0002: History row %s not converted - %s", rowid, e)
+
+    database.commit()
+
+
+def _logEntries(log, start):
+    """(index, entry) of the entries of log from start"""
+
+    if hasattr(log, "indexedEntries"):
+        return log.indexedEntries(start)
+
+    # lists of jobs pickled before JobOutputLog
+    return list(enumerate(log))[start:]
+
+
+def _outputLine(entry):
+    """text and JSON format arguments of output entry"""
+
+    if isinstance(entry, (list, tuple)) and len(entry) > 1:
+        return str(entry[0]), json.dumps(entry[1], default=str)
+
+    return str(entry), None
+
+
 def removeFromDb(database, recordID, jobID):
     """
     Remove job from database using record key id or job id.
@@ -112,6 +298,7 @@ def removeFromDb(database, recordID, jobID):
             jobID,
         )
         rc = rowid
+        removeJobLogs(jobID)
 
     return rc
 
@@ -119,7 +306,11 @@ def removeFromDb(database, recordID, jobID):
 def saveToDb(job, name=None, description=None, update=False):
     """
     saveToDb add the job to the history database it uses the database saved in
-    the configuration file.
+    the configuration file. The connection of the calling thread is kept open
+    between calls.
+
+    The jobs workers use HistoryWriter to save in a thread. The jobs saved
+    with a name are always archived.
 
     Args:
         **name** (str): name for job to be saved
@@ -133,69 +324,190 @@ def saveToDb(job, name=None, description=None, update=False):
         int: rowid if insert successful. 0 otherwise.
     """
 
-    #
-    # Compress job information:
-    # compressed = zlib.compress(cPickle.dumps(obj))
-    #
-    # Get it back:
-    # obj = cPickle.loads(zlib.decompress(compressed))
-    #
-    # Key ID, startTime
-    #
+    if config.data.get(config.ConfigKey.SimulateRun):
+        return 0
 
-    bSimulateRun = config.data.get(config.ConfigKey.SimulateRun)
-    rc = 0
+    return addToDb(
+        SqlJobsTable.shared(),
+        job,
+        update=update,
+        name="AutoSave" if name is None else name,
+        description="AutoSave" if description is None else description,
+        archive=True if name is not None else None,
+    )
 
-    if not bSimulateRun:
-        if name is None:
-            jobName = "AutoSave"
-        else:
-            jobName = name
-        if description is None:
-            jobDescription = "AutoSave"
-        else:
-            jobDescription = description
-        jobsDB = SqlJobsTable(config.data.get(config.ConfigKey.SystemDB))
-        cmpJob = zlib.compress(pickle.dumps(job))
-        if not update:
-            rowid = jobsDB.insert(
-                job.jobRow[JobKey.ID],
-                job.date.isoformat(),
-                job.addTime,
-                job.startTime,
-                job.endTime,
-                cmpJob,
-                job.oCommand.command,
-                jobName,
-                jobDescription,
-                0,
-                0,
-            )
-            rc = rowid
 
-            if rowid > 0:
-                sqlSearchUpdate = """
-                    INSERT INTO jobsSearch(rowidKey, id, startTime, command)
-                        VALUES(?, ?, ?, ?); """
-                jobsDB.sqlExecute(
-                    sqlSearchUpdate,
-                    rowid,
-                    job.jobRow[JobKey.ID],
-                    job.startTime,
-                    job.oCommand.command,
-                )
-            if rowid == 0:
-                print("error", jobsDB.error)
-                sys.exit()
-        else:
-            # jobsDB.update(449, (JobsTableKey.startTime, ), 80)
-            jobsDB.update(
-                job.jobRow[JobKey.ID],
-                (JobsTableKey.startTime, JobsTableKey.endTime, JobsTableKey.job),
-                job.startTime,
-                job.endTime,
-                cmpJob,
+def fetchHistoryJob(rowid):
+    """
+    fetchHistoryJob job saved in the history it uses the database saved in the
+    configuration file. Only the jobs table row is read, the rest is read
+    when it is used.
+
+    Args:
+        **rowid** (int): rowid of job in jobs table
+
+    Returns:
+        HistoryJob: job saved. None if not found.
+    """
+
+    row = SqlJobsTable.shared().historyJob(rowid)
+
+    return None if row is None else HistoryJob(row)
+
+
+def startCheckpoints(database, job):
+    """
+    startCheckpoints register the job as running so it can be resumed if the
+    application ends before the job is finished.
+
+    Args:
+        **database** (SqlJobsTable): history database
+
+        **job** (JobInfo): running job information
+    """
+
+    if not config.data.get(config.ConfigKey.SimulateRun):
+        database.startCheckpoints(
+            job.jobRow[JobKey.ID],
+            job.oCommand.command,
+            job.algorithm,
+            len(job.oCommand),
+            job.startTime,
+        )
+
+
+def addCheckpoint(database, job, index, destinationFile, size=None):
+    """
+    addCheckpoint record a command of the job completed
+
+    Args:
+        **database** (SqlJobsTable): history database
+
+        **job** (JobInfo): running job information
+
+        **index** (int): index of command in job
+
+        **destinationFile** (Path): output file of command
+
+        **size** (int, optional): size of output file. Defaults to None the
+        size is read from the file.
+    """
+
+    if config.data.get(config.ConfigKey.SimulateRun):
+        return
+
+    if size is None:
+        try:
+            size = Path(destinationFile).stat().st_size
+        except OSError:
+            return
+
+    database.checkpoint(
+        job.jobRow[JobKey.ID], index, str(destinationFile), size, time())
+
+
+def removeCheckpoints(database, jobID):
+    """
+    removeCheckpoints job is no longer running
+
+    Args:
+        **database** (SqlJobsTable): history database
+
+        **jobID** (int): job ID
+    """
+
+    if not config.data.get(config.ConfigKey.SimulateRun):
+        database.removeCheckpoints(jobID)
+
+
+def fetchResumableJobs():
+    """
+    fetchResumableJobs read the jobs that were running when the application
+    ended. It uses the database saved in the configuration file.
+
+    Returns:
+        list: dictionaries with keys id, command, algorithm, totalCommands,
+        startTime and checkpoints. checkpoints is a dictionary with the index
+        of the command completed as key and the destination file and its size
+        as value.
+    """
+
+    jobs = []
+
+    if config.data.get(config.ConfigKey.SimulateRun):
+        return jobs
+
+    jobsDB = SqlJobsTable.shared()
+    if (cursor := jobsDB.resumableJobs()) is not None:
+        for jobID, command, algorithm, totalCommands, startTime in cursor.fetchall():
+            checkpoints = {}
+            if (rows := jobsDB.checkpoints(jobID)) is not None:
+                for index, destinationFile, size in rows.fetchall():
+                    checkpoints[index] = (Path(destinationFile), size)
+            jobs.append(
+                {
+                    "id": jobID,
+                    "command": command,
+                    "algorithm": algorithm,
+                    "totalCommands": totalCommands,
+                    "startTime": startTime,
+                    "checkpoints": checkpoints,
+                }
             )
-        jobsDB.close()
 
-    return rc
+    return jobs
+
+
+def discardResumableJobs(jobIDs):
+    """
+    discardResumableJobs remove jobs from the jobs to resume
+
+    Args:
+        **jobIDs** (list): IDs of jobs to remove
+    """
+
+    if config.data.get(config.ConfigKey.SimulateRun):
+        return
+
+    jobsDB = SqlJobsTable.shared()
+    for jobID in jobIDs:
+        jobsDB.removeCheckpoints(jobID)
+
+
+def checkpointFile(destinationFile, size):
+    """
+    checkpointFile validate the output of a completed command. The file could
+    have been renamed with its CRC32.
+
+    Args:
+        **destinationFile** (Path): output file recorded
+
+        **size** (int): size recorded
+
+    Returns:
+        Path: file found with the same size None otherwise
+    """
+
+    destinationFile = Path(destinationFile)
+    candidates = [destinationFile]
+    candidates.extend(
+        destinationFile.parent.glob(
+            f"{_globEscape(destinationFile.stem)} [[]*[]]"
+            f"{_globEscape(destinationFile.suffix)}"
+        )
+    )
+
+    for f in candidates:
+        try:
+            if f.is_file() and (f.stat().st_size == size):
+                return f
+        except OSError:
+            continue
+
+    return None
+
+
+def _globEscape(name):
+    """escape glob special characters"""
+
+    return "".join(f"[{c}]" if c in "*?[" else c for c in name)
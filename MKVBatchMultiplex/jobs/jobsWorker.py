@@ -3,12 +3,12 @@ jobsWorker
 """
 
 import logging
+import threading
 
 # try:
 #    import cPickle as pickle
 # except ImportError:  # pylint: disable=bare-except
 #    import pickle
-import re
 
 # import sys
 # import zlib
@@ -21,16 +21,25 @@ from PySide6.QtWidgets import QSystemTrayIcon
 
 import vsutillib.mkv as mkv
 
-from vsutillib.misc import staticVars, strFormatTimeDelta
-from vsutillib.process import RunCommand, ThreadWorker
+from vsutillib.misc import strFormatTimeDelta
+from vsutillib.process import ThreadWorker
 from vsutillib.pyside6 import SvgColor
 
 from .. import config
 
-from ..utils import computeCRC32
-
-from .jobsDB import saveToDb
+from ..utils import computeCRC32, profiled
+
+from .ChunkedRunCommand import PROGRESSREGEX, ChunkedRunCommand
+from .CommandPool import CommandPool
+from .commandMetrics import (
+    jobMetricsSummary, recordCommandMetrics, saveJobMetrics)
+from .commandVerify import verifyCommand
+from .HistoryWriter import HistoryWriter
+from .JobEvents import jobEvent
+from .jobsDB import (
+    addCheckpoint, checkpointFile, removeCheckpoints, startCheckpoints)
 from .JobKeys import JobStatus, JobKey
+from .outputManifest import outputUpToDate, updateManifest
 from .SqlJobsTable import SqlJobsTable
 
 
@@ -38,7 +47,149 @@ MODULELOG = logging.getLogger(__name__)
 MODULELOG.addHandler(logging.NullHandler())
 
 
-@staticVars(running=False)
+class JobsWorkerState:
+    """
+    JobsWorkerState state shared by the jobs workers running in the pool
+
+    Args:
+        **totalJobs** (int): jobs in queue at start of run
+
+        **totalErrors** (int, optional): errors count at start of run.
+        Defaults to 0.
+
+        **workers** (int, optional): number of workers in the pool.
+        Defaults to 1.
+    """
+
+    def __init__(
+            self,
+            totalJobs: int,
+            totalErrors: int = 0,
+            workers: int = 1) -> None:
+
+        self.__lock = threading.Lock()
+        self.__progressOwner = None
+
+        self.abortAll = False
+        self.currentJob = 0
+        self.totalErrors = totalErrors
+        self.totalJobs = totalJobs
+        self.workers = workers
+        self.__runningWorkers = workers
+
+    def nextJob(self, remainingJobs: int) -> tuple:
+        """
+        nextJob update counters for a job taken from queue
+
+        Args:
+            **remainingJobs** (int): jobs remaining in queue
+
+        Returns:
+            tuple: current job number and total jobs
+        """
+
+        with self.__lock:
+            self.currentJob += 1
+            self.totalJobs = self.currentJob + remainingJobs
+
+            return self.currentJob, self.totalJobs
+
+    def addError(self) -> int:
+        """
+        addError increment error count
+
+        Returns:
+            int: total errors
+        """
+
+        with self.__lock:
+            self.totalErrors += 1
+
+            return self.totalErrors
+
+    def workerEnded(self) -> bool:
+        """
+        workerEnded a worker finished processing the queue
+
+        Returns:
+            bool: True if it was the last worker running
+        """
+
+        with self.__lock:
+            self.__runningWorkers -= 1
+
+            return self.__runningWorkers <= 0
+
+    def claimProgress(self, workerID: int) -> bool:
+        """
+        claimProgress progress bar is updated by only one worker at a time the
+        first worker to claim it keeps it until the job ends
+
+        Args:
+            **workerID** (int): worker identification
+
+        Returns:
+            bool: True if the worker owns the progress bar
+        """
+
+        with self.__lock:
+            if self.__progressOwner is None:
+                self.__progressOwner = workerID
+
+            return self.__progressOwner == workerID
+
+    def releaseProgress(self, workerID: int) -> None:
+        """
+        releaseProgress release progress bar if owned by worker
+
+        Args:
+            **workerID** (int): worker identification
+        """
+
+        with self.__lock:
+            if self.__progressOwner == workerID:
+                self.__progressOwner = None
+
+
+class WorkerProgress:
+    """
+    WorkerProgress filter the Progress signals of a worker in the pool. Jobs
+    totals and errors labels are always updated the progress bars and the
+    files labels only by the worker that owns the progress bar.
+
+    Args:
+        **funcProgress** (Progress): progress signals
+
+        **workerState** (JobsWorkerState): workers shared state
+
+        **workerID** (int): worker identification
+    """
+
+    def __init__(self, funcProgress, workerState, workerID):
+
+        self.lbl = funcProgress.lbl
+
+        owner = lambda *args: workerState.claimProgress(workerID)
+        label = lambda index, *args: (index not in [2, 3]) or owner()
+
+        self.pbReset = _FilteredSignal(funcProgress.pbReset, owner)
+        self.pbSetValues = _FilteredSignal(funcProgress.pbSetValues, owner)
+        self.pbSetMaximum = _FilteredSignal(funcProgress.pbSetMaximum, owner)
+        self.lblSetValue = _FilteredSignal(funcProgress.lblSetValue, label)
+
+
+class _FilteredSignal:
+    """emit signal only if the filter allows it"""
+
+    def __init__(self, signal, allow):
+        self.signal = signal
+        self.allow = allow
+
+    def emit(self, *args):
+        if self.allow(*args):
+            self.signal.emit(*args)
+
+
 def jobsWorker(
     jobsQueue,
     output,
@@ -46,37 +197,40 @@ def jobsWorker(
     funcProgress,
     controlQueue,
     trayIconMessageSignal,
+    workerID=0,
+    workerState=None,
     log=False,
 ):
     """
-    jobsWorker execute jobs on queue
+    jobsWorker execute jobs on queue. More than one worker can run at the same
+    time every worker takes the next job on queue until it is empty.
 
     Args:
         jobsQueue (jobsQueue): Job queue has all related information for the job
         funcProgress (func): function to call to report job progress. Defaults to None.
+        controlQueue (deque): queue with the control requests for the worker
+        workerID (int): worker identification. Defaults to 0.
+        workerState (JobsWorkerState): state shared by workers in the pool.
+            Defaults to None.
 
     Returns:
         str: Dummy  return value
     """
 
     #
-    # Always open to start saving in mid of worker operating
+    # Always open to start saving in mid of worker operating the jobs are
+    # saved by the history writer thread
     #
-    jobsDB = SqlJobsTable(config.data.get(config.ConfigKey.SystemDB))
+    jobsDB = SqlJobsTable.shared()
 
-    if jobsWorker.running:
-        # Block direct calls while working there should be none
-        return "Working..."
+    if workerState is None:
+        workerState = JobsWorkerState(len(jobsQueue), funcProgress.lbl[4])
 
-    jobsWorker.running = True
-    totalJobs = len(jobsQueue)
-    remainingJobs = totalJobs - 1
-    currentJob = 0
+    poolMode = workerState.workers > 1
+    funcProgress = WorkerProgress(funcProgress, workerState, workerID)
     indexTotal = [0, 0]
     verify = mkv.VerifyStructure(log=log)
     iVerify = mkv.IVerifyStructure()
-    totalErrors = funcProgress.lbl[4]
-    abortAll = False
     bSimulateRun = config.data.get(config.ConfigKey.SimulateRun)
     model = proxyModel.sourceModel()
 
@@ -89,19 +243,12 @@ def jobsWorker(
         ]
         statusIndex = model.index(job.jobRowNumber, JobKey.Status)
 
-        if abortAll:
+        if workerState.abortAll:
             jobsQueue.statusUpdateSignal.emit(job, JobStatus.Aborted)
             continue
 
-        actualRemaining = len(jobsQueue)
-
-        if actualRemaining == remainingJobs:
-            remainingJobs -= 1
-        else:
-            totalJobs = totalJobs + actualRemaining - remainingJobs
-            remainingJobs = actualRemaining - 1
-
-        currentJob += 1
+        currentJob, totalJobs = workerState.nextJob(len(jobsQueue))
+        jobsQueue.controlQueue.setJob(workerID, job.jobRowNumber)
         indexTotal[0] = 0  # file index
         indexTotal[1] = 0  # current max progress bar
         totalFiles = 0
@@ -126,22 +273,30 @@ def jobsWorker(
         removed = bool(statusIndex.row() in proxyModel.filterConditions["Remove"])
         if removed:
             jobsQueue.statusUpdateSignal.emit(job, JobStatus.Removed)
+            workerState.releaseProgress(workerID)
             continue
 
         # Check Job Status for Skip
         status = model.dataset[statusIndex.row(), statusIndex.column()]
         if status in [JobStatus.Removed, JobStatus.Skip]:
             jobsQueue.statusUpdateSignal.emit(job, JobStatus.Skipped)
+            workerState.releaseProgress(workerID)
             continue
 
         jobsQueue.statusUpdateSignal.emit(job, JobStatus.Running)
-        cli = RunCommand(
+        lineState = {
+            "printPercent": False,
+            "counting": False,
+            "count": 0,
+            "prefix": f"[{job.jobRow[JobKey.ID]}] " if poolMode else "",
+        }
+        cli = ChunkedRunCommand(
             processLine=displayRunJobs,
-            processArgs=[job, output, indexTotal],
+            processArgs=[job, output, indexTotal, lineState],
             processKWArgs={"funcProgress": funcProgress},
             controlQueue=controlQueue,
             commandShlex=True,
-            universalNewLines=False,
+            timeout=config.data.get(config.ConfigKey.CommandTimeout),
             log=log,
         )
 
@@ -155,7 +310,7 @@ def jobsWorker(
 
             if config.data.get(config.ConfigKey.JobsAutoSave):
                 job.jobRow[JobKey.Status] = JobStatus.Running
-                saveToDb(job)
+                HistoryWriter.historyWriter().save(job)
 
             dt = datetime.fromtimestamp(job.startTime)
 
@@ -178,6 +333,9 @@ def jobsWorker(
             output.job.emit(msg, msgArgs)
             job.output.append([msg, msgArgs])
             exitStatus = "ended"
+            jobEvent(
+                "jobStarted", jobID=job.jobRow[JobKey.ID], workerID=workerID,
+                algorithm=algorithm, commands=totalFiles)
 
             #if log:
             #    MODULELOG.debug("RJB0005: Job ID: %s started.",
@@ -189,8 +347,47 @@ def jobsWorker(
                 output.job.emit("Generating commands...\n", {"appendEnd": True})
                 job.oCommand.generateCommands()
 
+            # register job to resume it if application ends
+            startCheckpoints(jobsDB, job)
+            if job.checkpoints:
+                # the commands completed on the run resumed are registered
+                # again before the checkpoints of that run are removed
+                for index, checkpoint in job.checkpoints.items():
+                    addCheckpoint(jobsDB, job, index, *checkpoint)
+                if job.resumedID not in [None, job.jobRow[JobKey.ID]]:
+                    removeCheckpoints(jobsDB, job.resumedID)
+            incrementalRun = config.data.get(config.ConfigKey.IncrementalRun)
+            # commands as generated the manifest records them before any
+            # adjustment so the next run compares the same command
+            generatedCommands = {}
+
             errorOutputOpen = False
 
+            waitAborted = False
+            scheduler = jobsQueue.deviceScheduler
+            commandPool = None
+            commandsWorkers = (
+                getattr(job, "commandsWorkers", None)
+                or config.data.get(config.ConfigKey.CommandsWorkers)
+                or 1
+            )
+            if (commandsWorkers > 1) and (not bSimulateRun) and (totalFiles > 1):
+                commandPool = CommandPool(
+                    commandsWorkers,
+                    job,
+                    output,
+                    funcProgress,
+                    controlQueue,
+                    funcEnd=lambda i, f, rc, timedOut, result: commandEnded(
+                        jobsDB, job, i, f, rc, output, log, timedOut, result,
+                        generatedCommands.get(i) if incrementalRun else None),
+                    eventFields={"jobID": job.jobRow[JobKey.ID]},
+                    scheduler=scheduler,
+                    timeout=config.data.get(config.ConfigKey.CommandTimeout),
+                    baseProgress=indexTotal[1],
+                    log=log,
+                )
+
             for (
                 index,
                 (cmd, baseFiles, sourceFiles, destinationFile, _, _, _),
@@ -215,12 +412,21 @@ def jobsWorker(
                         status = JobStatus.Abort
                         exitStatus = queueStatus
                         if queueStatus == JobStatus.Abort:
-                            abortAll = True
-                        if f := job.oCommand[index - 1][3]:
-                            if f.is_file():
-                                f.unlink()
+                            workerState.abortAll = True
+                        if commandPool is None:
+                            if f := job.oCommand[index - 1][3]:
+                                if f.is_file():
+                                    f.unlink()
 
                 if status == JobStatus.Abort:
+                    if commandPool is not None:
+                        # stop and remove output of commands still running
+                        commandPool.abort(
+                            JobStatus.AbortJob
+                            if exitStatus == "ended" else exitStatus
+                        )
+                        commandPool.join()
+                        commandPool = None
                     jobsQueue.statusUpdateSignal.emit(job, JobStatus.Aborted)
                     job.jobRow[JobKey.Status] = JobStatus.Aborted
                     updateStatus = False
@@ -229,21 +435,57 @@ def jobsWorker(
                     job.endTime = time()
                     if config.data.get(config.ConfigKey.JobsAutoSave):
                         job.jobRow[JobKey.Status] = JobStatus.Aborted
-                        saveToDb(job, update=True)
+                        HistoryWriter.historyWriter().save(job, update=True)
                     break
 
-                iVerify.verifyStructure(job.oCommand, index)
+                if (checkpoint := job.checkpoints.get(index)) and (
+                        (doneFile := checkpointFile(*checkpoint)) is not None):
+                    # command completed on previous run of job
+                    msg = (
+                        f"Destination File: {destinationFile}\n"
+                        f"Completed on previous run: {doneFile}\n\n"
+                    )
+                    msgArgs = {"color": SvgColor.cyan, "appendEnd": True}
+                    output.job.emit(msg, msgArgs)
+                    job.output.append([msg, msgArgs])
+                    addCheckpoint(jobsDB, job, index, *checkpoint)
+                    job.statistics["resumed"] += 1
+                    jobEvent(
+                        "commandSkipped", jobID=job.jobRow[JobKey.ID],
+                        index=index, reason="resumed", file=doneFile)
+                    indexTotal[1] += 100
+                    indexTotal[0] += 1
+                    if commandPool is not None:
+                        commandPool.addProgress()
+                    else:
+                        funcProgress.pbSetValues.emit(0, indexTotal[1])
+                    continue
+
+                if incrementalRun and (
+                        (doneFile := outputUpToDate(
+                            jobsDB, cmd, baseFiles, sourceFiles,
+                            destinationFile)) is not None):
+                    # output produced by the same command is up to date
+                    msg = (
+                        f"Destination File: {destinationFile}\n"
+                        f"Up to date skipped: {doneFile}\n\n"
+                    )
+                    msgArgs = {"color": SvgColor.cyan, "appendEnd": True}
+                    output.job.emit(msg, msgArgs)
+                    job.output.append([msg, msgArgs])
+                    job.statistics["skipped"] += 1
+                    jobEvent(
+                        "commandSkipped", jobID=job.jobRow[JobKey.ID],
+                        index=index, reason="upToDate", file=doneFile)
+                    indexTotal[1] += 100
+                    indexTotal[0] += 1
+                    if commandPool is not None:
+                        commandPool.addProgress()
+                    else:
+                        funcProgress.pbSetValues.emit(0, indexTotal[1])
+                    continue
 
                 if log:
-                    #msg = (
-                    #    "Command: {}  Base Files: {} "
-                    #    "Source Files: {} Destination File: {}"
-                    #)
-                    #msg = msg.format(
-                    #    cmd,
-                    #    baseFiles,
-                    #    sourceFiles,
-                    #    destinationFile)
                     msg = (
                         f"Command: {cmd}  Base Files: {baseFiles} "
                         f"Source Files: {sourceFiles} "
@@ -251,58 +493,37 @@ def jobsWorker(
                     )
                     MODULELOG.debug("RJB0006: %s", msg)
 
+                generatedCommands[index] = cmd
+
                 #
                 # New Algorithm
                 #
-                runJob = bool(iVerify)
+                runJob, cmd, msg, adjusted = verifyCommand(
+                    iVerify, job.oCommand, index, cmd, algorithm,
+                    jobID=job.jobRow[JobKey.ID])
 
-                if algorithm >= 1:
-                    if not iVerify:
-                        rc, confidence = mkv.adjustSources(
-                            job.oCommand, index, algorithm
-                        )
-                        runJob = rc
-                        if rc:
-                            _, shellCommand = job.oCommand.generateCommandByIndex(
-                                index, update=True
-                            )
-                            originalCmd = cmd
-                            cmd = shellCommand
-                            msg = (
-                                f"Warning command adjusted - confidence "
-                                f"{confidence}:\n\n"
-                                f"Original: {originalCmd}\n"
-                                f"     New: {cmd}\n"
-                            )
-                            if log:
-                                MODULELOG.warning("RJB0011: %s", msg)
-                        else:
-                            msg = (
-                                f"Warning command failed adjustment:\n\n"
-                                f"Command: {cmd}\n"
-                            )
-                        if not errorOutputOpen:
-                            markErrorOutput(job, output, start=True)
-                            errorOutputOpen = True
-
-                        msgArgs = {
-                            "color": SvgColor.yellowgreen,
-                            "appendEnd": True,
-                            "log": False}
-                        output.job.emit(msg, msgArgs)
-                        output.error.emit(
-                            msg + "\n", msgArgs
-                        )
-                        job.output.append([msg, msgArgs])
-                        job.errors.append(
-                            [msg + "\n", msgArgs]
-                        )
-                        if rc:
-                            if log:
-                                MODULELOG.warning("RJB0011: %s", msg)
+                if msg is not None:
+                    if not errorOutputOpen:
+                        markErrorOutput(job, output, start=True)
+                        errorOutputOpen = True
+
+                    msgArgs = {
+                        "color": SvgColor.yellowgreen,
+                        "appendEnd": True,
+                        "log": False}
+                    output.job.emit(msg, msgArgs)
+                    output.error.emit(
+                        msg + "\n", msgArgs
+                    )
+                    job.output.append([msg, msgArgs])
+                    job.errors.append(
+                        [msg + "\n", msgArgs]
+                    )
+                    if log:
+                        if adjusted:
+                            MODULELOG.warning("RJB0011: %s", msg)
                         else:
-                            if log:
-                                MODULELOG.warning("RJB0012: %s", msg)
+                            MODULELOG.warning("RJB0012: %s", msg)
                 if runJob:
                     ###
                     # Execute cmd
@@ -325,17 +546,42 @@ def jobsWorker(
 
                     if bSimulateRun:
                         dummyRunCommand(funcProgress, indexTotal, controlQueue)
+                    elif commandPool is not None:
+                        # an abort request received while waiting is
+                        # processed at the start of next iteration or
+                        # after the loop
+                        commandPool.submit(
+                            index, cmd, destinationFile, sourceFiles)
                     else:
-                        # TODO: queue to control execution of running job inside
-                        # the RunCommand test current configuration
-                        cli.command = cmd
-                        cli.run()
-                        crc(destinationFile, output, log)
+                        devices = scheduler.devices(sourceFiles, destinationFile)
+                        if scheduler.acquire(
+                                devices, cancel=lambda: bool(controlQueue)):
+                            try:
+                                cli.command = cmd
+                                cli.eventFields = {
+                                    "jobID": job.jobRow[JobKey.ID],
+                                    "index": index,
+                                    "destinationFile": destinationFile,
+                                }
+                                runCommand(cli)
+                            finally:
+                                scheduler.release(devices)
+                            commandEnded(
+                                jobsDB, job, index, destinationFile, cli.rc,
+                                output, log, cli.timedOut, cli.result,
+                                generatedCommands[index]
+                                if incrementalRun else None)
+                        else:
+                            # abort request received while waiting for the
+                            # devices is processed at the start of next
+                            # iteration or after the loop
+                            waitAborted = True
 
                 else:
                     job.errors.append(iVerify.analysis)
-                    totalErrors += 1
-                    funcProgress.lblSetValue.emit(4, totalErrors)
+                    funcProgress.lblSetValue.emit(4, workerState.addError())
+                    if commandPool is not None:
+                        commandPool.addProgress()
                     if not errorOutputOpen:
                         markErrorOutput(job, output, start=True)
                         errorOutputOpen = True
@@ -373,8 +619,23 @@ def jobsWorker(
                         MODULELOG.error("RJB0008: Structure check failed")
                 indexTotal[1] += 100
                 indexTotal[0] += 1
+                # command boundary show pending output
+                output.flush()
                 # End for loop for jobs in job.oCommand
 
+            if ((commandPool is not None) and (not commandPool.join())) or (
+                    waitAborted and controlQueue):
+                # abort request received while last commands were running or
+                # waiting
+                exitStatus = (
+                    controlQueue.popleft() if controlQueue else JobStatus.AbortJob
+                )
+                if exitStatus == JobStatus.Abort:
+                    workerState.abortAll = True
+                updateStatus = False
+                job.jobRow[JobKey.Status] = JobStatus.Aborted
+                jobsQueue.statusUpdateSignal.emit(job, JobStatus.Aborted)
+
             if errorOutputOpen:
                 # Mark any error output end
                 markErrorOutput(job, output, start=False)
@@ -394,12 +655,25 @@ def jobsWorker(
                 f"Job ID: {job.jobRow[JobKey.ID]} {exitStatus} - "
                 f"date {dtEnd.isoformat()} - "
                 f"running time {strFormatTimeDelta(dtDuration)}.\n"
+                f"Commands run {job.statistics['commands']} - "
+                f"up to date skipped {job.statistics['skipped']} - "
+                f"resumed {job.statistics['resumed']}.\n"
             )
 
+            msg += jobMetricsSummary(job)
             msg += "*******************\n\n\n"
             msgArgs = {"color": SvgColor.cyan, "appendEnd": True}
             output.job.emit(msg, msgArgs)
             job.output.append([msg, msgArgs])
+            saveJobMetrics(HistoryWriter.historyWriter(), job)
+            # job boundary show pending output
+            output.flush()
+            job.output.flush()
+            job.errors.flush()
+            jobEvent(
+                "jobEnded", jobID=job.jobRow[JobKey.ID], status=exitStatus,
+                seconds=round(job.endTime - job.startTime, 3),
+                **job.statistics)
             msg = (
                 f"Job ID: {job.jobRow[JobKey.ID]} {exitStatus}\n"
                 f"runtime {strFormatTimeDelta(dtDuration)}"
@@ -412,16 +686,18 @@ def jobsWorker(
             if config.data.get(config.ConfigKey.JobHistory):
                 if updateStatus:
                     job.jobRow[JobKey.Status] = JobStatus.Done
-                saveToDb(job, update=True)
+                HistoryWriter.historyWriter().save(job, update=True)
             model.dataset.data[job.jobRowNumber][JobKey.Status].obj = job
+            removeCheckpoints(jobsDB, job.jobRow[JobKey.ID])
             if updateStatus:
                 jobsQueue.statusUpdateSignal.emit(job, JobStatus.Done)
+            workerState.releaseProgress(workerID)
             #if log:
             #    MODULELOG.debug("RJB0009: Job ID: %s finished.",
             #                    job.jobRow[JobKey.ID])
         else:
-            totalErrors += 1
-            funcProgress.lblSetValue.emit(4, totalErrors)
+            funcProgress.lblSetValue.emit(4, workerState.addError())
+            workerState.releaseProgress(workerID)
             msg = (
                 f"Job ID: {job.jobRow[JobKey.ID]} cannot execute command.\n\n"
                 f"Command: {job.oCommand.command}\n"
@@ -430,23 +706,46 @@ def jobsWorker(
             output.error.emit(msg, msgArgs)
             job.errors.append([msg, msgArgs])
             jobsQueue.statusUpdateSignal.emit(job, JobStatus.Error)
+            jobEvent(
+                "jobEnded", jobID=job.jobRow[JobKey.ID],
+                status=JobStatus.Error)
             if log:
                 MODULELOG.debug(
                     "RJB0010: Job ID: %s cannot execute command: %s.",
                     job.jobRow[JobKey.ID],
                     job.oCommand.command,
                 )
-    jobsDB.close()
-    for index in range(4):
-        funcProgress.lblSetValue.emit(index, 0)
-    funcProgress.pbSetMaximum.emit(100, 100)
-    funcProgress.pbSetValues.emit(0, 100)
-    funcProgress.pbReset.emit()
-    jobsWorker.running = False
+    # the worker thread ends with the connection
+    SqlJobsTable.shutdown()
+    jobsQueue.controlQueue.setJob(workerID, None)
+    workerState.releaseProgress(workerID)
+    if workerState.workerEnded() and workerState.claimProgress(workerID):
+        for index in range(4):
+            funcProgress.lblSetValue.emit(index, 0)
+        funcProgress.pbSetMaximum.emit(100, 100)
+        funcProgress.pbSetValues.emit(0, 100)
+        funcProgress.pbReset.emit()
+        workerState.releaseProgress(workerID)
 
     return "Job queue empty."
 
 
+@profiled()
+def runCommand(cli):
+    """
+    runCommand execute command of a job. This is the unit profiled when
+    profiling is on the worker waiting for the next job is not.
+
+    Args:
+        **cli** (ChunkedRunCommand): command to execute
+
+    Returns:
+        bool: True if the command was executed
+    """
+
+    return cli.run()
+
+
 def dummyRunCommand(funcProgress, indexTotal, controlQueue):
     """
     dummyRunCommand dummy run job function
@@ -473,7 +772,68 @@ def dummyRunCommand(funcProgress, indexTotal, controlQueue):
                 break
 
 
-def crc(destinationFile, output, log):
+def commandEnded(
+        jobsDB, job, index, destinationFile, rc, output, log, timedOut=False,
+        result=None, manifestCommand=None):
+    """
+    commandEnded record the resources used by the command, the command
+    completed, its output in the manifest for incremental runs and add CRC to
+    file name. The incomplete output of a command stopped by the timeout is
+    removed.
+
+    Args:
+        **jobsDB** (SqlJobsTable): database for checkpoints
+
+        **job** (JobInfo): job running
+
+        **index** (int): index of command in job
+
+        **destinationFile** (Path): output file of command
+
+        **rc** (int): command return code
+
+        **output** (OutputWindows): give access to the output widgets
+
+        **log** (bool): log operations
+
+        **timedOut** (bool, optional): command was stopped because it ran
+        longer than ConfigKey.CommandTimeout. Defaults to False.
+
+        **result** (CommandResult, optional): result with the resources used
+        by the command. Defaults to None.
+
+        **manifestCommand** (str, optional): command as generated before any
+        adjustment to record in the manifest. Defaults to None the manifest
+        is not updated, incremental runs are off.
+    """
+
+    job.statistics["commands"] += 1
+    recordCommandMetrics(HistoryWriter.historyWriter(), job, index, result)
+    if timedOut:
+        if destinationFile and destinationFile.is_file():
+            destinationFile.unlink()
+        msg = (
+            f"Destination File: {destinationFile}\n"
+            f"Command stopped running longer than "
+            f"{config.data.get(config.ConfigKey.CommandTimeout)} seconds\n\n"
+        )
+        msgArgs = {"color": SvgColor.red, "appendEnd": True}
+        output.job.emit(msg, msgArgs)
+        output.error.emit(msg, msgArgs)
+        job.output.append([msg, msgArgs])
+        job.errors.append([msg, msgArgs])
+        if log:
+            MODULELOG.error("RJB0014: Command timeout %s", destinationFile)
+        return
+    # mkvmerge return code 1 are warnings the output file is complete
+    if rc in [0, 1]:
+        addCheckpoint(jobsDB, job, index, destinationFile)
+        if manifestCommand is not None:
+            updateManifest(jobsDB, manifestCommand, destinationFile)
+    crc(destinationFile, output, log, job.jobRow[JobKey.ID])
+
+
+def crc(destinationFile, output, log, jobID=None):
     """
     TODO: make this per job
     """
@@ -483,6 +843,7 @@ def crc(destinationFile, output, log):
             computeCRC32,
             output=output,
             sourceFile=destinationFile,
+            jobID=jobID,
             log=log
         )
         crcWorker.start()
@@ -527,72 +888,67 @@ def markErrorOutput(job, output, start=True):
     #output.job.emit(msg, kwargs)
 
 
-@staticVars(printPercent=False, counting=False, count=0, line="")
 def displayRunJobs(
-    ch, job, output, indexTotal, funcProgress=None
+    line, job, output, indexTotal, lineState, funcProgress=None
 ):  # pylint: disable=invalid-name
     """
     Convenience function used by jobsWorker to display lines of the mkvmerge
-    execution.  The function interprets the input to recognize the lines.
-    Also returns the constructed line or None.
+    execution.  The function interprets the lines received from
+    ChunkedRunCommand a line ends with a new line or with %. Also returns the
+    line displayed.
 
     Args:
-        ch (str): characters to display
+        line (str): line to display
+        lineState (dict): display state of the running job. Every job has its
+            own.
     """
 
-    if ch == "\n":
-        displayRunJobs.line += ch
-    elif ch == "%":
-        displayRunJobs.line += "%"
-    else:
-        displayRunJobs.line += ch
-        return None
-
-    regEx = re.compile(r":\W*(\d+)\%$")
     funcProgress.lblSetValue.emit(2, indexTotal[0] + 1)
     n = -1
 
-    job.output.append([displayRunJobs.line, {}])
+    job.output.append([line, {}])
 
-    if m := regEx.search(displayRunJobs.line):
+    if m := PROGRESSREGEX.search(line):
         n = int(m.group(1))
 
-    if displayRunJobs.printPercent:
-        if displayRunJobs.line == "\n":
-            displayRunJobs.line = ""
+    if lineState["printPercent"]:
+        if line == "\n":
             return "\n"
 
     if n >= 0:
-        if not displayRunJobs.printPercent:
+        if not lineState["printPercent"]:
             # output.job.emit("", {})
-            displayRunJobs.printPercent = True
+            lineState["printPercent"] = True
             # job.output.append(["", {}])  # Test Line
 
-        displayRunJobs.line = displayRunJobs.line.strip()
+        line = line.strip()
 
-        output.job.emit(displayRunJobs.line, {"replaceLine": True})
+        if not lineState["prefix"]:
+            # with jobs running in parallel replacing the last line would
+            # overwrite the output of other jobs
+            output.job.emit(line, {"replaceLine": True})
         funcProgress.pbSetValues.emit(n, indexTotal[1] + n)
-        displayRunJobs.line += "\n"
+        line += "\n"
     else:
-        if displayRunJobs.printPercent:
-            output.job.emit("\n", {})
-            displayRunJobs.printPercent = False
-            displayRunJobs.counting = True
-            displayRunJobs.count = 0
-        if displayRunJobs.counting:
-            displayRunJobs.count += 1
-        output.job.emit(displayRunJobs.line[:-1], {"appendLine": True})
-
-    if displayRunJobs.count == 2:
-        displayRunJobs.count = 0
-        displayRunJobs.printPercent = False
-        displayRunJobs.counting = False
+        if lineState["printPercent"]:
+            if not lineState["prefix"]:
+                output.job.emit("\n", {})
+            lineState["printPercent"] = False
+            lineState["counting"] = True
+            lineState["count"] = 0
+        if lineState["counting"]:
+            lineState["count"] += 1
+        output.job.emit(
+            lineState["prefix"] + (line[:-1] if line.endswith("\n") else line),
+            {"appendLine": True}
+        )
+
+    if lineState["count"] == 2:
+        lineState["count"] = 0
+        lineState["printPercent"] = False
+        lineState["counting"] = False
         output.job.emit("\n\n", {})
         # job.output.append(["\n\n", {}]) hack cannot find the read difference
         job.output.append(["\n", {}])
 
-    # clear processed line
-    line = displayRunJobs.line
-    displayRunJobs.line = ""
-
     return line
@@ -0,0 +1,133 @@
+"""
+outputManifest record the outputs of successful commands to skip the
+commands whose output is up to date
+"""
+
+import json
+import logging
+import shlex
+import subprocess
+
+from pathlib import Path
+
+from .. import config
+
+from .jobsDB import checkpointFile
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+def trackStructure(cmd, fileName):
+    """
+    trackStructure read the tracks of a file using the mkvmerge of the command
+
+    Args:
+        **cmd** (str): command that produced the file
+
+        **fileName** (Path): file to identify
+
+    Returns:
+        str: json list with type, codec and language of every track. None if
+        the file could not be identified.
+    """
+
+    try:
+        mkvmerge = shlex.split(cmd)[0]
+        result = subprocess.run(
+            [mkvmerge, "-J", str(fileName)],
+            capture_output=True,
+            check=False,
+            text=True,
+            timeout=60,
+        )
+        info = json.loads(result.stdout)
+    except (IndexError, OSError, ValueError, subprocess.SubprocessError) as e:
+        MODULELOG.debug("OMF0001: Identify error %s - %s", fileName, e)
+        return None
+
+    tracks = [
+        [
+            track.get("type", ""),
+            track.get("codec", ""),
+            track.get("properties", {}).get("language", ""),
+        ]
+        for track in info.get("tracks", [])
+    ]
+
+    return json.dumps(tracks)
+
+
+def updateManifest(database, cmd, destinationFile):
+    """
+    updateManifest record the output of a command that ended successfully
+
+    Args:
+        **database** (SqlJobsTable): system database
+
+        **cmd** (str): command executed as it was generated before any
+        adjustment, it is the command outputUpToDate compares
+
+        **destinationFile** (Path): output file of command
+    """
+
+    if config.data.get(config.ConfigKey.SimulateRun):
+        return
+
+    f = Path(destinationFile)
+    try:
+        stat = f.stat()
+    except OSError:
+        return
+
+    database.setManifest(
+        str(f), stat.st_size, stat.st_mtime, trackStructure(cmd, f), cmd)
+
+
+def outputUpToDate(database, cmd, baseFiles, sourceFiles, destinationFile):
+    """
+    outputUpToDate check if a command can be skipped. The output must exist,
+    be newer than all the files used by the command and match the size and
+    track structure recorded when the same command ended successfully. The
+    output could have been renamed with its CRC32.
+
+    Args:
+        **database** (SqlJobsTable): system database
+
+        **cmd** (str): command to execute
+
+        **baseFiles** (list): base files of the command
+
+        **sourceFiles** (list): source files of the command
+
+        **destinationFile** (Path): output file of command
+
+    Returns:
+        Path: output file if up to date. None otherwise.
+    """
+
+    if (manifest := database.manifest(str(destinationFile))) is None:
+        return None
+
+    size, tracks, manifestCmd = manifest
+    if (manifestCmd != cmd) or (tracks is None):
+        return None
+
+    if (outputFile := checkpointFile(destinationFile, size)) is None:
+        return None
+
+    outputTime = outputFile.stat().st_mtime
+    for f in list(baseFiles or []) + list(sourceFiles or []):
+        f = Path(f)
+        try:
+            # base files can include directories
+            if f.is_file() and (f.stat().st_mtime > outputTime):
+                return None
+        except OSError:
+            return None
+
+    if trackStructure(cmd, outputFile) != tracks:
+        return None
+
+    return outputFile
@@ -11,9 +11,11 @@ import os
 import platform
 import re
 import sys
+import threading
 
-from collections import deque
+from collections import Counter
 from pathlib import Path
+from time import perf_counter
 from typing import Optional
 
 from PySide6.QtCore import (
@@ -21,6 +23,7 @@ from PySide6.QtCore import (
     QEvent,
     QObject,
     Qt,
+    QTimer,
     Signal,
     Slot,
 )
@@ -64,7 +67,17 @@ from vsutillib.pyside6 import (
 
 from . import config
 from .dataset import TableData, tableHeaders
-from .jobs import JobQueue
+from .jobs import (
+    ControlQueue,
+    HistoryWriter,
+    JobEventLog,
+    JobKey,
+    JobQueue,
+    MetricsExporter,
+    metrics,
+    removeOldJobLogs,
+    SqlJobsTable,
+)
 from .models import (
     TableProxyModel,
     JobsTableModel,
@@ -77,6 +90,8 @@ from .utils import (
     executeMKVToolnix,
     OutputWindows,
     Progress,
+    StartupTimer,
+    startupTimingEnabled,
     Text,
     Translate,
     UiSetMessagesCatalog,
@@ -124,12 +139,20 @@ class MainWindow(QMainWindow):
 
         self.configuration(action=config.Action.Restore)
 
+        self._initMetrics()
+
         self.translate()
 
         self.setUnifiedTitleAndToolBarOnMac(True)
         self.trayIcon.show()
         self.show()
 
+        # the subprocesses are not in the startup path
+        self.mkvmergeProbe.start()
+
+        # jobs not finished when application ended
+        QTimer.singleShot(0, self.jobsTableView.resumeJobs)
+
     def _initVars(self) -> None:
 
         #
@@ -150,11 +173,13 @@ class MainWindow(QMainWindow):
 
         self.trayIcon: QSystemTrayIcon = QSystemTrayIconWidget(self, self.windowIcon())
 
-        self.setPreferences: QDialog = PreferencesDialogWidget(self)
-        #self.translateInterface.addFunction(self.setPreferences.retranslateUi)
+        # preferences dialog and log viewer are created when first used
+        self.__setPreferences: Optional[QDialog] = None
+        self.__logViewer: Optional[QWidget] = None
+
         self.activitySpinner: QWidget = QActivityIndicator(self)
 
-        self.controlQueue: deque = deque()
+        self.controlQueue: ControlQueue = ControlQueue()
 
         self.jobsQueue: JobQueue = JobQueue(
             self,
@@ -162,10 +187,13 @@ class MainWindow(QMainWindow):
             appDir=self.appDirectory
         )
 
-        # mkvmerge executables
+        # mkvmerge executables found after the window is shown
 
-        self.mkvmerge: Path = getMKVMerge()
-        self.mkvmergeEmbedded: Path = getMKVMergeEmbedded(self.appDirectory)
+        self.mkvmerge: Optional[Path] = None
+        self.mkvmergeEmbedded: Optional[Path] = None
+        self.mkvmergeVersions: tuple = (None, None)
+        self.mkvmergeProbe: threading.Thread = threading.Thread(
+            target=self._probeMKVMerge, name="mkvmergeProbe", daemon=True)
 
         # Model view
         headers: list[list] = tableHeaders()
@@ -192,9 +220,6 @@ class MainWindow(QMainWindow):
         # self.historyWidget = JobsHistoryViewWidget(self, groupTitle=_(Text.txt0130))
         # self.historyWidget.tableView.sortByColumn(0, Qt.DescendingOrder)
 
-        # Log view
-        self.logViewer: QWidget = LogViewerWidget()
-
         # Set output to contain output windows objects
         self.output: OutputWindows = OutputWindows(
             self.commandEntry.outputWindow,
@@ -214,6 +239,109 @@ class MainWindow(QMainWindow):
 
         self.progressSpin: QWidget = QProgressIndicator(self)
 
+        # jobs waiting to be saved in the history
+        self.historyLabel: QLabel = QLabel()
+        self.historyTimer: QTimer = QTimer(self)
+        self.historyTimer.setInterval(500)
+        self.historyTimer.timeout.connect(self._historyBacklog)
+
+    @property
+    def setPreferences(self) -> QDialog:
+        """preferences dialog created the first time is used"""
+
+        if self.__setPreferences is None:
+            self.__setPreferences = PreferencesDialogWidget(self)
+            self.translateInterface.addFunction(
+                self.__setPreferences.retranslateUi)
+            # Algorithm
+            self.__setPreferences.stateChangedAlgorithm.connect(
+                self.commandEntry.setDefaultAlgorithm)
+            # CRC
+            self.__setPreferences.stateChangedCRC.connect(
+                self.commandEntry.setDefaultCRC)
+
+        return self.__setPreferences
+
+    @property
+    def logViewer(self) -> QWidget:
+        """
+        log viewer created the first time is used as a hidden tab the records
+        logged before are kept in config.logViewer
+        """
+
+        if self.__logViewer is None:
+            self._createLogViewer()
+            self.__logViewer.tab = -1
+            self.__logViewer.tabWidget = self.tabs
+            self.__logViewer.title = _(Text.txt0149)
+
+        return self.__logViewer
+
+    def _createLogViewer(self) -> QWidget:
+
+        self.__logViewer = LogViewerWidget(
+            maxLines=config.data.get(config.ConfigKey.LogViewerLines))
+        self.__logViewer.setLogHandler(config.logViewer)
+
+        return self.__logViewer
+
+    def _probeMKVMerge(self) -> None:
+        """find mkvmerge executables and versions runs in mkvmergeProbe"""
+
+        self.mkvmerge = getMKVMerge()
+        self.mkvmergeEmbedded = getMKVMergeEmbedded(self.appDirectory)
+        self.mkvmergeVersions = (
+            getMKVMergeVersion(self.mkvmerge),
+            getMKVMergeVersion(self.mkvmergeEmbedded),
+        )
+
+    def _initMetrics(self) -> None:
+        """
+        publish the metrics when configured the queue depth is taken from the
+        jobs table when the metrics are rendered and a timer measures the
+        event loop lag
+        """
+
+        exporter = MetricsExporter.exporter()
+        if not exporter:
+            return
+
+        metrics.collector(
+            "jobs", "gauge", "Jobs in the jobs table by status.",
+            self._jobsByStatus)
+
+        self.lagInterval: float = 1.0
+        self.lagTime: float = perf_counter()
+        self.lagTimer: QTimer = QTimer(self)
+        self.lagTimer.setInterval(int(self.lagInterval * 1000))
+        self.lagTimer.timeout.connect(self._eventLoopLag)
+        self.lagTimer.start()
+
+        exporter.start()
+
+    def _jobsByStatus(self) -> list:
+        """jobs count by status for the metrics"""
+
+        statuses = Counter(
+            row[JobKey.Status].cell for row in list(self.tableData.data))
+
+        return [({"status": status}, count) for status, count in statuses.items()]
+
+    def _eventLoopLag(self) -> None:
+        """delay of the lag timer past its interval"""
+
+        now = perf_counter()
+        lag = max(0.0, now - self.lagTime - self.lagInterval)
+        self.lagTime = now
+        metrics.set("gui_event_loop_lag_seconds", round(lag, 4))
+
+    def _historyBacklog(self) -> None:
+        """show the jobs waiting to be saved in the history"""
+
+        backlog = HistoryWriter.historyWriter().backlog
+        self.historyLabel.setText(_("History pending") + f": {backlog}")
+        self.historyLabel.setVisible(backlog > 0)
+
     def _initHelper(self) -> None:
         # work in progress spin
         self.activitySpinner.displayedWhenStopped = True
@@ -228,8 +356,6 @@ class MainWindow(QMainWindow):
         self.jobsTableView.output = self.output
         self.jobsQueue.output = self.output
         self.commandEntry.outputWindow.setReadOnly(True)
-        self.jobsOutput.setReadOnly(True)
-        self.errorOutput.setReadOnly(True)
         #self.historyWidget.output.setReadOnly(True)
         self.jobsOutput.textChanged.connect(
             self.commandEntry.clearButtonState)
@@ -239,7 +365,6 @@ class MainWindow(QMainWindow):
         self.jobsQueue.proxyModel = self.proxyModel
 
         # Translation
-        self.translateInterface.addFunction(self.setPreferences.retranslateUi)
         self.translateInterface.addFunction(self.commandEntry.translate)
         self.translateInterface.addFunction(self.jobsTableView.translate)
         self.translateInterface.addFunction(self.rename.translate)
@@ -285,15 +410,11 @@ class MainWindow(QMainWindow):
         if config.data.get(config.ConfigKey.LogViewer):
             tabsList.append(
                 [
-                    self.logViewer,
+                    self._createLogViewer(),
                     _(Text.txt0149),
                     _(Text.txt0151),
                 ]
             )
-        else:
-            self.logViewer.tab = -1
-            self.logViewer.tabWidget = self.tabs
-            self.logViewer.title = _(Text.txt0149)
         self.tabs.addTabs(tabsList)
 
         # Signal connections
@@ -310,17 +431,6 @@ class MainWindow(QMainWindow):
         # tray Icon message
         self.trayIconMessageSignal.connect(self.trayIcon.showMessage)
 
-        # Algorithm
-        self.setPreferences.stateChangedAlgorithm.connect(
-            self.commandEntry.setDefaultAlgorithm)
-
-        # CRC
-        self.setPreferences.stateChangedCRC.connect(
-            self.commandEntry.setDefaultCRC)
-
-        # connect log viewer
-        config.logViewer.connect(self.logViewer.logMessage)
-
         # connect JobHistory and commandWidget may not implement
         #self.historyWidget.pasteCommandSignal.connect(self.commandWidget.updateCommand)
         #self.historyWidget.updateAlgorithmSignal.connect(
@@ -351,6 +461,13 @@ class MainWindow(QMainWindow):
         bAnswer = yesNoDialog(self, msg, title)
         if bAnswer:
             self.configuration(action=config.Action.Save)
+            # jobs saved before the application ends
+            HistoryWriter.historyWriter().flush()
+            if not config.data.get(config.ConfigKey.JobHistory):
+                # the output of jobs not in the history is not used again
+                for row in self.model.dataset.data:
+                    if (job := row[JobKey.Status].obj) is not None:
+                        job.removeLogs()
             event.accept()
         else:
             event.ignore()
@@ -381,7 +498,7 @@ class MainWindow(QMainWindow):
             self,
             shortcut=Text.txt0026,
             statusTip=Text.txt0051,
-            triggered=self.setPreferences.getPreferences
+            triggered=lambda: self.setPreferences.getPreferences()
         )
 
         icon = QIcon(QPixmap(":/images/cross.png"))
@@ -482,6 +599,9 @@ class MainWindow(QMainWindow):
     def createStatusbar(self) -> None:
 
         statusBar = QStatusBar()
+        statusBar.addWidget(self.historyLabel)
+        self.historyLabel.setVisible(False)
+        self.historyTimer.start()
         statusBar.addPermanentWidget(VerticalLine())
         statusBar.addPermanentWidget(self.jobsLabel)
         statusBar.addPermanentWidget(VerticalLine())
@@ -595,15 +715,17 @@ class MainWindow(QMainWindow):
         if tmpMatch := rePythonVersion.match(sys.version):
             pythonVersion = tmpMatch[1]
 
-        mkvSystem = getMKVMergeVersion(self.mkvmerge)
-        mkvEmbedded = getMKVMergeVersion(self.mkvmergeEmbedded)
-
         aboutMsg = (f"{config.APPNAME}: {config.VERSION}                   \n\n"
                     f"{_(Text.txt0002)}: {config.AUTHOR}\n"
                     f"{_(Text.txt0003)}: {config.EMAIL}\n\n"
-                    f"{_(Text.txt0004)}: {pythonVersion}\n\n"
-                    f"{_(Text.txt0067)}: {mkvSystem}\n"
-                    f"{_(Text.txt0068)}: {mkvEmbedded}\n")
+                    f"{_(Text.txt0004)}: {pythonVersion}\n")
+
+        # versions are probed after the window is shown they are left out
+        # until the probe ends
+        if not self.mkvmergeProbe.is_alive():
+            mkvSystem, mkvEmbedded = self.mkvmergeVersions
+            aboutMsg += (f"\n{_(Text.txt0067)}: {mkvSystem}\n"
+                         f"{_(Text.txt0068)}: {mkvEmbedded}\n")
 
         QMessageBox.about(self, config.APPNAME, aboutMsg)
 
@@ -626,8 +748,16 @@ def abort():
     QApplication.exit(1)  # pylint: disable=E1101
 
 
-def mainApp():
-    """Main function"""
+def mainApp(startTime: Optional[float] = None):
+    """
+    Main function
+
+    Args:
+        **startTime** (float, optional): perf_counter when the application
+        started for the startup measurement. Defaults to None.
+    """
+
+    importsTime = perf_counter()
 
     if platform.system() == "Windows":
         # with this the icon in the task bar will change to the one set
@@ -639,13 +769,30 @@ def mainApp():
 
     app = QApplication(sys.argv)
     config.init(app=app)
-    MainWindow()
+
+    startupTimer = None
+    if startupTimingEnabled():
+        startupTimer = StartupTimer(
+            importsTime if startTime is None else startTime)
+        startupTimer.mark("imports", importsTime)
+        startupTimer.mark("application")
+
+    mainWindow = MainWindow()
+
+    if startupTimer is not None:
+        startupTimer.mark("main window")
+        startupTimer.watch(mainWindow)
 
     # set Fusion style palette adjust for Linux disable button text
     setAppStyle(app)
 
     app.exec()
 
+    MetricsExporter.shutdown()
+    JobEventLog.shutdown()
+    HistoryWriter.shutdown()
+    SqlJobsTable.shutdown()
+    removeOldJobLogs()
     config.close()
 
 # This if for Pylance _() is not defined
@@ -0,0 +1,213 @@
+"""
+LogLinesModel log records with an index by level
+"""
+# LLM0001
+
+import logging
+
+from bisect import bisect_left
+from typing import Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QObject, Qt
+from PySide6.QtGui import QBrush, QColor
+
+from vsutillib.pyside6 import SvgColor
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+LEVELS = [
+    logging.DEBUG,
+    logging.INFO,
+    logging.WARNING,
+    logging.ERROR,
+    logging.CRITICAL,
+]
+
+LEVELCOLORS = {
+    logging.DEBUG: SvgColor.green,
+    logging.INFO: SvgColor.white,
+    logging.WARNING: SvgColor.yellow,
+    logging.ERROR: SvgColor.red,
+    logging.CRITICAL: SvgColor.orangered,
+}
+
+
+class LogLinesModel(QAbstractListModel):
+    """
+    LogLinesModel keeps the records shown by the log viewer.
+
+    For every level there is an index with the records of that level and
+    above. Changing the level shown with **setLevel** switches the index used
+    by the rows the records are not scanned again.
+
+    Only the last **maxLines** records are kept. The oldest records are
+    removed in blocks of a tenth of **maxLines**.
+
+    Args:
+        **parent** (QObject, optional): parent object. Defaults to None.
+
+        **maxLines** (int, optional): records kept 0 keep all. Defaults to
+        20000.
+    """
+
+    def __init__(
+            self,
+            parent: Optional[QObject] = None,
+            maxLines: int = 20000) -> None:
+        super().__init__(parent)
+
+        self.__records = []
+        self.__first = 0
+        self.__index = {level: [] for level in LEVELS}
+        self.__level = logging.DEBUG
+        self.__rows = self.__index[self.__level]
+        self.__brushes = {
+            level: QBrush(QColor(color))
+            for level, color in LEVELCOLORS.items()
+        }
+
+        self.maxLines = maxLines
+
+    @property
+    def level(self) -> int:
+        """
+        level lowest level shown
+
+        Returns:
+            int: logging level
+        """
+        return self.__level
+
+    def setLevel(self, level: int) -> None:
+        """
+        setLevel show records of level and above
+
+        Args:
+            **level** (int): logging level one of LEVELS
+        """
+
+        if (level == self.__level) or (level not in self.__index):
+            return
+
+        self.beginResetModel()
+        self.__level = level
+        self.__rows = self.__index[level]
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """QAbstractListModel.rowCount override"""
+
+        if parent.isValid():
+            return 0
+
+        return len(self.__rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """
+        QAbstractListModel.data override
+
+        Args:
+            **index** (QModelIndex): row requested
+
+            **role** (int, optional): Qt.DisplayRole for the text and
+            Qt.ForegroundRole for the color of the level. Defaults to
+            Qt.DisplayRole.
+
+        Returns:
+            str, QBrush: text or color of record
+        """
+
+        if (not index.isValid()) or (index.row() >= len(self.__rows)):
+            return None
+
+        levelNo, text = self.__records[self.__rows[index.row()] - self.__first]
+
+        if role == Qt.DisplayRole:
+            return text
+
+        if role == Qt.ForegroundRole:
+            return self.__brushes.get(_indexLevel(levelNo))
+
+        return None
+
+    def clear(self) -> None:
+        """
+        clear remove all records
+        """
+
+        self.beginResetModel()
+        self.__first += len(self.__records)
+        self.__records = []
+        for rows in self.__index.values():
+            rows.clear()
+        self.endResetModel()
+
+    def addRecords(self, records: list) -> None:
+        """
+        addRecords add log records
+
+        Args:
+            **records** (list): (level, text) records
+        """
+
+        if not records:
+            return
+
+        shown = sum(
+            1 for levelNo, _ in records if _indexLevel(levelNo) >= self.__level)
+        if shown:
+            first = len(self.__rows)
+            self.beginInsertRows(QModelIndex(), first, first + shown - 1)
+
+        recordNumber = self.__first + len(self.__records)
+        for record in records:
+            recordLevel = _indexLevel(record[0])
+            for level in LEVELS:
+                if level > recordLevel:
+                    break
+                self.__index[level].append(recordNumber)
+            self.__records.append(record)
+            recordNumber += 1
+
+        if shown:
+            self.endInsertRows()
+
+        self._trim()
+
+    def _trim(self) -> None:
+        """remove oldest records when over maxLines"""
+
+        if not self.maxLines:
+            return
+
+        excess = len(self.__records) - self.maxLines
+        if (excess <= 0) or (excess < self.maxLines // 10):
+            return
+
+        newFirst = self.__first + excess
+        for level, rows in self.__index.items():
+            if (cut := bisect_left(rows, newFirst)) == 0:
+                continue
+            if level == self.__level:
+                self.beginRemoveRows(QModelIndex(), 0, cut - 1)
+                del rows[:cut]
+                self.endRemoveRows()
+            else:
+                del rows[:cut]
+
+        del self.__records[:excess]
+        self.__first = newFirst
+
+
+def _indexLevel(levelNo):
+    """level in LEVELS for a record level custom levels go to the lower one"""
+
+    indexLevel = LEVELS[0]
+    for level in LEVELS:
+        if levelNo < level:
+            break
+        indexLevel = level
+
+    return indexLevel
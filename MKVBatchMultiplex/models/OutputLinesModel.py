@@ -0,0 +1,202 @@
+"""
+OutputLinesModel append only store for the lines of an output window
+"""
+# OLM0001
+
+import logging
+
+from typing import Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QObject, Qt
+from PySide6.QtGui import QBrush, QColor
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+TEXT, COLOR = range(2)
+
+
+class OutputLinesModel(QAbstractListModel):
+    """
+    OutputLinesModel keeps the lines sent to an output window. Every row is a
+    line with its color. Text is added with **insertText** using the same
+    arguments as QOutputTextWidget:
+
+        - color: color for the text
+        - replaceLine: replace last line used for progress updates
+        - appendLine: text starts a new line
+
+    Only the last **maxLines** lines are kept. The oldest lines are removed in
+    blocks of a tenth of **maxLines** so rows are not removed on every insert.
+
+    Args:
+        **parent** (QObject, optional): parent object. Defaults to None.
+
+        **maxLines** (int, optional): lines kept 0 keep all lines. Defaults to
+        100000.
+    """
+
+    def __init__(
+            self,
+            parent: Optional[QObject] = None,
+            maxLines: int = 100000) -> None:
+        super().__init__(parent)
+
+        self.__lines = []
+        self.__lineOpen = False
+        self.__brushes = {}
+        self.__maxLines = maxLines
+
+        self.removedLines = 0
+
+    @property
+    def maxLines(self) -> int:
+        """
+        maxLines lines kept 0 keep all
+
+        Returns:
+            int: maximum number of lines
+        """
+        return self.__maxLines
+
+    @maxLines.setter
+    def maxLines(self, value: int) -> None:
+        if isinstance(value, int) and value >= 0:
+            self.__maxLines = value
+            self._trim(force=True)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """QAbstractListModel.rowCount override"""
+
+        if parent.isValid():
+            return 0
+
+        return len(self.__lines)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """
+        QAbstractListModel.data override
+
+        Args:
+            **index** (QModelIndex): row requested
+
+            **role** (int, optional): Qt.DisplayRole for the text and
+            Qt.ForegroundRole for the color. Defaults to Qt.DisplayRole.
+
+        Returns:
+            str, QBrush: text or color of line
+        """
+
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        if row >= len(self.__lines):
+            return None
+
+        if role == Qt.DisplayRole:
+            return self.__lines[row][TEXT]
+
+        if role == Qt.ForegroundRole:
+            if (color := self.__lines[row][COLOR]) is not None:
+                return self._brush(color)
+
+        return None
+
+    def clear(self) -> None:
+        """
+        clear remove all lines
+        """
+
+        self.beginResetModel()
+        self.__lines = []
+        self.__lineOpen = False
+        self.removedLines = 0
+        self.endResetModel()
+
+    def lines(self) -> list:
+        """
+        lines text of all the lines
+
+        Returns:
+            list: lines text
+        """
+
+        return [line[TEXT] for line in self.__lines]
+
+    def insertText(self, text: str, msgArgs: Optional[dict] = None) -> None:
+        """
+        insertText add text to the model
+
+        Args:
+            **text** (str): text to add can contain more than one line
+
+            **msgArgs** (dict, optional): text arguments. Defaults to None.
+        """
+
+        msgArgs = {} if msgArgs is None else msgArgs
+        color = msgArgs.get("color", None)
+
+        if not text:
+            return
+
+        if msgArgs.get("appendLine", False):
+            self.__lineOpen = False
+
+        self._addPieces(
+            text.split("\n"), color, msgArgs.get("replaceLine", False))
+        self._trim()
+
+    def _addPieces(self, pieces, color, replaceLine):
+        """add lines the first piece goes to the open line"""
+
+        # text ending in new line leaves an empty last piece
+        lineOpen = pieces[-1] != ""
+        if not lineOpen:
+            pieces.pop()
+
+        if self.__lineOpen and pieces:
+            lastRow = len(self.__lines) - 1
+            line = self.__lines[lastRow]
+            if replaceLine:
+                line[TEXT] = pieces.pop(0)
+                line[COLOR] = color
+            else:
+                line[TEXT] += pieces.pop(0)
+                if line[COLOR] is None:
+                    line[COLOR] = color
+            index = self.index(lastRow)
+            self.dataChanged.emit(index, index)
+
+        if pieces:
+            first = len(self.__lines)
+            self.beginInsertRows(QModelIndex(), first, first + len(pieces) - 1)
+            self.__lines.extend([piece, color] for piece in pieces)
+            self.endInsertRows()
+
+        self.__lineOpen = lineOpen
+
+    def _trim(self, force=False):
+        """remove oldest lines when over maxLines"""
+
+        if not self.__maxLines:
+            return
+
+        excess = len(self.__lines) - self.__maxLines
+        if (excess <= 0) or ((not force) and (excess < self.__maxLines // 10)):
+            return
+
+        self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+        del self.__lines[:excess]
+        self.endRemoveRows()
+        self.removedLines += excess
+
+    def _brush(self, color):
+        """brush for color cached"""
+
+        if (brush := self.__brushes.get(color)) is None:
+            brush = QBrush(QColor(color))
+            self.__brushes[color] = brush
+
+        return brush
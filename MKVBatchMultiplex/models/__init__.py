@@ -4,3 +4,5 @@ model package imports
 
 from .TableModel import TableModel, TableProxyModel
 from .JobsTableModel import JobsTableModel
+from .OutputLinesModel import OutputLinesModel
+from .LogLinesModel import LogLinesModel
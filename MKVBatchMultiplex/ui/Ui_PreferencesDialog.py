@@ -24,19 +24,19 @@ class Ui_PreferencesDialog(object):
     def setupUi(self, PreferencesDialog):
         if not PreferencesDialog.objectName():
             PreferencesDialog.setObjectName(u"PreferencesDialog")
-        PreferencesDialog.resize(744, 525)
+        PreferencesDialog.resize(744, 563)
         font = QFont()
         font.setPointSize(14)
         PreferencesDialog.setFont(font)
         PreferencesDialog.setContextMenuPolicy(Qt.DefaultContextMenu)
         self.btnBox = QDialogButtonBox(PreferencesDialog)
         self.btnBox.setObjectName(u"btnBox")
-        self.btnBox.setGeometry(QRect(460, 450, 241, 34))
+        self.btnBox.setGeometry(QRect(460, 488, 241, 34))
         self.btnBox.setOrientation(Qt.Horizontal)
         self.btnBox.setStandardButtons(QDialogButtonBox.Cancel|QDialogButtonBox.Ok)
         self.grpBox = QGroupBox(PreferencesDialog)
         self.grpBox.setObjectName(u"grpBox")
-        self.grpBox.setGeometry(QRect(30, 40, 681, 381))
+        self.grpBox.setGeometry(QRect(30, 40, 681, 419))
         self.lblInterfaceLanguage = QLabel(self.grpBox)
         self.lblInterfaceLanguage.setObjectName(u"lblInterfaceLanguage")
         self.lblInterfaceLanguage.setGeometry(QRect(21, 42, 172, 23))
@@ -45,7 +45,7 @@ class Ui_PreferencesDialog(object):
         self.fcmbBoxFontFamily.setGeometry(QRect(199, 82, 381, 29))
         self.chkBoxRestoreWindowSize = QCheckBox(self.grpBox)
         self.chkBoxRestoreWindowSize.setObjectName(u"chkBoxRestoreWindowSize")
-        self.chkBoxRestoreWindowSize.setGeometry(QRect(20, 326, 641, 27))
+        self.chkBoxRestoreWindowSize.setGeometry(QRect(20, 326, 311, 27))
         self.label = QLabel(self.grpBox)
         self.label.setObjectName(u"label")
         self.label.setGeometry(QRect(203, 46, 16, 23))
@@ -78,6 +78,22 @@ class Ui_PreferencesDialog(object):
         self.rbTwo = QRadioButton(self.frame)
         self.rbTwo.setObjectName(u"rbTwo")
         self.rbTwo.setGeometry(QRect(230, 0, 41, 41))
+        self.lblJobsWorkers = QLabel(self.frame)
+        self.lblJobsWorkers.setObjectName(u"lblJobsWorkers")
+        self.lblJobsWorkers.setGeometry(QRect(300, 0, 71, 41))
+        self.spinBoxJobsWorkers = QSpinBox(self.frame)
+        self.spinBoxJobsWorkers.setObjectName(u"spinBoxJobsWorkers")
+        self.spinBoxJobsWorkers.setGeometry(QRect(370, 6, 61, 29))
+        self.spinBoxJobsWorkers.setMinimum(1)
+        self.spinBoxJobsWorkers.setMaximum(16)
+        self.lblCommandsWorkers = QLabel(self.frame)
+        self.lblCommandsWorkers.setObjectName(u"lblCommandsWorkers")
+        self.lblCommandsWorkers.setGeometry(QRect(450, 0, 111, 41))
+        self.spinBoxCommandsWorkers = QSpinBox(self.frame)
+        self.spinBoxCommandsWorkers.setObjectName(u"spinBoxCommandsWorkers")
+        self.spinBoxCommandsWorkers.setGeometry(QRect(560, 6, 61, 29))
+        self.spinBoxCommandsWorkers.setMinimum(1)
+        self.spinBoxCommandsWorkers.setMaximum(8)
         self.chkBoxComputeCRC = QCheckBox(self.grpBox)
         self.chkBoxComputeCRC.setObjectName(u"chkBoxComputeCRC")
         self.chkBoxComputeCRC.setGeometry(QRect(21, 198, 641, 27))
@@ -87,9 +103,18 @@ class Ui_PreferencesDialog(object):
         self.chkBoxUseEmbedded = QCheckBox(self.grpBox)
         self.chkBoxUseEmbedded.setObjectName(u"chkBoxUseEmbedded")
         self.chkBoxUseEmbedded.setGeometry(QRect(20, 288, 641, 27))
+        self.chkBoxShortestJobFirst = QCheckBox(self.grpBox)
+        self.chkBoxShortestJobFirst.setObjectName(u"chkBoxShortestJobFirst")
+        self.chkBoxShortestJobFirst.setGeometry(QRect(20, 364, 311, 27))
+        self.chkBoxIncrementalRun = QCheckBox(self.grpBox)
+        self.chkBoxIncrementalRun.setObjectName(u"chkBoxIncrementalRun")
+        self.chkBoxIncrementalRun.setGeometry(QRect(340, 364, 321, 27))
+        self.chkBoxProfiling = QCheckBox(self.grpBox)
+        self.chkBoxProfiling.setObjectName(u"chkBoxProfiling")
+        self.chkBoxProfiling.setGeometry(QRect(340, 326, 321, 27))
         self.btnRestoreDefaults = QPushButton(PreferencesDialog)
         self.btnRestoreDefaults.setObjectName(u"btnRestoreDefaults")
-        self.btnRestoreDefaults.setGeometry(QRect(30, 450, 351, 34))
+        self.btnRestoreDefaults.setGeometry(QRect(30, 488, 351, 34))
         QWidget.setTabOrder(self.cmbBoxInterfaceLanguage, self.fcmbBoxFontFamily)
         QWidget.setTabOrder(self.fcmbBoxFontFamily, self.spinBoxFontSize)
         QWidget.setTabOrder(self.spinBoxFontSize, self.chkBoxEnableLogging)
@@ -97,7 +122,12 @@ class Ui_PreferencesDialog(object):
         QWidget.setTabOrder(self.chkBoxRestoreWindowSize, self.rbZero)
         QWidget.setTabOrder(self.rbZero, self.rbOne)
         QWidget.setTabOrder(self.rbOne, self.rbTwo)
-        QWidget.setTabOrder(self.rbTwo, self.btnRestoreDefaults)
+        QWidget.setTabOrder(self.rbTwo, self.spinBoxJobsWorkers)
+        QWidget.setTabOrder(self.spinBoxJobsWorkers, self.spinBoxCommandsWorkers)
+        QWidget.setTabOrder(self.spinBoxCommandsWorkers, self.chkBoxShortestJobFirst)
+        QWidget.setTabOrder(self.chkBoxShortestJobFirst, self.chkBoxIncrementalRun)
+        QWidget.setTabOrder(self.chkBoxIncrementalRun, self.chkBoxProfiling)
+        QWidget.setTabOrder(self.chkBoxProfiling, self.btnRestoreDefaults)
 
         self.retranslateUi(PreferencesDialog)
         self.btnBox.accepted.connect(PreferencesDialog.accept)
@@ -118,9 +148,29 @@ class Ui_PreferencesDialog(object):
         self.rbZero.setText(QCoreApplication.translate("PreferencesDialog", u"0", None))
         self.rbOne.setText(QCoreApplication.translate("PreferencesDialog", u"1", None))
         self.rbTwo.setText(QCoreApplication.translate("PreferencesDialog", u"2", None))
+        self.lblJobsWorkers.setText(QCoreApplication.translate("PreferencesDialog", u"Jobs:", None))
+#if QT_CONFIG(tooltip)
+        self.spinBoxJobsWorkers.setToolTip(QCoreApplication.translate("PreferencesDialog", u"Number of jobs running at the same time", None))
+#endif // QT_CONFIG(tooltip)
+        self.lblCommandsWorkers.setText(QCoreApplication.translate("PreferencesDialog", u"Commands:", None))
+#if QT_CONFIG(tooltip)
+        self.spinBoxCommandsWorkers.setToolTip(QCoreApplication.translate("PreferencesDialog", u"Number of commands of a job running at the same time", None))
+#endif // QT_CONFIG(tooltip)
         self.chkBoxComputeCRC.setText(QCoreApplication.translate("PreferencesDialog", u"Append CRC to file name", None))
         self.chkBoxEnableLogViewer.setText(QCoreApplication.translate("PreferencesDialog", u"Enable log viewer", None))
         self.chkBoxUseEmbedded.setText(QCoreApplication.translate("PreferencesDialog", u"Use embedded mkvmerge", None))
+#if QT_CONFIG(tooltip)
+        self.chkBoxShortestJobFirst.setToolTip(QCoreApplication.translate("PreferencesDialog", u"Jobs with the same priority run smallest source files first", None))
+#endif // QT_CONFIG(tooltip)
+        self.chkBoxShortestJobFirst.setText(QCoreApplication.translate("PreferencesDialog", u"Run shortest jobs first", None))
+#if QT_CONFIG(tooltip)
+        self.chkBoxIncrementalRun.setToolTip(QCoreApplication.translate("PreferencesDialog", u"Skip commands with output up to date from a previous run", None))
+#endif // QT_CONFIG(tooltip)
+        self.chkBoxIncrementalRun.setText(QCoreApplication.translate("PreferencesDialog", u"Skip up to date outputs", None))
+#if QT_CONFIG(tooltip)
+        self.chkBoxProfiling.setToolTip(QCoreApplication.translate("PreferencesDialog", u"Write cProfile and tracemalloc reports of the jobs and of the command checks", None))
+#endif // QT_CONFIG(tooltip)
+        self.chkBoxProfiling.setText(QCoreApplication.translate("PreferencesDialog", u"Profiling reports", None))
         self.btnRestoreDefaults.setText(QCoreApplication.translate("PreferencesDialog", u"Restore Defaults", None))
     # retranslateUi
 
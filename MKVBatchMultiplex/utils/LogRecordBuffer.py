@@ -0,0 +1,67 @@
+"""
+LogRecordBuffer logging handler that keeps records for the log viewer
+"""
+# LRB0001
+
+import logging
+
+from collections import deque
+
+
+class LogRecordBuffer(logging.Handler):
+    """
+    LogRecordBuffer keeps formatted log records until the log viewer takes
+    them. Records are formatted by the thread logging them and the log viewer
+    takes them in batches so logging does not send a signal to the interface
+    for every record.
+
+    Only the last **maxRecords** are kept if the log viewer is not taking
+    them the oldest are dropped.
+
+    Args:
+        **maxRecords** (int, optional): records kept. Defaults to 20000.
+
+        **level** (int, optional): handler level. Defaults to logging.NOTSET.
+    """
+
+    def __init__(self, maxRecords=20000, level=logging.NOTSET):
+        super().__init__(level)
+
+        self.__records = deque(maxlen=maxRecords)
+        self.dropped = 0
+
+    def emit(self, record):
+        """
+        emit logging.Handler.emit override keep record level and text
+
+        Args:
+            **record** (logging.LogRecord): record to keep
+        """
+
+        try:
+            msg = self.format(record)
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+            return
+
+        # emit is called with the handler lock acquired
+        if len(self.__records) == self.__records.maxlen:
+            self.dropped += 1
+        self.__records.append((record.levelno, msg))
+
+    def takeRecords(self):
+        """
+        takeRecords remove and return the records kept
+
+        Returns:
+            list: (level, text) of the records in logged order
+        """
+
+        self.acquire()
+        try:
+            records = list(self.__records)
+            self.__records.clear()
+        finally:
+            self.release()
+
+        return records
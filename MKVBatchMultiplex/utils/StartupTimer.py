@@ -0,0 +1,114 @@
+"""
+StartupTimer measure the interface startup up to the first paint
+"""
+# STT0001
+
+import logging
+import os
+import sys
+
+from time import perf_counter
+
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication, QWidget
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+# environment variable that turns the startup measurement on "quit" also ends
+# the application after the report
+STARTUPENV = "MKVBATCHMULTIPLEX_STARTUP"
+
+
+def startupTimingEnabled():
+    """
+    startupTimingEnabled the startup measurement is on in the environment
+
+    Returns:
+        bool: True if the startup is measured
+    """
+
+    return os.environ.get(STARTUPENV, "").lower() in [
+        "1", "true", "yes", "on", "quit"]
+
+
+class StartupTimer(QObject):
+    """
+    StartupTimer keeps the time of the startup phases and reports them when
+    the first paint event of **window** arrives. The report goes to the log
+    and to stderr. The application event filter is removed after the report
+    so it only sees the startup events.
+
+    With STARTUPENV set to "quit" the application ends after the report so
+    the measurement can be repeated from a script.
+
+    Args:
+        **startTime** (float, optional): perf_counter when the application
+        started. Defaults to now.
+
+        **parent** (QObject, optional): parent object. Defaults to None.
+    """
+
+    def __init__(self, startTime=None, parent=None):
+        super().__init__(parent)
+
+        self.startTime = perf_counter() if startTime is None else startTime
+        self.phases = []
+        self.window = None
+        self.quit = os.environ.get(STARTUPENV, "").lower() == "quit"
+
+    def mark(self, phase, endTime=None):
+        """
+        mark record the end of a startup phase
+
+        Args:
+            **phase** (str): phase name
+
+            **endTime** (float, optional): perf_counter when the phase ended.
+            Defaults to now.
+        """
+
+        self.phases.append(
+            (phase, perf_counter() if endTime is None else endTime))
+
+    def watch(self, window):
+        """
+        watch wait for the first paint of window
+
+        Args:
+            **window** (QWidget): main window
+        """
+
+        self.window = window
+        QApplication.instance().installEventFilter(self)
+
+    def eventFilter(self, obj, event):  # pylint: disable=invalid-name
+        """first paint of any widget in the main window"""
+
+        if (event.type() == QEvent.Paint) and isinstance(obj, QWidget) and (
+                obj.window() is self.window):
+            QApplication.instance().removeEventFilter(self)
+            self.mark("first paint")
+            self.report()
+            if self.quit:
+                QTimer.singleShot(0, lambda: QApplication.exit(0))
+
+        return False
+
+    def report(self):
+        """
+        report the time of every phase and the time to first paint
+        """
+
+        previous = self.startTime
+        details = []
+        for phase, endTime in self.phases:
+            details.append(f"{phase} {(endTime - previous) * 1000:.1f} ms")
+            previous = endTime
+
+        total = (previous - self.startTime) * 1000
+        msg = f"STT0001: Startup time to first paint {total:.1f} ms - " + (
+            ", ".join(details))
+        MODULELOG.info(msg)
+        print(msg, file=sys.stderr)
@@ -199,6 +199,9 @@ class Text:  # pylint: disable=too-few-public-methods
     txt0260 = S_("List rows")
     txt0261 = S_("Show job output run")
     txt0262 = S_("Show job output errors")
+    txt0263 = S_("Resume Jobs")
+    txt0264 = S_("Jobs did not finish on last run. Resume the jobs")
+    txt0265 = S_("Discard")
 
 
     """
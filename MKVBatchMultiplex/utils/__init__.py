@@ -4,6 +4,8 @@ utils package imports
 # UT0001
 
 # Classes
+from .LogRecordBuffer import LogRecordBuffer
+from .StartupTimer import STARTUPENV, StartupTimer, startupTimingEnabled
 from .Text import Text
 
 # Functions
@@ -12,6 +14,8 @@ from .executeMKVToolnix import executeMKVToolnix
 from .fileCRC32 import computeCRC32
 from .OutputWindows import OutputWindows
 from .populate import populate
+from .profiling import (
+    PROFILEREPORTRE, profiled, profilesDirectory, profilingEnabled)
 from .Progress import Progress
 from .Translate import Translate
 from .UiSetMessagesCatalog import UiSetMessagesCatalog
@@ -10,6 +10,8 @@ from pathlib import Path, PurePath
 from vsutillib.files import crc32
 from vsutillib.pyside6 import LineOutput, SvgColor
 
+from ..jobs import jobEvent
+
 MODULELOG = logging.getLogger(__name__)
 MODULELOG.addHandler(logging.NullHandler())
 
@@ -19,6 +21,7 @@ def computeCRC32(**kwargs: str) -> None:
     output = kwargs.pop("output", None)
     sourceFile = kwargs.pop("sourceFile", None)
     log = kwargs.pop("log", False)
+    jobID = kwargs.pop("jobID", None)
 
     if sourceFile:
         fileName = Path(sourceFile)
@@ -29,6 +32,9 @@ def computeCRC32(**kwargs: str) -> None:
                 fileName.stem + r" [" + crc + r"]" + fileName.suffix)
             newFileName = PurePath(newName)
             fileName.rename(newFileName)
+            jobEvent(
+                "crc32", jobID=jobID, file=fileName, crc=crc,
+                renamed=newFileName)
             msg = f"       File: {fileName.resolve()}\nRenamed: {newFileName}\n"
             output.command.emit(msg,
                                 {LineOutput.AppendEnd: True})
@@ -37,6 +43,9 @@ def computeCRC32(**kwargs: str) -> None:
                     "File: %s -> Renamed: %s",
                     str(fileName), newName)
         else:
+            jobEvent(
+                "crc32", jobID=jobID, file=fileName, crc=None,
+                error="file not found")
             output.command.emit(f"Problem adding CRC to file:\n{fileName}\n",
                                 {LineOutput.AppendEnd: True})
             if log:
@@ -0,0 +1,154 @@
+"""
+profiling opt-in cProfile and tracemalloc reports of slow paths
+"""
+# PRF0001
+
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import tracemalloc
+
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+from .. import config
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+# environment variable that turns profiling on without the preferences
+PROFILEENV = "MKVBATCHMULTIPLEX_PROFILE"
+# log message with the report file the log viewer opens it on double click
+PROFILEREPORTRE = re.compile(r"PRF0001: Profile report (.+)$")
+
+TOPFUNCTIONS = 40
+TOPALLOCATIONS = 25
+
+# only one cProfile profiler can be active at a time
+_profileLock = threading.Lock()
+
+
+def profilingEnabled():
+    """
+    profilingEnabled profiling is on in the preferences or the environment
+
+    Returns:
+        bool: True if profiling is on
+    """
+
+    if os.environ.get(PROFILEENV, "").lower() in ["1", "true", "yes", "on"]:
+        return True
+
+    return bool(config.data.get(config.ConfigKey.Profiling))
+
+
+def profilesDirectory():
+    """
+    profilesDirectory directory for the reports
+
+    Returns:
+        Path: reports directory
+    """
+
+    return Path(
+        config.data.get(config.ConfigKey.SystemDB)).parent.joinpath(
+            config.PROFILESDIR)
+
+
+def profiled(name=None):
+    """
+    profiled decorator that runs the function with cProfile and tracemalloc
+    when profiling is on. A report with the functions that took more time and
+    the sites that allocated more memory is written for every call. When
+    profiling is off the function is called directly.
+
+    Calls made while another call is profiled are not profiled. cProfile
+    only sees the thread that makes the call, work done by other threads is
+    not in the report. tracemalloc is on only while the call runs but traces
+    the whole process, the allocations of other threads in that time are in
+    the report.
+
+    Args:
+        **name** (str, optional): name for the reports. Defaults to the
+        function qualified name.
+
+    Returns:
+        function: decorator
+    """
+
+    def decorator(function):
+
+        reportName = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+
+            if not profilingEnabled():
+                return function(*args, **kwargs)
+
+            if not _profileLock.acquire(blocking=False):  # pylint: disable=consider-using-with
+                MODULELOG.debug(
+                    "PRF0002: Profile skipped %s another call running",
+                    reportName)
+                return function(*args, **kwargs)
+
+            try:
+                startedTracing = not tracemalloc.is_tracing()
+                if startedTracing:
+                    tracemalloc.start()
+                profiler = cProfile.Profile()
+                startTime = perf_counter()
+                try:
+                    return profiler.runcall(function, *args, **kwargs)
+                finally:
+                    seconds = perf_counter() - startTime
+                    snapshot = tracemalloc.take_snapshot()
+                    _, peak = tracemalloc.get_traced_memory()
+                    if startedTracing:
+                        tracemalloc.stop()
+                    _writeReport(reportName, seconds, profiler, snapshot, peak)
+            finally:
+                _profileLock.release()
+
+        return wrapper
+
+    return decorator
+
+
+def _writeReport(reportName, seconds, profiler, snapshot, peak):
+    """write the report of a profiled call"""
+
+    stream = io.StringIO()
+    stream.write(
+        f"{reportName} - {datetime.now().isoformat(timespec='seconds')}\n"
+        f"Wall time {seconds:.3f} s - memory peak {peak / 1000000:.3f} MB\n\n"
+    )
+    stream.write(f"Top {TOPFUNCTIONS} functions by cumulative time\n\n")
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOPFUNCTIONS)
+    stream.write(f"Top {TOPALLOCATIONS} allocation sites\n\n")
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ])
+    for stat in snapshot.statistics("lineno")[:TOPALLOCATIONS]:
+        stream.write(f"{stat}\n")
+
+    directory = profilesDirectory()
+    timeStamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    reportFile = directory.joinpath(f"{reportName}-{timeStamp}.txt")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        reportFile.write_text(stream.getvalue(), encoding="utf-8")
+    except OSError as e:
+        MODULELOG.error("PRF0003: Profile report error %s - %s", reportFile, e)
+        return
+
+    MODULELOG.info("PRF0001: Profile report %s", reportFile)
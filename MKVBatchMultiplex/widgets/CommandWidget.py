@@ -722,7 +722,7 @@ class CommandWidget(TabWidgetExtension, QWidget):
     def resetButtonState(self):
         """Set clear button state"""
 
-        if self.output.jobOutput.toPlainText() != "":
+        if not self.output.jobOutput.isEmpty():
             self.btnGrid.itemAt(_Button.RESET).widget().setEnabled(True)
         else:
             self.btnGrid.itemAt(_Button.RESET).widget().setEnabled(False)
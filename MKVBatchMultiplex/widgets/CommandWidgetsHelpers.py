@@ -13,12 +13,14 @@ from vsutillib.files import DisplayPath
 from vsutillib.pyside6 import LineOutput, SvgColor
 
 from .. import config
+from ..utils import profiled
 
 
 MODULELOG = logging.getLogger(__name__)
 MODULELOG.addHandler(logging.NullHandler())
 
 
+@profiled()
 def runAnalysis(**kwargs: str) -> None:
     """List the source files found"""
 
@@ -83,6 +85,7 @@ def runAnalysis(**kwargs: str) -> None:
                 "wrong parameters.")
 
 
+@profiled()
 def showCommands(**kwargs: str):
     """List the commands to be executed"""
 
@@ -151,6 +154,7 @@ def showCommands(**kwargs: str):
     return None
 
 
+@profiled()
 def checkFiles(**kwargs: str) -> str:
     """Check file structure against primary source file"""
 
@@ -298,6 +302,7 @@ def checkFiles(**kwargs: str) -> str:
                             {LineOutput.AppendEnd: True})
 
 
+@profiled()
 def sourceTree(**kwargs: str) -> None:
     """Check file structure against primary source file"""
 
@@ -6,14 +6,21 @@ from typing import Optional, Any
 
 from PySide6.QtWidgets import QWidget
 
-from vsutillib.pyside6 import QOutputTextWidget, TabWidgetExtension
+from vsutillib.pyside6 import TabWidgetExtension
 
+from .. import config
+from .OutputListView import OutputListView
 
-class JobsOutputErrorsWidget(TabWidgetExtension, QOutputTextWidget):
+
+class JobsOutputErrorsWidget(TabWidgetExtension, OutputListView):
 
     def __init__(
         self,
         parent: QWidget,
         log: Optional[bool] = None,
         **kwargs: Any):
-        super().__init__(parent=parent, log=log, **kwargs)
+        super().__init__(
+            parent=parent,
+            log=log,
+            maxLines=config.data.get(config.ConfigKey.OutputScrollback),
+            **kwargs)
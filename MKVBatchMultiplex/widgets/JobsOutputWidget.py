@@ -6,10 +6,13 @@ from typing import Optional, Any
 
 from PySide6.QtWidgets import QWidget
 
-from vsutillib.pyside6 import QOutputTextWidget, TabWidgetExtension
+from vsutillib.pyside6 import TabWidgetExtension
 
+from .. import config
+from .OutputListView import OutputListView
 
-class JobsOutputWidget(TabWidgetExtension, QOutputTextWidget):
+
+class JobsOutputWidget(TabWidgetExtension, OutputListView):
 
     def __init__(
         self, 
@@ -17,4 +20,8 @@ class JobsOutputWidget(TabWidgetExtension, QOutputTextWidget):
         log: Optional[bool] = None, 
         **kwargs: Any):
         
-        super().__init__(parent=parent, log=log, **kwargs)
+        super().__init__(
+            parent=parent,
+            log=log,
+            maxLines=config.data.get(config.ConfigKey.OutputScrollback),
+            **kwargs)
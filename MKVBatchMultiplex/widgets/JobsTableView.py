@@ -179,6 +179,12 @@ class JobsTableView(QTableView):
             ]:
                 menu.addAction(_("Remove"))
                 #print(f"Added Remove action")
+            if model.dataset[row, JobKey.Status] == JobStatus.Queue:
+                menu.addSeparator()
+                menu.addAction(_("Move Up"))
+                menu.addAction(_("Move Down"))
+                menu.addAction(_("Raise Priority"))
+                menu.addAction(_("Lower Priority"))
             #menu.addAction(_("Save"))
 
             if action := menu.exec(event.globalPos()):
@@ -197,6 +203,14 @@ class JobsTableView(QTableView):
                     self.removeSelection()
                 elif result == _("Save"):
                     self.saveSelection()
+                elif result == _("Move Up"):
+                    model.jobQueue.moveUp(row)
+                elif result == _("Move Down"):
+                    model.jobQueue.moveDown(row)
+                elif result == _("Raise Priority"):
+                    self.changePriority(row, 1)
+                elif result == _("Lower Priority"):
+                    self.changePriority(row, -1)
 
     def contextMenuEventOriginal(self, event):
         """
@@ -315,6 +329,11 @@ class JobsTableView(QTableView):
                 if remove:
                     #print(f"Remove row {jobRow}")
                     self.proxyModel.filterConditions["Remove"].append(jobRow)
+                    job = model.dataset.data[jobRow][JobKey.Status].obj
+                    if (job is not None) and (
+                            not config.data.get(config.ConfigKey.JobHistory)):
+                        # output of a job not in the history is not used again
+                        job.removeLogs()
                     self.proxyModel.setFilterFixedString("")
                     if not jobRemoved:
                         jobRemoved = True
@@ -323,6 +342,21 @@ class JobsTableView(QTableView):
 
         return
 
+    def changePriority(self, row, step):
+        """
+        changePriority of a job waiting in the jobs queue
+
+        Args:
+            **row** (int): row of job in model
+
+            **step** (int): amount to add to current priority
+        """
+
+        jobQueue = self.proxyModel.sourceModel().jobQueue
+
+        if (priority := jobQueue.priority(row)) is not None:
+            jobQueue.setPriority(row, priority + step)
+
     def saveSelection(self):
         """
         saveSelection save selected jobs
@@ -19,13 +19,15 @@ from PySide6.QtWidgets import (
     QGroupBox,
     QGridLayout,
     QApplication,
+    QMessageBox,
 )
 
 from vsutillib.pyside6 import QPushButtonWidget, darkPalette, TabWidgetExtension
 from vsutillib.process import isThreadRunning
 
 from .. import config
-from ..jobs import JobStatus, JobKey  # , SqlJobsTable, JobsTableKey
+from ..jobs import (  # , SqlJobsTable, JobsTableKey
+    JobStatus, JobKey, discardResumableJobs, fetchResumableJobs)
 from ..delegates import StatusComboBoxDelegate
 from ..utils import Text, yesNoDialog
 
@@ -111,7 +113,7 @@ class JobsTableViewWidget(TabWidgetExtension, QWidget):
         )
         btnAbortJobs = QPushButtonWidget(
             Text.txt0136,
-            function=self.abortCurrentJob,
+            function=self.abortJobs,
             margins="  ",
             toolTip=Text.txt0137,
         )
@@ -254,6 +256,7 @@ class JobsTableViewWidget(TabWidgetExtension, QWidget):
     #    return hasWaitingStatus(self.model)
 
     def abortCurrentJob(self):
+        # with more than one worker all running jobs are aborted
         self.controlQueue.append(JobStatus.AbortJob)
 
     def abortJobs(self):
@@ -300,6 +303,57 @@ class JobsTableViewWidget(TabWidgetExtension, QWidget):
             # else:
             #    print("Nothing here")
 
+    def resumeJobs(self):
+        """
+        resumeJobs offer to resume the jobs that were running when the
+        application ended. Commands already completed are not run again if
+        their output is still valid.
+
+        The checkpoints of the jobs resumed are removed when they start, if
+        they are not resumed now they are offered again on the next start
+        unless they are discarded.
+        """
+
+        if not (jobs := fetchResumableJobs()):
+            return
+
+        language = config.data.get(config.ConfigKey.Language)
+        title = _(Text.txt0263)
+        msg = "¿" if language == "es" else ""
+        msg += _(Text.txt0264) + "?\n\n"
+        for job in jobs:
+            msg += (
+                f"Job ID: {job['id']} - {len(job['checkpoints'])}/"
+                f"{job['totalCommands']}\n"
+            )
+
+        m = QMessageBox(self)
+        m.setText(msg)
+        m.setIcon(QMessageBox.Question)
+        yesButton = m.addButton(
+            _(Text.txt0082), QMessageBox.ButtonRole.YesRole)
+        noButton = m.addButton(" No ", QMessageBox.ButtonRole.NoRole)
+        discardButton = m.addButton(
+            _(Text.txt0265), QMessageBox.ButtonRole.DestructiveRole)
+        m.setDefaultButton(noButton)
+        m.setFont(self.font())
+        m.setWindowTitle(title)
+        m.exec()
+
+        if m.clickedButton() == yesButton:
+            for job in jobs:
+                row = self.model.rowCount()
+                self.parent.jobsQueue.resume(
+                    row, job["checkpoints"], resumedID=job["id"])
+                data = [
+                    ["", "", job["algorithm"]],
+                    [JobStatus.AddToQueue, "Status code", None],
+                    [job["command"], job["command"], None],
+                ]
+                self.model.insertRows(row, 1, data=data)
+        elif m.clickedButton() == discardButton:
+            discardResumableJobs([job["id"] for job in jobs])
+
     def translate(self):
         """
         setLanguage set labels according to locale
@@ -391,7 +445,7 @@ class JobsTableViewWidget(TabWidgetExtension, QWidget):
         rowStatus = self.model.dataset[row, column]
 
         if rowStatus == JobStatus.Abort:
-            self.controlQueue.append(JobStatus.AbortJob)
+            self.controlQueue.appendJob(JobStatus.AbortJob, row)
 
     @Slot()
     def jobStatusCheck(self):
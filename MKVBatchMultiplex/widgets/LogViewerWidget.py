@@ -1,56 +1,181 @@
 """
-JobsOutputWidget
+LogViewerWidget
 """
 
-import re
+import logging
 
+from pathlib import Path
 from typing import Optional, Any
 
-from PySide6.QtCore import Slot
-from PySide6.QtWidgets import QTextEdit, QWidget
+from PySide6.QtCore import QModelIndex, Qt, QTimer, QUrl, Slot
+from PySide6.QtGui import QAction, QDesktopServices, QKeySequence
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QListView,
+    QVBoxLayout,
+    QWidget,
+)
 
-from vsutillib.pyside6 import QOutputTextWidget, SvgColor, TabWidgetExtension
+from vsutillib.pyside6 import TabWidgetExtension
 
+from ..models import LogLinesModel
+from ..utils import PROFILEREPORTRE
 
-class LogViewerWidget(TabWidgetExtension, QOutputTextWidget):
+
+class LogViewerWidget(TabWidgetExtension, QWidget):
     """
     LogViewerWidget widget to view running log
     This widget can be hidden on super().__init__ parent has to be None if not
     some glitches in main menu will show
 
+    The records are taken from a LogRecordBuffer handler every
+    **refreshInterval** milliseconds and added in one batch. Only the last
+    **maxLines** records are kept. The level combo box shows the records of
+    that level and above. Double click on a profile report record opens the
+    report.
+
     Args:
-        TabWidgetExtension (widget): TabWidget child extensions
-        QOutputTextWidget (widget): QTextEdit subclass use to show output generated
-                                by running processes
+        **parent** (QWidget, optional): parent widget. Defaults to None.
+
+        **log** (bool, optional): not used the log viewer does not log.
+        Defaults to None.
+
+        **maxLines** (int, optional): records kept 0 keep all. Defaults to
+        20000.
+
+        **refreshInterval** (int, optional): milliseconds between batches.
+        Defaults to 250.
     """
 
     def __init__(
         self,
         parent: Optional[QWidget] = None,
         log: Optional[bool] = None,
+        maxLines: int = 20000,
+        refreshInterval: int = 250,
         **kwargs: Any):
         super().__init__(parent=None, tabWidgetChild=self, **kwargs)
 
         self.parent = parent
-        self.setReadOnly(True)
-        self.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
-        self.reWords = re.compile(r"^(.*?) (.*?) (.*?) ")
-
-    @Slot(object)
-    def logMessage(self, msg):
-
-        msgArgs = {"log": False}
-        if matchWords := self.reWords.match(msg):
-            logLevel = matchWords[3]
-            if (logLevel == "DEBUG"):
-                msgArgs = {"color": SvgColor.green, "log": False}
-            elif (logLevel == "INFO"):
-                msgArgs = {"color": SvgColor.white, "log": False}
-            elif (logLevel == "WARNING"):
-                msgArgs = {"color": SvgColor.yellow, "log": False}
-            elif (logLevel == "ERROR"):
-                msgArgs = {"color": SvgColor.red, "log": False}
-            elif (logLevel == "CRITICAL"):
-                msgArgs = {"color": SvgColor.orangered, "log": False}
-
-        self.insertTextSignal.emit(msg + "\n", msgArgs)
+        self.logHandler = None
+        self.lines = LogLinesModel(self, maxLines=maxLines)
+        self.listView = QListView(self)
+        self.cmbLevel = QComboBox(self)
+        self.timer = QTimer(self)
+        self.timer.setInterval(refreshInterval)
+        self.timer.timeout.connect(self.takeRecords)
+
+        self._initUI()
+
+    def _initUI(self):
+
+        self.listView.setModel(self.lines)
+        self.listView.setUniformItemSizes(True)
+        self.listView.setLayoutMode(QListView.Batched)
+        self.listView.setWordWrap(False)
+        self.listView.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.listView.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.listView.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+
+        actCopy = QAction(_("Copy"), self.listView)
+        actCopy.setShortcut(QKeySequence.Copy)
+        actCopy.setShortcutContext(Qt.WidgetShortcut)
+        actCopy.triggered.connect(self.copySelection)
+        self.listView.addAction(actCopy)
+        self.listView.setContextMenuPolicy(Qt.ActionsContextMenu)
+        self.listView.doubleClicked.connect(self.openReport)
+
+        for text, level in [
+                (_("Debug"), logging.DEBUG),
+                (_("Info"), logging.INFO),
+                (_("Warning"), logging.WARNING),
+                (_("Error"), logging.ERROR),
+                (_("Critical"), logging.CRITICAL)]:
+            self.cmbLevel.addItem(text, level)
+        self.cmbLevel.currentIndexChanged.connect(self.levelChanged)
+
+        levelBox = QHBoxLayout()
+        levelBox.addWidget(QLabel(_("Level")))
+        levelBox.addWidget(self.cmbLevel)
+        levelBox.addStretch()
+
+        layout = QVBoxLayout()
+        layout.addLayout(levelBox)
+        layout.addWidget(self.listView)
+        self.setLayout(layout)
+
+    def setLogHandler(self, handler) -> None:
+        """
+        setLogHandler take records from handler
+
+        Args:
+            **handler** (LogRecordBuffer): handler with the records. None stop
+            taking records.
+        """
+
+        self.logHandler = handler
+        if handler is None:
+            self.timer.stop()
+        else:
+            self.timer.start()
+
+    @Slot()
+    def takeRecords(self) -> None:
+        """add the records waiting in the handler"""
+
+        if self.logHandler is None:
+            return
+
+        if records := self.logHandler.takeRecords():
+            scrollBar = self.listView.verticalScrollBar()
+            followOutput = scrollBar.value() == scrollBar.maximum()
+            self.lines.addRecords(records)
+            if followOutput:
+                self.listView.scrollToBottom()
+
+    @Slot(int)
+    def levelChanged(self, index: int) -> None:
+        """show records of level selected and above"""
+
+        self.lines.setLevel(self.cmbLevel.itemData(index))
+        self.listView.scrollToBottom()
+
+    @Slot(QModelIndex)
+    def openReport(self, index: QModelIndex) -> None:
+        """open the profile report of the record"""
+
+        text = self.lines.data(index)
+        if text and (match := PROFILEREPORTRE.search(text)):
+            reportFile = Path(match.group(1).strip())
+            if reportFile.is_file():
+                QDesktopServices.openUrl(QUrl.fromLocalFile(str(reportFile)))
+
+    def clear(self) -> None:
+        """
+        clear remove all records
+        """
+
+        self.lines.clear()
+
+    def copySelection(self) -> None:
+        """
+        copySelection copy selected records to clipboard
+        """
+
+        rows = sorted(index.row() for index in self.listView.selectedIndexes())
+        if rows:
+            text = "\n".join(
+                self.lines.data(self.lines.index(row)) for row in rows)
+            QApplication.clipboard().setText(text)
+
+
+# This if for Pylance _() is not defined in PyLance
+def _(dummy: str) -> str:
+    return dummy
+
+
+del _
@@ -0,0 +1,222 @@
+"""
+OutputListView output window that only renders the visible lines
+"""
+# OLV0001
+
+import logging
+
+from typing import Any, Optional
+
+from PySide6.QtCore import Signal, Slot
+from PySide6.QtGui import QKeySequence
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QListView,
+    QMenu,
+    QWidget,
+)
+
+from ..models import OutputLinesModel
+
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class OutputListView(QListView):
+    """
+    OutputListView replacement for QOutputTextWidget for output windows that
+    receive a lot of text. The lines are kept in an OutputLinesModel and the
+    view only paints the rows on screen, adding text costs the same with ten
+    lines or a million.
+
+    The view follows the output while the scroll bar is at the bottom.
+
+    Args:
+        **parent** (QWidget, optional): parent widget. Defaults to None.
+
+        **log** (bool, optional): log text inserted. Defaults to None.
+
+        **maxLines** (int, optional): scrollback lines kept 0 keep all.
+        Defaults to 100000.
+    """
+
+    # Class logging state
+    __log = False
+
+    textChanged = Signal()
+
+    def __init__(
+            self,
+            parent: Optional[QWidget] = None,
+            log: Optional[bool] = None,
+            maxLines: int = 100000,
+            **kwargs: Any) -> None:
+        super().__init__(parent, **kwargs)
+
+        self.__log = None  # Instance logging state None = Class state prevails
+
+        self.parent = parent
+        self.log = log
+        self.lines = OutputLinesModel(self, maxLines=maxLines)
+
+        self.setModel(self.lines)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setWordWrap(False)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+
+    @classmethod
+    def classLog(cls, setLogging: Optional[bool] = None) -> bool:
+        """
+        get/set logging at class level every class instance will log unless
+        overwritten
+
+        Args:
+            **setLogging** (bool, optional): True class will log False turn
+            off logging None returns current value. Defaults to None.
+
+        Returns:
+            bool: current value set
+        """
+
+        if setLogging is not None:
+            if isinstance(setLogging, bool):
+                cls.__log = setLogging
+
+        return cls.__log
+
+    @property
+    def log(self) -> bool:
+        """
+        class property can be used to override the class global logging
+        setting
+
+        Returns:
+            bool: True if logging is enable False otherwise
+        """
+
+        if self.__log is not None:
+            return self.__log
+
+        return OutputListView.classLog()
+
+    @log.setter
+    def log(self, value: Optional[bool]) -> None:
+        """set instance log variable"""
+
+        if isinstance(value, bool) or value is None:
+            self.__log = value
+
+    @property
+    def maxLines(self) -> int:
+        """
+        maxLines scrollback lines kept
+
+        Returns:
+            int: maximum lines 0 keep all
+        """
+        return self.lines.maxLines
+
+    @maxLines.setter
+    def maxLines(self, value: int) -> None:
+        self.lines.maxLines = value
+
+    @Slot(str, dict)
+    def insertText(self, strText: str, kwargs: Optional[dict] = None) -> None:
+        """
+        insertText add text to output
+
+        Args:
+            **strText** (str): text to add
+
+            **kwargs** (dict, optional): color, replaceLine, appendLine and log
+            same as QOutputTextWidget. Defaults to None.
+        """
+
+        kwargs = {} if kwargs is None else kwargs
+        scrollBar = self.verticalScrollBar()
+        followOutput = scrollBar.value() == scrollBar.maximum()
+
+        self.lines.insertText(strText, kwargs)
+
+        if followOutput:
+            self.scrollToBottom()
+
+        if self.log and kwargs.get("log", True):
+            MODULELOG.debug("OLV0001: %s", strText.strip())
+
+        self.textChanged.emit()
+
+    def clear(self) -> None:
+        """
+        clear remove all text
+        """
+
+        self.lines.clear()
+        self.textChanged.emit()
+
+    def isEmpty(self) -> bool:
+        """
+        isEmpty output has no text
+
+        Returns:
+            bool: True if there is no text
+        """
+
+        return self.lines.rowCount() == 0
+
+    def toPlainText(self) -> str:
+        """
+        toPlainText text in the scrollback
+
+        Returns:
+            str: lines joined with new line
+        """
+
+        return "\n".join(self.lines.lines())
+
+    def copySelection(self) -> None:
+        """
+        copySelection copy selected lines to clipboard
+        """
+
+        rows = sorted(index.row() for index in self.selectedIndexes())
+        if rows:
+            text = "\n".join(
+                self.lines.data(self.lines.index(row)) for row in rows)
+            QApplication.clipboard().setText(text)
+
+    def keyPressEvent(self, event) -> None:
+        """copy selection with the standard key sequence"""
+
+        if event.matches(QKeySequence.Copy):
+            self.copySelection()
+            return
+
+        super().keyPressEvent(event)
+
+    def contextMenuEvent(self, event) -> None:
+        """context menu to copy lines"""
+
+        menu = QMenu(self)
+        actCopy = menu.addAction(_("Copy"))
+        actCopy.setEnabled(bool(self.selectedIndexes()))
+        actSelectAll = menu.addAction(_("Select All"))
+        result = menu.exec(event.globalPos())
+
+        if result is actCopy:
+            self.copySelection()
+        elif result is actSelectAll:
+            self.selectAll()
+
+
+# This if for Pylance _() is not defined in PyLance
+def _(dummy: str) -> str:
+    return dummy
+
+
+del _
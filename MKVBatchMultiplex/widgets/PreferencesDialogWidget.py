@@ -114,6 +114,23 @@ class PreferencesDialogWidget(QDialog):
             else:
                 self.ui.chkBoxUseEmbedded.setChecked(False)
 
+        #
+        # Shortest job first
+        #
+        self.ui.chkBoxShortestJobFirst.setChecked(
+            bool(config.data.get(config.ConfigKey.ShortestJobFirst)))
+
+        #
+        # Incremental run
+        #
+        self.ui.chkBoxIncrementalRun.setChecked(
+            bool(config.data.get(config.ConfigKey.IncrementalRun)))
+
+        #
+        # Profiling
+        #
+        self.ui.chkBoxProfiling.setChecked(
+            bool(config.data.get(config.ConfigKey.Profiling)))
 
 
         # region History
@@ -150,6 +167,24 @@ class PreferencesDialogWidget(QDialog):
             currentAlgorithm = config.data.get(config.ConfigKey.Algorithm)
             self.radioButtons[currentAlgorithm].setChecked(True)
 
+        #
+        # Jobs running at the same time
+        #
+        self.ui.spinBoxJobsWorkers.setMaximum(config.JOBSWORKERSMAX)
+        self.ui.spinBoxJobsWorkers.setValue(
+            config.data.get(config.ConfigKey.JobsWorkers)
+            or config.JOBSWORKERSDEFAULT
+        )
+
+        #
+        # Commands of a job running at the same time
+        #
+        self.ui.spinBoxCommandsWorkers.setMaximum(config.COMMANDSWORKERSMAX)
+        self.ui.spinBoxCommandsWorkers.setValue(
+            config.data.get(config.ConfigKey.CommandsWorkers)
+            or config.COMMANDSWORKERSDEFAULT
+        )
+
     def _initHelper(self):
         """
         Connect to change signals of widget elements
@@ -193,6 +228,27 @@ class PreferencesDialogWidget(QDialog):
             self.__pref.useEmbeddedStateChange
         )
 
+        #
+        # Shortest job first
+        #
+        self.ui.chkBoxShortestJobFirst.stateChanged.connect(
+            self.__pref.shortestJobFirstStateChanged
+        )
+
+        #
+        # Incremental run
+        #
+        self.ui.chkBoxIncrementalRun.stateChanged.connect(
+            self.__pref.incrementalRunStateChanged
+        )
+
+        #
+        # Profiling
+        #
+        self.ui.chkBoxProfiling.stateChanged.connect(
+            self.__pref.profilingStateChanged
+        )
+
         #
         # Job History
         #
@@ -226,6 +282,14 @@ class PreferencesDialogWidget(QDialog):
             lambda: self.__pref.toggledRadioButton(self.ui.rbTwo)
         )
 
+        #
+        # Jobs workers
+        #
+        self.ui.spinBoxJobsWorkers.valueChanged.connect(
+            self.__pref.jobsWorkersChanged)
+        self.ui.spinBoxCommandsWorkers.valueChanged.connect(
+            self.__pref.commandsWorkersChanged)
+
         #
         # Restore Defaults
         #
@@ -334,6 +398,29 @@ class PreferencesDialogWidget(QDialog):
                     else:
                         config.data.set(config.ConfigKey.UseEmbedded, 0)
 
+            #
+            # Shortest job first takes effect on next run of the jobs queue
+            #
+            if self.preferences.shortestJobFirst is not None:
+                config.data.set(
+                    config.ConfigKey.ShortestJobFirst,
+                    self.preferences.shortestJobFirst)
+
+            #
+            # Incremental run takes effect on next job started
+            #
+            if self.preferences.incrementalRun is not None:
+                config.data.set(
+                    config.ConfigKey.IncrementalRun,
+                    self.preferences.incrementalRun)
+
+            #
+            # Profiling takes effect on next call of the profiled functions
+            #
+            if self.preferences.profiling is not None:
+                config.data.set(
+                    config.ConfigKey.Profiling, self.preferences.profiling)
+
             #
             # Job History
             #
@@ -359,6 +446,21 @@ class PreferencesDialogWidget(QDialog):
                         config.data.set(config.ConfigKey.Algorithm, index)
                 self.stateChangedAlgorithm.emit()
 
+            #
+            # Jobs workers takes effect on next run of the jobs queue
+            #
+            if self.preferences.jobsWorkers is not None:
+                config.data.set(
+                    config.ConfigKey.JobsWorkers, self.preferences.jobsWorkers)
+
+            #
+            # Commands workers takes effect on jobs added after the change
+            #
+            if self.preferences.commandsWorkers is not None:
+                config.data.set(
+                    config.ConfigKey.CommandsWorkers,
+                    self.preferences.commandsWorkers)
+
             #
             # Restore window size
             #
@@ -403,11 +505,16 @@ class Preferences(QObject):
         #self.enableJobHistory = None
         self.enableLogging = None
         self.enableLogViewer = None
+        self.commandsWorkers = None
         self.enableCRCCompute = None
         self.font = None
         self.fontSize = None
+        self.incrementalRun = None
+        self.jobsWorkers = None
         self.language = None
+        self.profiling = None
         self.restoreWindowSize = None
+        self.shortestJobFirst = None
         self.useEmbedded = None
         self.__changedData = False
 
@@ -481,6 +588,41 @@ class Preferences(QObject):
         if not self.__changedData:
             self.__changedData = True
 
+    @Slot(int)
+    def jobsWorkersChanged(self, value):
+
+        self.jobsWorkers = value
+        if not self.__changedData:
+            self.__changedData = True
+
+    @Slot(int)
+    def commandsWorkersChanged(self, value):
+
+        self.commandsWorkers = value
+        if not self.__changedData:
+            self.__changedData = True
+
+    @Slot(int)
+    def shortestJobFirstStateChanged(self, value):
+
+        self.shortestJobFirst = bool(value)
+        if not self.__changedData:
+            self.__changedData = True
+
+    @Slot(int)
+    def incrementalRunStateChanged(self, value):
+
+        self.incrementalRun = bool(value)
+        if not self.__changedData:
+            self.__changedData = True
+
+    @Slot(int)
+    def profilingStateChanged(self, value):
+
+        self.profiling = bool(value)
+        if not self.__changedData:
+            self.__changedData = True
+
     @Slot(int)
     def restoreWindowSizeStateChanged(self, value):
 
@@ -536,6 +678,12 @@ class Preferences(QObject):
         self.parent.ui.spinBoxFontSize.setValue(defaultFont.pointSize())
         if config.data.get(config.ConfigKey.Algorithm) is not None:
             self.parent.radioButtons[config.ALGORITHMDEFAULT].setChecked(True)
+        self.parent.ui.spinBoxJobsWorkers.setValue(config.JOBSWORKERSDEFAULT)
+        self.parent.ui.spinBoxCommandsWorkers.setValue(
+            config.COMMANDSWORKERSDEFAULT)
+        self.parent.ui.chkBoxShortestJobFirst.setChecked(False)
+        self.parent.ui.chkBoxIncrementalRun.setChecked(False)
+        self.parent.ui.chkBoxProfiling.setChecked(False)
 
     def reset(self):
         self._initVars()
@@ -38,7 +38,7 @@ from vsutillib.process import ThreadWorker
 from vsutillib.files import crc32
 
 from .. import config
-from ..utils import computeCRC32, Text
+from ..utils import computeCRC32, profiled, Text
 
 from .RenameWidgetHelpers import (
     findDuplicates,
@@ -441,6 +441,8 @@ class RenameWidget(TabWidgetExtension, QWidget):
             except OSError:
                 self.outputRenameResultsSignal.emit(str(f.name) + "\n", {})
 
+    @Slot()
+    @profiled()
     def _updateRegEx(self):
 
         rg = self.textRegEx.cmdLine.currentText()
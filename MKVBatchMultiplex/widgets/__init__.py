@@ -9,6 +9,7 @@ from .JobsOutputWidget import JobsOutputWidget
 from .JobsTableView import JobsTableView
 from .JobsTableViewWidget import JobsTableViewWidget
 from .LogViewerWidget import LogViewerWidget
+from .OutputListView import OutputListView
 from .PreferencesDialogWidget import PreferencesDialogWidget
 from .ProjectInfoDialogWidget import ProjectInfoDialogWidget
 from .RenameWidget import RenameWidget
@@ -0,0 +1,184 @@
+"""
+Test the order of the jobs in JobWorkQueue
+
+JobWorkQueue does not use Qt or the rest of the application it is loaded
+from its file so the test runs without the application dependencies.
+"""
+
+import importlib.util
+import threading
+import unittest
+
+from pathlib import Path
+
+
+_SPEC = importlib.util.spec_from_file_location(
+    "JobWorkQueue",
+    Path(__file__).parent.parent.joinpath(
+        "MKVBatchMultiplex", "jobs", "JobWorkQueue.py"),
+)
+_MODULE = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(_MODULE)
+JobWorkQueue = _MODULE.JobWorkQueue
+
+
+class FakeJob:
+    """job with the attributes used by the queue"""
+
+    def __init__(self, jobRowNumber, size=0, priority=0):
+        self.jobRowNumber = jobRowNumber
+        self.priority = priority
+        self.queueOrder = None
+        self.size = size
+        self.sizeReads = 0
+        self.sizeThreads = set()
+
+    @property
+    def sourceSize(self):
+        self.sizeReads += 1
+        self.sizeThreads.add(threading.current_thread())
+        return self.size
+
+
+class SlowJob(FakeJob):
+    """job with a size read that waits until released"""
+
+    def __init__(self, jobRowNumber, size=0, priority=0):
+        super().__init__(jobRowNumber, size, priority)
+        self.reading = threading.Event()
+        self.release = threading.Event()
+
+    @property
+    def sourceSize(self):
+        self.reading.set()
+        self.release.wait(5)
+        return self.size
+
+
+def rows(workQueue):
+    """rows of the jobs in queue order"""
+
+    return [job.jobRowNumber for job in workQueue]
+
+
+class TestJobWorkQueue(unittest.TestCase):
+    """order of jobs by priority, moves and shortest job first"""
+
+    def queue(self, sizes, shortestJobFirst=False):
+        workQueue = JobWorkQueue(shortestJobFirst=shortestJobFirst)
+        for row, size in enumerate(sizes):
+            workQueue.append(FakeJob(row, size))
+        self.assertTrue(workQueue.waitSizes(timeout=5))
+        return workQueue
+
+    def testAddOrder(self):
+        workQueue = self.queue([30, 10, 20])
+        self.assertEqual(rows(workQueue), [0, 1, 2])
+
+    def testPriority(self):
+        workQueue = self.queue([0, 0, 0])
+        self.assertTrue(workQueue.setPriority(2, 5))
+        self.assertEqual(rows(workQueue), [2, 0, 1])
+        self.assertFalse(workQueue.setPriority(9, 5))
+        self.assertEqual(workQueue.popleft().jobRowNumber, 2)
+
+    def testMoves(self):
+        workQueue = self.queue([0, 0, 0])
+        self.assertTrue(workQueue.moveUp(2))
+        self.assertTrue(workQueue.moveUp(2))
+        self.assertFalse(workQueue.moveUp(2))
+        self.assertEqual(rows(workQueue), [2, 0, 1])
+        self.assertTrue(workQueue.moveDown(0))
+        self.assertEqual(rows(workQueue), [2, 1, 0])
+
+    def testMoveKeptBySort(self):
+        workQueue = self.queue([0, 0, 0])
+        workQueue.moveUp(2)
+        workQueue.moveUp(2)
+        workQueue.sort()
+        self.assertEqual(rows(workQueue), [2, 0, 1])
+
+    def testMoveTakesPriority(self):
+        workQueue = self.queue([0, 0, 0])
+        workQueue.setPriority(0, 5)
+        self.assertEqual(rows(workQueue), [0, 1, 2])
+        workQueue.moveUp(1)
+        self.assertEqual(rows(workQueue), [1, 0, 2])
+        self.assertEqual(workQueue.find(1).priority, 5)
+
+    def testShortestJobFirst(self):
+        workQueue = self.queue([30, 10, 20], shortestJobFirst=True)
+        self.assertEqual(rows(workQueue), [1, 2, 0])
+
+    def testShortestJobFirstPolicyChange(self):
+        workQueue = self.queue([30, 10, 20])
+        workQueue.shortestJobFirst = True
+        self.assertTrue(workQueue.waitSizes(timeout=5))
+        self.assertEqual(rows(workQueue), [1, 2, 0])
+        workQueue.shortestJobFirst = False
+        self.assertEqual(rows(workQueue), [0, 1, 2])
+
+    def testShortestJobFirstMoveKept(self):
+        workQueue = self.queue([30, 10, 20], shortestJobFirst=True)
+        workQueue.moveUp(0)
+        self.assertEqual(rows(workQueue), [1, 0, 2])
+        workQueue.sort()
+        self.assertEqual(rows(workQueue), [1, 0, 2])
+        # added later goes after the jobs ordered by hand
+        workQueue.append(FakeJob(3, 1))
+        self.assertTrue(workQueue.waitSizes(timeout=5))
+        self.assertEqual(rows(workQueue), [1, 0, 2, 3])
+
+    def testSizeReadInThread(self):
+        workQueue = self.queue([30, 10, 20], shortestJobFirst=True)
+        for job in workQueue:
+            self.assertEqual(job.sizeReads, 1)
+            self.assertNotIn(threading.current_thread(), job.sizeThreads)
+        workQueue.sort()
+        for job in workQueue:
+            self.assertEqual(job.sizeReads, 1)
+
+    def testSlowSizeDoesNotBlockPop(self):
+        workQueue = JobWorkQueue(shortestJobFirst=True)
+        slowJob = SlowJob(0, 30)
+        workQueue.append(slowJob)
+        self.assertTrue(slowJob.reading.wait(5))
+        workQueue.append(FakeJob(1, 10))
+        popped = []
+        worker = threading.Thread(
+            target=lambda: popped.append(workQueue.popleft()))
+        worker.start()
+        worker.join(2)
+        # the job being read is skipped
+        self.assertEqual([job.jobRowNumber for job in popped], [1])
+        slowJob.release.set()
+        self.assertTrue(workQueue.waitSizes(timeout=5))
+        self.assertEqual(workQueue.popleft().jobRowNumber, 0)
+
+    def testOnlyJobWaitsForSize(self):
+        workQueue = JobWorkQueue(shortestJobFirst=True)
+        slowJob = SlowJob(0, 30)
+        workQueue.append(slowJob)
+        self.assertTrue(slowJob.reading.wait(5))
+        popped = []
+        worker = threading.Thread(
+            target=lambda: popped.append(workQueue.popleft()))
+        worker.start()
+        worker.join(0.2)
+        self.assertFalse(popped)
+        slowJob.release.set()
+        worker.join(5)
+        self.assertEqual(popped, [slowJob])
+
+    def testPopAndClear(self):
+        workQueue = self.queue([0, 0, 0])
+        self.assertEqual(workQueue.pop().jobRowNumber, 2)
+        self.assertEqual(workQueue.popleft().jobRowNumber, 0)
+        workQueue.clear()
+        self.assertFalse(workQueue)
+        with self.assertRaises(IndexError):
+            workQueue.popleft()
+
+
+if __name__ == "__main__":
+    unittest.main()
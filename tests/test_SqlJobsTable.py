@@ -0,0 +1,59 @@
+"""
+Test the migrations of the jobs table
+
+The database module needs vsutillib the tests are skipped if it is not
+installed.
+"""
+
+import sys
+import tempfile
+import unittest
+
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    from MKVBatchMultiplex import config
+    from MKVBatchMultiplex.jobs.SqlJobsTable import SqlJobsTable, updateTables
+except ImportError:
+    SqlJobsTable = None
+
+
+@unittest.skipIf(SqlJobsTable is None, "vsutillib is not installed")
+class TestMigrations(unittest.TestCase):
+    """migrations stopped before their version was saved run again"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        config.data.set(config.ConfigKey.DbVersion, config.DATABASEVERSION)
+        self.database = SqlJobsTable(
+            Path(self.directory.name).joinpath("history.db"))
+
+    def tearDown(self):
+        self.database.close()
+        self.directory.cleanup()
+
+    def columns(self):
+        cursor = self.database.connection.execute("PRAGMA table_info(jobs);")
+        return [row[1] for row in cursor.fetchall()]
+
+    def testInterruptedMigrationRunsAgain(self):
+        self.database.connection.execute(
+            "INSERT INTO jobs(id, command) VALUES (1, 'mkvmerge');")
+        # the columns were added and the backfill was stopped before the
+        # version was saved
+        self.database.setVersion("jobs", "2.2.0")
+        self.database.commit()
+
+        self.assertTrue(updateTables(self.database, "2.2.0", "2.3.0"))
+        self.assertEqual(self.database.version("jobs"), "2.3.0")
+        self.assertEqual(self.columns().count("status"), 1)
+        self.assertEqual(self.columns().count("totalCommands"), 1)
+        cursor = self.database.connection.execute("SELECT id FROM jobs;")
+        self.assertEqual(cursor.fetchall(), [(1,)])
+
+
+if __name__ == "__main__":
+    unittest.main()